@@ -5,7 +5,12 @@ from .md import Markdown
 from .multiselect import MultiSelect
 from .slider import Slider
 from .indicator import Indicator
+from .progressbar import Progressbar, ProgressAggregator, progress
 from .table import Table
+from .caching import cache
+from .shared_data import shared_data
+from .tasks import background
+from .cancel import cancelled, check_cancelled
 from .chat.chat import Chat
 from .chat.chatinput import ChatInput
 from .chat.message import Message 
@@ -3,7 +3,7 @@ import traitlets
 from IPython.display import display
 
 from .manager import WidgetsManager, MERCURY_MIMETYPE
-from .theme import THEME
+from .styles import ensure_theme_css
 
 
 def Button(*args, key: str = "", **kwargs):
@@ -12,6 +12,7 @@ def Button(*args, key: str = "", **kwargs):
     Usage:
         btn = Button(label="Run", variant="primary", size="md")
     """
+    ensure_theme_css()
     code_uid = WidgetsManager.get_code_uid("Button", key=key, args=args, kwargs=kwargs)
     cached = WidgetsManager.get_widget(code_uid)
     if cached:
@@ -95,97 +96,6 @@ class ButtonWidget(anywidget.AnyWidget):
     export default { render };
     """
 
-    _css = f"""
-    .mljar-button-container {{
-        display: inline-flex;
-        width: auto;
-        font-family: {THEME.get('font_family', 'Arial, sans-serif')};
-    }}
-
-    .mljar-button {{
-        border: 1px solid {THEME.get('border_color', '#d0d0d0')};
-        background: {THEME.get('widget_background_color', '#ffffff')};
-        color: {THEME.get('text_color', '#222')};
-        border-radius: {THEME.get('border_radius', '8px')};
-        padding: 4px 12px 4px 12px;  
-        margin-top: 5px;
-        margin-bottom: 5px;
-        cursor: pointer;
-        transition: transform 120ms ease, box-shadow 120ms ease, background 120ms ease, border-color 120ms ease;
-        user-select: none;
-        outline: none;
-        display: inline-flex;
-        align-items: center;
-        justify-content: center;
-        gap: 8px;
-        font-size: {THEME.get('font_size', '14px')};
-        font-weight: {THEME.get('font_weight', '600')};
-        box-shadow: {THEME.get('button_shadow', '0 1px 2px rgba(0,0,0,0.06)')};
-    }}
-
-    .mljar-button:hover:not(:disabled) {{
-        transform: translateY(-1px);
-        box-shadow: {THEME.get('button_shadow_hover', '0 2px 6px rgba(0,0,0,0.08)')};
-        border-color: {THEME.get('primary_color', '#007bff')};
-    }}
-
-    .mljar-button:active:not(:disabled) {{
-        transform: translateY(0);
-        box-shadow: {THEME.get('button_shadow', '0 1px 2px rgba(0,0,0,0.06)')};
-    }}
-
-    .mljar-button:disabled {{
-        opacity: 0.6;
-        cursor: not-allowed;
-    }}
-
-    /* Variants */
-    .mljar-button.is-primary {{
-        background: {THEME.get('primary_color', '#007bff')};
-        color: {THEME.get('button_primary_text', '#fff')};
-        border-color: {THEME.get('primary_color', '#007bff')};
-    }}
-    .mljar-button.is-primary:hover:not(:disabled) {{
-        filter: brightness(0.98);
-    }}
-
-    .mljar-button.is-secondary {{
-        background: {THEME.get('panel_bg', '#f7f7fa')};
-        color: {THEME.get('text_color', '#222')};
-    }}
-
-    .mljar-button.is-outline {{
-        background: transparent;
-        color: {THEME.get('primary_color', '#007bff')};
-        border: 1px solid {THEME.get('primary_color', '#007bff')};
-    }}
-    .mljar-button.is-outline:hover:not(:disabled) {{
-        background: {THEME.get('primary_color', '#007bff')};
-        color: #fff;
-    }}
-
-    .mljar-button.is-danger {{
-        background: {THEME.get('danger_color', '#dc3545')};
-        color: #fff;
-        border-color: {THEME.get('danger_color', '#dc3545')};
-    }}
-
-    /* Sizes */
-    .mljar-button.is-sm {{
-        padding: 3px 10px 3px 10px;
-        font-size: 12px;
-        border-radius: {THEME.get('border_radius_sm', '2px')};
-    }}
-    .mljar-button.is-md {{
-        padding: 4px 12px 4px 12px;  
-    }}
-    .mljar-button.is-lg {{
-        padding: 8px 16px 8px 16px;
-        font-size: 16px;
-        border-radius: {THEME.get('border_radius_lg', '4px')};
-    }}
-    """
-
     # --- Backend synced traits ---
     label = traitlets.Unicode("Run").tag(sync=True)
     variant = traitlets.Enum(["primary", "secondary", "outline", "danger"], default_value="primary").tag(sync=True)
@@ -0,0 +1,321 @@
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict, namedtuple
+
+from .paths import data_dir
+
+log = logging.getLogger(__name__)
+
+CacheInfo = namedtuple(
+    "CacheInfo", ["hits", "misses", "disk_hits", "maxsize", "currsize", "hit_rate"]
+)
+
+_MISSING = object()
+
+
+# ---------- argument hashing ----------
+def _update_hash(h, obj, hash_by, identities):
+    """
+    Feed a stable representation of `obj` into hash `h`. Objects hashed by
+    their id are appended to `identities`, ids are reused after collection.
+    """
+    if obj is None or isinstance(obj, (bool, int, float, complex, str)):
+        h.update(f"{type(obj).__name__}:{obj!r};".encode("utf-8"))
+        return
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        h.update(b"bytes:")
+        h.update(bytes(obj))
+        return
+    if isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}[{len(obj)}]".encode("utf-8"))
+        for item in obj:
+            _update_hash(h, item, hash_by, identities)
+        return
+    if isinstance(obj, dict):
+        h.update(f"dict[{len(obj)}]".encode("utf-8"))
+        items = sorted(((_hash_value(k, hash_by, identities), v) for k, v in obj.items()), key=lambda kv: kv[0])
+        for key_hash, value in items:
+            h.update(key_hash.encode("utf-8"))
+            _update_hash(h, value, hash_by, identities)
+        return
+    if isinstance(obj, (set, frozenset)):
+        # iteration order depends on the per-process string hash seed,
+        # so sort by content hash to get the same disk key in every kernel
+        h.update(f"{type(obj).__name__}[{len(obj)}]".encode("utf-8"))
+        for item_hash in sorted(_hash_value(item, hash_by, identities) for item in obj):
+            h.update(item_hash.encode("utf-8"))
+        return
+
+    # pandas / numpy are optional: if not imported, obj cannot be one of theirs
+    pd = sys.modules.get("pandas")
+    np = sys.modules.get("numpy")
+    if pd is not None and isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        if hash_by == "identity":
+            h.update(f"pandas-id:{id(obj)}:{obj.shape};".encode("utf-8"))
+            identities.append(obj)
+            return
+        h.update(f"{type(obj).__name__}:{obj.shape}".encode("utf-8"))
+        if isinstance(obj, pd.DataFrame):
+            h.update(repr(list(obj.columns)).encode("utf-8"))
+            h.update(repr(list(obj.dtypes.astype(str))).encode("utf-8"))
+        else:
+            h.update(f"{obj.name!r}:{obj.dtype}".encode("utf-8"))
+        h.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+        return
+    if np is not None and isinstance(obj, np.ndarray):
+        if hash_by == "identity":
+            h.update(f"ndarray-id:{id(obj)}:{obj.shape};".encode("utf-8"))
+            identities.append(obj)
+            return
+        h.update(f"ndarray:{obj.dtype}:{obj.shape}".encode("utf-8"))
+        if obj.dtype.hasobject:
+            h.update(pickle.dumps(obj.tolist(), protocol=pickle.HIGHEST_PROTOCOL))
+        else:
+            h.update(np.ascontiguousarray(obj).tobytes())
+        return
+
+    try:
+        h.update(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        # not picklable (open files, models with locks, ...): use identity
+        h.update(f"id:{type(obj).__qualname__}:{id(obj)};".encode("utf-8"))
+        identities.append(obj)
+
+
+def _hash_value(obj, hash_by="content", identities=None):
+    h = hashlib.sha1()
+    _update_hash(h, obj, hash_by, [] if identities is None else identities)
+    return h.hexdigest()
+
+
+def _identity_ref(obj):
+    try:
+        return weakref.ref(obj)
+    except TypeError:
+        # not weak-referenceable: keep it alive, so its id is not reused
+        return lambda: obj
+
+
+def _source_hash(func):
+    try:
+        src = inspect.getsource(func).encode("utf-8")
+    except (OSError, TypeError):
+        src = getattr(getattr(func, "__code__", None), "co_code", b"") or repr(func).encode("utf-8")
+    return hashlib.sha1(src).hexdigest()[:12]
+
+
+# ---------- disk tier ----------
+def _is_dataframe(value):
+    pd = sys.modules.get("pandas")
+    return pd is not None and isinstance(value, pd.DataFrame)
+
+
+def _disk_read(folder, key, ttl):
+    for ext in (".parquet", ".pkl"):
+        path = os.path.join(folder, key + ext)
+        try:
+            if ttl is not None and time.time() - os.path.getmtime(path) > ttl:
+                os.remove(path)
+                continue
+            if ext == ".parquet":
+                import pandas as pd
+
+                return pd.read_parquet(path)
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            continue
+        except Exception as e:
+            log.warning(f"Ignoring unreadable cache file {path}: {e}")
+    return _MISSING
+
+
+def _disk_write(folder, key, value, disk_format):
+    ext = ".parquet" if disk_format == "parquet" and _is_dataframe(value) else ".pkl"
+    path = os.path.join(folder, key + ext)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+    try:
+        if ext == ".parquet":
+            value.to_parquet(tmp)
+        else:
+            with open(tmp, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # atomic, so other kernels never read a half-written file
+        os.replace(tmp, path)
+    except Exception as e:
+        log.warning(f"Could not write cache file {path}: {e}")
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+# ---------- decorator ----------
+class _Store:
+    """In-memory entries and statistics of one cached function."""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        # key -> (stored_at, value, refs to the arguments hashed by id)
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+
+# "module.qualname-sourcehash" -> _Store; re-running the cell that defines a
+# function decorates it again, and the new wrapper picks up the old results
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def _function_id(func):
+    name = f"{func.__module__}.{func.__qualname__}".replace("<", "").replace(">", "")
+    return f"{name}-{_source_hash(func)}"
+
+
+class _CachedFunction:
+    def __init__(self, func, maxsize, ttl, disk, disk_format, hash_by):
+        self.__wrapped__ = func
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.disk_format = disk_format
+        self.hash_by = hash_by
+        function_id = _function_id(func)
+        with _stores_lock:
+            self._store = _stores.setdefault(function_id, _Store())
+        self._folder = data_dir("cache", function_id) if disk else None
+        functools.update_wrapper(self, func)
+
+    def _key(self, args, kwargs):
+        """Return the key and the arguments hashed by id, in a stable order."""
+        identities = []
+        key = _hash_value((args, sorted(kwargs.items())), self.hash_by, identities)
+        return key, sorted(identities, key=id)
+
+    def _get_memory(self, key, identities):
+        entries = self._store.entries
+        entry = entries.get(key)
+        if entry is None:
+            return _MISSING
+        stored_at, value, refs = entry
+        expired = self.ttl is not None and time.monotonic() - stored_at > self.ttl
+        # same id but a different object: the original was collected
+        stale = len(refs) != len(identities) or any(r() is not o for r, o in zip(refs, identities))
+        if expired or stale:
+            del entries[key]
+            return _MISSING
+        entries.move_to_end(key)
+        return value
+
+    def _put_memory(self, key, identities, value):
+        entries = self._store.entries
+        entries[key] = (time.monotonic(), value, [_identity_ref(o) for o in identities])
+        entries.move_to_end(key)
+        if self.maxsize is not None:
+            while len(entries) > self.maxsize:
+                entries.popitem(last=False)
+
+    def __call__(self, *args, **kwargs):
+        store = self._store
+        key, identities = self._key(args, kwargs)
+        # ids mean nothing in another process, such keys stay in memory
+        use_disk = self._folder is not None and not identities
+        with store.lock:
+            value = self._get_memory(key, identities)
+            if value is not _MISSING:
+                store.hits += 1
+                return value
+        if use_disk:
+            value = _disk_read(self._folder, key, self.ttl)
+            if value is not _MISSING:
+                with store.lock:
+                    store.disk_hits += 1
+                    self._put_memory(key, identities, value)
+                return value
+        with store.lock:
+            store.misses += 1
+        value = self.__wrapped__(*args, **kwargs)
+        with store.lock:
+            self._put_memory(key, identities, value)
+        if use_disk:
+            _disk_write(self._folder, key, value, self.disk_format)
+        return value
+
+    def __get__(self, instance, owner):
+        # support decorating methods
+        if instance is None:
+            return self
+        return functools.partial(self, instance)
+
+    def cache_info(self) -> CacheInfo:
+        """Hit statistics; disk hits count as hits in hit_rate."""
+        store = self._store
+        with store.lock:
+            total = store.hits + store.disk_hits + store.misses
+            rate = (store.hits + store.disk_hits) / total if total else 0.0
+            return CacheInfo(
+                store.hits, store.misses, store.disk_hits, self.maxsize, len(store.entries), rate
+            )
+
+    def cache_clear(self, disk: bool = False):
+        """Drop in-memory entries and statistics; with disk=True also the files."""
+        store = self._store
+        with store.lock:
+            store.entries.clear()
+            store.hits = store.misses = store.disk_hits = 0
+        if disk and self._folder is not None:
+            for name in os.listdir(self._folder):
+                try:
+                    os.remove(os.path.join(self._folder, name))
+                except OSError:
+                    pass
+
+
+def cache(func=None, *, maxsize=128, ttl=None, disk=False, disk_format="pickle", hash_by="content"):
+    """
+    Memoize a function across cell re-runs.
+
+    Results are kept per function name and source: re-running the cell that
+    defines the function keeps them, editing the function starts afresh.
+
+    Use as `@mercury.cache` or `@mercury.cache(ttl=600, disk=True)`.
+
+    Parameters
+    ----------
+    maxsize : int or None
+        Maximum number of results kept in memory (LRU); None for no limit.
+    ttl : float or None
+        Seconds after which a result is computed again.
+    disk : bool
+        Also store results in the Mercury data dir. The location is keyed by
+        the function's source hash, so all kernels running the same code
+        share them and editing the function invalidates them.
+    disk_format : {"pickle", "parquet"}
+        Format for DataFrame results on disk (other values use pickle).
+    hash_by : {"content", "identity"}
+        How DataFrame and ndarray arguments are hashed: by their data, or by
+        object identity (much cheaper for large data that is not mutated).
+        Results keyed by identity are only kept in memory, and only returned
+        for the very same object (checked with a weak reference).
+
+    The wrapped function gets .cache_info() (hits, misses, disk_hits,
+    maxsize, currsize, hit_rate) and .cache_clear(disk=False).
+    """
+    if disk_format not in ("pickle", "parquet"):
+        raise ValueError("disk_format must be 'pickle' or 'parquet'")
+    if hash_by not in ("content", "identity"):
+        raise ValueError("hash_by must be 'content' or 'identity'")
+
+    def decorator(f):
+        return _CachedFunction(f, maxsize, ttl, disk, disk_format, hash_by)
+
+    if func is not None:
+        return decorator(func)
+    return decorator
@@ -0,0 +1,170 @@
+import threading
+import time
+
+from .stop import StopExecution
+
+# traits the frontend sets by itself, they do not mean the user changed anything
+_IGNORED_TRAITS = {"cell_id"}
+# seconds between reads of widget messages while a cell is running
+PUMP_INTERVAL = 0.05
+# shell messages handled ahead of time; everything else waits for the cell to end
+_PUMPED_MSG_TYPES = {"comm_msg"}
+
+_last_pump = 0.0
+_stalled = []  # (dispatch coroutine, future it awaits) that needed the event loop
+
+_lock = threading.Lock()
+_generation = 0  # bumped on every widget change that comes from the browser
+_run_generation = 0  # value of _generation when the current cell started
+
+
+def generation() -> int:
+    return _generation
+
+
+def _on_widget_change(change):
+    global _generation
+    widget = change["owner"]
+    # ipywidgets holds _property_lock while applying state sent by the frontend;
+    # changes made by Python code (including echoes) do not count
+    if change["name"] in _IGNORED_TRAITS or not getattr(widget, "_property_lock", None):
+        return
+    with _lock:
+        _generation += 1
+
+
+def watch_widget(widget):
+    """Count frontend updates of `widget` as superseding the running code."""
+    observe = getattr(widget, "observe", None)
+    if observe is None or getattr(widget, "_mercury_cancel_watched", False):
+        return
+    observe(_on_widget_change)
+    widget._mercury_cancel_watched = True
+
+
+def _on_pre_run_cell(*args):
+    global _run_generation
+    _run_generation = _generation
+
+
+def _register_ipython_hook():
+    try:
+        from IPython import get_ipython
+    except ImportError:
+        return
+    ip = get_ipython()
+    if ip is not None:
+        ip.events.register("pre_run_cell", _on_pre_run_cell)
+
+
+_register_ipython_hook()
+
+
+def _kernel():
+    try:
+        from IPython import get_ipython
+    except ImportError:
+        return None
+    return getattr(get_ipython(), "kernel", None)
+
+
+def _msg_type(kernel, item):
+    try:
+        _, _, args = item
+        _, msg_list = kernel.session.feed_identities(args[0], copy=False)
+        header = msg_list[1]
+        return kernel.session.unpack(getattr(header, "bytes", header)).get("msg_type")
+    except Exception:
+        return None
+
+
+def _run(coro):
+    """Step a dispatch coroutine as far as it goes without the event loop."""
+    while True:
+        try:
+            awaiting = coro.send(None)
+        except StopIteration:
+            return
+        except Exception:
+            # dispatch_shell logs handler errors itself
+            return
+        if awaiting is not None and not awaiting.done():
+            _stalled.append((coro, awaiting))
+            return
+
+
+def _pump():
+    """
+    Handle widget messages that arrived while the current cell is running.
+
+    The kernel reads shell messages only between executions, so a blocked
+    main thread would never see a widget change. Pending messages are taken
+    off ipykernel's queue: comm messages are dispatched now, the rest (e.g.
+    the next execute_request) go back in their original order.
+    """
+    global _last_pump
+    now = time.monotonic()
+    if now - _last_pump < PUMP_INTERVAL:
+        return
+    _last_pump = now
+
+    kernel = _kernel()
+    queue = getattr(kernel, "msg_queue", None)
+    stream = getattr(kernel, "shell_stream", None)
+    if queue is None or stream is None:
+        # kernels without a shell message queue (ipykernel 7) are not pumped
+        return
+
+    for entry in _stalled[:]:
+        if entry[1].done():
+            _stalled.remove(entry)
+            _run(entry[0])
+
+    ident = getattr(kernel, "_parent_ident", {}).get("shell")
+    parent = kernel.get_parent("shell")
+    held, pumped = [], False
+    try:
+        stream.flush()  # received messages -> msg_queue
+        while True:
+            try:
+                item = queue.get_nowait()
+            except Exception:  # QueueEmpty
+                break
+            if _msg_type(kernel, item) in _PUMPED_MSG_TYPES:
+                pumped = True
+                _run(item[1](*item[2]))
+            else:
+                held.append(item)
+    finally:
+        for item in held:
+            queue.put_nowait(item)
+        if pumped:
+            # outputs and status belong to the running cell again
+            kernel.set_parent(ident, parent, "shell")
+            kernel._publish_status("busy", "shell")
+
+
+def cancelled() -> bool:
+    """
+    True when the current computation is already superseded: a widget was
+    changed in the browser after it started (or, in mercury.background, its
+    task was cancelled). Long loops can poll it and stop early.
+
+    On the main thread each call (at most every PUMP_INTERVAL) first handles
+    pending widget messages, so changes made while the cell runs are seen.
+    Changes that arrived before the cell started do not count.
+    """
+    from .tasks import current_task
+
+    task = current_task()
+    if task is not None:
+        return task.cancelled or _generation > task.generation
+    if threading.current_thread() is threading.main_thread():
+        _pump()
+    return _generation > _run_generation
+
+
+def check_cancelled():
+    """Raise StopExecution (silently ends the cell) when cancelled() is True."""
+    if cancelled():
+        raise StopExecution()
@@ -1,21 +1,172 @@
-import uuid
-import json
+import anywidget
 import ipywidgets as widgets
+import traitlets
 from IPython.display import display, clear_output
-from .message import Message, MSG_CSS_CLASS
-
+from .message import Message
+
+
+
+MAX_LIVE_MESSAGES = 50  # messages kept as live widgets
+VISIBLE_ARCHIVE_BATCHES = 2  # archived batches shown before "Show earlier"
+
+
+class ChatWidget(anywidget.AnyWidget):
+    """
+    Container for chat messages. It renders its children itself and keeps
+    the transcript scrolled to the newest message by observing its own size,
+    so adding a message is a single `children` update.
+    """
+
+    _esm = """
+    function attachView(view, host) {
+        // same steps as Lumino's Widget.attach, without importing Lumino
+        const w = view.luminoWidget || view.pWidget;
+        const Msg = w && w.constructor && w.constructor.Msg;
+        if (Msg && typeof w.processMessage === "function") {
+            w.processMessage(Msg.BeforeAttach);
+            host.appendChild(w.node);
+            w.processMessage(Msg.AfterAttach);
+        } else {
+            host.appendChild(view.el);
+        }
+        if (typeof view.trigger === "function") view.trigger("displayed");
+    }
+
+    function isScrollable(el) {
+        const cs = getComputedStyle(el);
+        return /(auto|scroll)/.test(cs.overflowY + cs.overflow);
+    }
+
+    function render({ model, el }) {
+        const root = document.createElement("div");
+        root.classList.add("mljar-chat");
+        const list = document.createElement("div");
+        list.classList.add("mljar-chat-list");
+        root.appendChild(list);
+        el.appendChild(root);
+
+        const views = new Map(); // model id -> Promise<view>
+        let renderId = 0;
+        let stick = true; // keep pinned to the bottom unless user scrolled up
+        let scroller = null;
+
+        function applyHeight() {
+            const h = model.get("height");
+            root.style.height = h || "";
+            root.style.overflowY = h ? "auto" : "visible";
+            scroller = null;
+        }
+
+        function getScroller() {
+            if (scroller && scroller.isConnected) return scroller;
+            if (model.get("height")) {
+                scroller = root;
+            } else {
+                let cur = root.parentElement;
+                while (cur && !isScrollable(cur)) cur = cur.parentElement;
+                scroller = cur || document.scrollingElement;
+            }
+            scroller.addEventListener("scroll", () => {
+                stick = scroller.scrollHeight - scroller.scrollTop - scroller.clientHeight < 48;
+            }, { passive: true });
+            return scroller;
+        }
+
+        function scrollToBottom() {
+            if (!stick || !root.isConnected) return;
+            const sc = getScroller();
+            sc.scrollTop = sc.scrollHeight;
+        }
+
+        async function syncChildren() {
+            const current = ++renderId;
+            const ids = (model.get("children") || []).map((ref) => ref.replace(/^IPY_MODEL_/, ""));
+            // a new last child is a new message (not earlier ones paged in)
+            const grew = ids.length > 0 && !views.has(ids[ids.length - 1]);
+            for (const [id, viewPromise] of views) {
+                if (!ids.includes(id)) {
+                    views.delete(id);
+                    viewPromise.then((view) => view.remove());
+                }
+            }
+            for (const id of ids) {
+                if (!views.has(id)) {
+                    views.set(id, model.widget_manager.get_model(id).then((m) => model.widget_manager.create_view(m)));
+                }
+            }
+            const resolved = await Promise.all(ids.map((id) => views.get(id)));
+            if (current !== renderId) return; // a newer update is in progress
+            resolved.forEach((view) => {
+                if (view.el.parentElement === list) list.appendChild(view.el);
+                else attachView(view, list);
+            });
+            if (grew) {
+                // a new message always brings the transcript to the bottom
+                stick = true;
+                requestAnimationFrame(scrollToBottom);
+            }
+        }
+
+        // streaming content, images and plots change the height after
+        // the children were added; follow them while pinned
+        const resizeObserver = new ResizeObserver(() => scrollToBottom());
+        resizeObserver.observe(list);
+
+        applyHeight();
+        syncChildren();
+        model.on("change:children", syncChildren);
+        model.on("change:height", applyHeight);
+
+        return () => {
+            resizeObserver.disconnect();
+            views.forEach((viewPromise) => viewPromise.then((view) => view.remove()));
+            views.clear();
+        };
+    }
+
+    export default { render };
+    """
+
+    _css = """
+    .mljar-chat {
+        width: 100%;
+        box-sizing: border-box;
+        padding: 4px;
+        background: #fff;
+    }
+    .mljar-chat-list {
+        display: flex;
+        flex-direction: column;
+    }
+    """
+
+    children = traitlets.List(trait=traitlets.Instance(widgets.Widget)).tag(
+        sync=True, **widgets.widget_serialization
+    )
+    height = traitlets.Unicode("", help="Fixed height (CSS) to scroll inside the chat; empty to use the page scroll").tag(sync=True)
 
 
 class Chat:
-    def __init__(self, placeholder="💬 No messages yet. Start the conversation!"):
-        """
-        scroll_container_selector: Optional CSS selector of your app's scrollable container.
-        Example: ".mljar-app-main" or "#right-pane".
-        If None, we auto-detect the nearest scrollable ancestor.
+    def __init__(self, placeholder="💬 No messages yet. Start the conversation!", max_live_messages=MAX_LIVE_MESSAGES, height=None):
         """
-        self.messages = []
-        self.scroll_container_selector = "#mercury-main-panel, .mercury-main-panel"
+        height: optional CSS height, e.g. "500px". The chat then scrolls
+        inside its own container; by default the page/app scrolls.
 
+        max_live_messages: only the most recent messages stay live widgets.
+        When there are more, the older half is frozen into static HTML and
+        the widgets are closed, so per-message cost does not grow with the
+        conversation. Older archived parts are shown on demand.
+        """
+        self.messages = []  # live Message widgets
+        self.max_live_messages = max(2, int(max_live_messages))
+        self._archive = []  # static HTML batches of frozen messages, oldest first
+        self._archive_widgets = {}  # batch index -> HTML widget, only for shown batches
+        self._visible_batches = VISIBLE_ARCHIVE_BATCHES
+        self._show_earlier = widgets.Button(
+            description="Show earlier messages",
+            layout=widgets.Layout(align_self="center", margin="4px 0 8px 0"),
+        )
+        self._show_earlier.on_click(self._on_show_earlier)
         self.placeholder_label = widgets.HTML(
             '''
             <div style="
@@ -40,97 +191,60 @@ class Chat:
             '''
         )
 
-        # unique class to target this chat only
-        self._dom_class = "mljar-chat-" + uuid.uuid4().hex[:8]
-
-        self.vbox = widgets.VBox(
-            [self.placeholder_label],
-            layout=widgets.Layout(
-                width="100%",
-                padding="4px",
-                background_color="#fff",
-                overflow_y="visible",  # no internal scrollbar; page/app scrolls
-            ),
-        )
-        self.vbox.add_class(self._dom_class)
+        # kept for backward compatibility, autoscroll is handled by ChatWidget now
+        self.scroll_container_selector = "#mercury-main-panel, .mercury-main-panel"
 
-        # tiny Output used to run JS reliably after each render
-        self._js = widgets.Output()
+        self.container = ChatWidget(children=[self.placeholder_label], height=height or "")
         clear_output(wait=True)
-        display(self.vbox, self._js)
+        display(self.container)
+
+    @property
+    def vbox(self):
+        """Deprecated alias of `container`, kept for backward compatibility."""
+        return self.container
+
+    def _freeze_old_messages(self):
+        """Turn the oldest live messages into one static HTML batch."""
+        if len(self.messages) <= self.max_live_messages:
+            return
+        keep = self.max_live_messages // 2
+        frozen, self.messages = self.messages[:-keep], self.messages[-keep:]
+        self._archive.append("".join(m.to_html() for m in frozen))
+        for m in frozen:
+            m.close()
+
+    def _archive_children(self):
+        first = max(0, len(self._archive) - self._visible_batches)
+        # drop widgets of batches that are no longer shown
+        for i in [i for i in self._archive_widgets if i < first]:
+            self._archive_widgets.pop(i).close()
+        children = [self._show_earlier] if first > 0 else []
+        for i in range(first, len(self._archive)):
+            if i not in self._archive_widgets:
+                self._archive_widgets[i] = widgets.HTML(self._archive[i])
+            children.append(self._archive_widgets[i])
+        return children
+
+    def _on_show_earlier(self, _button):
+        self._visible_batches += VISIBLE_ARCHIVE_BATCHES
+        self._render()
 
     def _render(self):
-        import json
-        from IPython.display import Javascript, display
-
-        self.vbox.children = self.messages or [self.placeholder_label]
-
-        chat_class_json = json.dumps(self._dom_class)
-        selector = self.scroll_container_selector or "#mercury-main-panel, .mercury-main-panel"
-        preferred_selector_json = json.dumps(selector)
-
-        js = "\n".join([
-            "(function(){",
-            "  function isScrollable(el){",
-            "    if(!el) return false;",
-            "    const cs = getComputedStyle(el);",
-            "    const oy = cs.overflowY, o = cs.overflow;",
-            "    const can = el.scrollHeight > (el.clientHeight + 2);",
-            "    return can && (oy==='auto'||oy==='scroll'||o==='auto'||o==='scroll');",
-            "  }",
-            "  function findScrollableWithin(root){",
-            "    if(!root) return null;",
-            "    if(isScrollable(root)) return root;",
-            "    const walker = document.createTreeWalker(root, NodeFilter.SHOW_ELEMENT, null);",
-            "    let n = walker.currentNode;",
-            "    while((n = walker.nextNode())){ if(isScrollable(n)) return n; }",
-            "    return null;",
-            "  }",
-            "  function getScrollableAncestor(node){",
-            "    let cur = node && node.parentElement;",
-            "    while(cur){ if(isScrollable(cur)) return cur; cur = cur.parentElement; }",
-            "    return null;",
-            "  }",
-            "  function scrollIntoContainer(el, container){",
-            "    if(!el||!container) return;",
-            "    let y = 0, n = el;",
-            "    while(n && n !== container){ y += n.offsetTop || 0; n = n.offsetParent; }",
-            "    const target = Math.max(0, y - (container.clientHeight - el.clientHeight) + 16);",
-            "    container.scrollTop = target;",
-            "  }",
-            "  function scrollPageFallback(el){",
-            "    try { el.scrollIntoView({behavior:'smooth', block:'end'}); } catch(e) {}",
-            "  }",
-            "",
-            "  const chats = document.getElementsByClassName(" + chat_class_json + ");",
-            "  if(!chats || !chats.length) return;",
-            "  const chat = chats[0];",
-            "  const msgs = chat.getElementsByClassName('" + MSG_CSS_CLASS + "');",
-            "  if(!msgs || !msgs.length) return;",
-            "  const last = msgs[msgs.length - 1];",
-            "",
-            "  function tick(){",
-            "    const pref = document.querySelector(" + preferred_selector_json + ");",
-            "    const scroller = findScrollableWithin(pref) || getScrollableAncestor(last) || document.scrollingElement;",
-            "    if(scroller) scrollIntoContainer(last, scroller);",
-            "    else scrollPageFallback(last);",
-            "  }",
-            "",
-            "  // Give big outputs (plots) a moment to layout",
-            "  requestAnimationFrame(()=>setTimeout(tick, 100));",
-            "})();",
-        ])
-
-        with self._js:
-            self._js.clear_output(wait=True)
-            display(Javascript(js))
-
+        self.container.children = (self._archive_children() + self.messages) or [self.placeholder_label]
 
     def add(self, message: Message):
         self.messages.append(message)
+        self._freeze_old_messages()
         self._render()
 
     def clear(self):
+        for m in self.messages:
+            m.close()
+        for w in self._archive_widgets.values():
+            w.close()
         self.messages.clear()
+        self._archive.clear()
+        self._archive_widgets.clear()
+        self._visible_batches = VISIBLE_ARCHIVE_BATCHES
         self._render()
 
@@ -3,9 +3,10 @@ import traitlets
 from IPython.display import display
 
 from ..manager import WidgetsManager, MERCURY_MIMETYPE
-from ..theme import THEME
+from ..styles import ensure_theme_css
 
 def ChatInput(*args, key="", **kwargs):
+    ensure_theme_css()
     code_uid = WidgetsManager.get_code_uid("ChatInput", key=key, args=args, kwargs=kwargs)
     cached = WidgetsManager.get_widget(code_uid)
     if cached:
@@ -119,52 +120,6 @@ class ChatInputWidget(anywidget.AnyWidget):
     export default { render };
     """
 
-    _css = f"""
-    .mljar-chatinput-container {{
-        display: flex;
-        flex-direction: row;
-        align-items: center;
-        width: 100%;
-        min-width: 160px;
-        box-sizing: border-box;
-        gap: 8px;
-        font-family: {THEME.get('font_family', 'Arial, sans-serif')};
-        font-size: {THEME.get('font_size', '14px')};
-        color: {THEME.get('text_color', '#222')};
-    }}
-
-    .mljar-chatinput-input {{
-        flex: 1 1 auto;
-        width: 100%;
-        border: { '1px solid ' + THEME.get('border_color', '#ccc') if THEME.get('border_visible', True) else 'none'};
-        border-radius: {THEME.get('border_radius', '6px')};
-        padding: 6px 10px;
-        min-height: 1.6em;
-        background: {THEME.get('widget_background_color', '#fff')};
-        color: {THEME.get('text_color', '#222')};
-        box-sizing: border-box;
-    }}
-    .mljar-chatinput-input:focus {{
-        outline: none;
-        border-color: {THEME.get('primary_color', '#007bff')};
-    }}
-
-    .mljar-chatinput-button {{
-        flex: 0 0 auto;
-        border: none;
-        border-radius: {THEME.get('border_radius', '6px')};
-        padding: 6px 12px;
-        min-height: 1.6em;
-        cursor: pointer;
-        background: {THEME.get('primary_color', '#007bff')};
-        color: {THEME.get('button_text_color', '#fff')};
-        font-weight: bold;
-    }}
-    .mljar-chatinput-button:hover {{
-        filter: brightness(0.95);
-    }}
-    """
-
     # Public traits
     value = traitlets.Unicode("").tag(sync=True)  # last submitted
     placeholder = traitlets.Unicode("Type a message...").tag(sync=True)
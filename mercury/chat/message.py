@@ -1,7 +1,346 @@
+import asyncio
+import queue
+import re
+import threading
+import time
+import uuid
+from html import escape
+
+import anywidget
 import ipywidgets as widgets
-from IPython.display import display, HTML as DHTML, Javascript, Markdown
+import traitlets
+
+from ..md import markdown_to_html
 
 MSG_CSS_CLASS = "mljar-chat-msg"
+MD_EXTENSIONS = ("fenced_code", "tables")
+STREAM_INTERVAL = 0.05  # seconds between flushes while streaming
+STREAM_MAX_CHARS = 2048  # flush earlier if this many chars are buffered
+
+# lines that keep the previous block open (lists, indented code, quotes)
+_CONTINUATION = re.compile(r"[ \t]|[-*+][ \t]|\d+[.)][ \t]|>")
+
+
+def _markdown_cut(text: str) -> int:
+    """
+    Return the length of the leading part of streamed markdown that is made
+    of complete blocks. Those blocks will render the same no matter what is
+    appended later, so they can be converted once and never sent again.
+    """
+    in_fence = False
+    fence = ""
+    blank = False
+    cut = 0
+    pos = 0
+    # the last item is either "" or an unfinished line
+    for line in text.split("\n")[:-1]:
+        stripped = line.strip()
+        if in_fence:
+            if stripped.startswith(fence):
+                in_fence = False
+        elif not stripped:
+            blank = True
+        else:
+            if blank and not _CONTINUATION.match(line):
+                cut = pos
+            blank = False
+            if stripped.startswith(("```", "~~~")):
+                in_fence = True
+                fence = stripped[:3]
+        pos += len(line) + 1
+    return cut
+
+
+class _MessageContent(anywidget.AnyWidget):
+    """
+    Message body that is updated with deltas sent as custom comm messages:
+
+      - {"type": "reset", "mode", "blocks", "tail"}  replace everything
+      - {"type": "md", "index", "block"?, "tail"}    commit a markdown block
+                                                     and/or re-render the tail
+      - {"type": "append", "delta"}                  append raw text / html
+
+    Committed markdown blocks are rendered once; only the last, still growing
+    block is converted again on each chunk.
+    """
+
+    _esm = """
+    const STATES = new Map();
+
+    function stateFor(model) {
+        const uid = model.get("uid");
+        if (!STATES.has(uid)) {
+            STATES.set(uid, { mode: null, blocks: [], tail: "", views: new Set(), stale: false });
+        }
+        return STATES.get(uid);
+    }
+
+    function initialize({ model }) {
+        const st = stateFor(model);
+        // state lives on the model, so messages sent before a view
+        // exists (or while it is re-created) are not lost
+        model.on("msg:custom", (msg) => {
+            if (!msg) return;
+            if (msg.type === "reset") {
+                st.mode = msg.mode;
+                st.blocks = msg.blocks || [];
+                st.tail = msg.tail || "";
+                st.stale = false;
+            } else if (msg.type === "md") {
+                if (msg.block !== undefined && msg.block !== null) {
+                    if (msg.index !== st.blocks.length) {
+                        // missed a message; ask the kernel for the full state
+                        if (!st.stale) model.send({ type: "snapshot" });
+                        st.stale = true;
+                        return;
+                    }
+                    st.blocks.push(msg.block);
+                }
+                st.tail = msg.tail || "";
+            } else if (msg.type === "append") {
+                st.tail += msg.delta || "";
+            } else {
+                return;
+            }
+            st.views.forEach((update) => update(msg));
+        });
+        return () => STATES.delete(model.get("uid"));
+    }
+
+    function render({ model, el }) {
+        const st = stateFor(model);
+        const root = document.createElement("div");
+        root.classList.add("jp-RenderedHTMLCommon", "mljar-chat-msg-content");
+        const blocksEl = document.createElement("div");
+        const tailEl = document.createElement("div");
+        root.appendChild(blocksEl);
+        root.appendChild(tailEl);
+        el.appendChild(root);
+
+        let textNode = null;
+
+        function renderTail() {
+            if (st.mode === "text") {
+                tailEl.style.whiteSpace = "pre-wrap";
+                tailEl.innerHTML = "";
+                textNode = document.createTextNode(st.tail);
+                tailEl.appendChild(textNode);
+            } else {
+                tailEl.style.whiteSpace = "";
+                textNode = null;
+                tailEl.innerHTML = st.tail;
+            }
+        }
+
+        function renderAll() {
+            blocksEl.innerHTML = st.blocks.join("");
+            renderTail();
+        }
+
+        function update(msg) {
+            if (msg.type === "reset") {
+                renderAll();
+            } else if (msg.type === "md") {
+                if (msg.block !== undefined && msg.block !== null) {
+                    blocksEl.insertAdjacentHTML("beforeend", msg.block);
+                }
+                tailEl.innerHTML = st.tail;
+            } else if (msg.type === "append") {
+                if (textNode) textNode.appendData(msg.delta || "");
+                else tailEl.innerHTML = st.tail;
+            }
+        }
+
+        renderAll();
+        st.views.add(update);
+        if (st.mode === null) {
+            // e.g. notebook re-opened: get current content from the kernel
+            model.send({ type: "snapshot" });
+        }
+        return () => st.views.delete(update);
+    }
+
+    export default { initialize, render };
+    """
+
+    _css = """
+    .mljar-chat-msg-content > div > :first-child { margin-top: 0; }
+    .mljar-chat-msg-content > div > :last-child { margin-bottom: 0; }
+    """
+
+    uid = traitlets.Unicode("").tag(sync=True)
+
+    def __init__(self, **kwargs):
+        super().__init__(uid=uuid.uuid4().hex, **kwargs)
+        self.mode = None  # one of {"markdown","html","text", None}
+        self.blocks = []  # committed markdown blocks as HTML
+        self.tail = ""  # tail HTML, or the whole text/html buffer
+        self.on_msg(self._handle_custom_msg)
+
+    def _handle_custom_msg(self, widget, content, buffers):
+        if isinstance(content, dict) and content.get("type") == "snapshot":
+            self.reset(self.mode, self.blocks, self.tail)
+
+    def reset(self, mode, blocks=(), tail=""):
+        self.mode = mode
+        self.blocks = list(blocks)
+        self.tail = tail
+        self.send({"type": "reset", "mode": mode, "blocks": self.blocks, "tail": tail})
+
+    def commit(self, block, tail):
+        msg = {"type": "md", "index": len(self.blocks), "tail": tail}
+        if block is not None:
+            msg["block"] = block
+            self.blocks.append(block)
+        self.tail = tail
+        self.send(msg)
+
+    def append(self, delta):
+        self.tail += delta
+        self.send({"type": "append", "delta": delta})
+
+
+def _output_to_html(output):
+    """Static HTML for one entry of Output.outputs; widget views are dropped."""
+    kind = output.get("output_type")
+    if kind == "stream":
+        return f'<pre>{escape(output.get("text", ""))}</pre>'
+    if kind == "error":
+        return f'<pre>{escape(output.get("ename", ""))}: {escape(output.get("evalue", ""))}</pre>'
+    data = output.get("data", {})
+    if "text/html" in data:
+        return data["text/html"]
+    for mime in ("image/png", "image/jpeg", "image/gif"):
+        if mime in data:
+            return f'<img src="data:{mime};base64,{data[mime]}" />'
+    if "image/svg+xml" in data:
+        return data["image/svg+xml"]
+    if "text/markdown" in data:
+        return markdown_to_html(data["text/markdown"], MD_EXTENSIONS)
+    if "text/plain" in data and "application/vnd.jupyter.widget-view+json" not in data:
+        return f'<pre>{escape(data["text/plain"])}</pre>'
+    return ""
+
+
+_STREAM_END = object()
+
+
+class _TokenBuffer:
+    """Collect streamed tokens and pass them on in time/size bounded batches."""
+
+    def __init__(self, flush, interval, max_chars):
+        self._flush = flush
+        self._interval = interval
+        self._max_chars = max_chars
+        self._pending = []
+        self._pending_chars = 0
+        self._last_flush = time.monotonic()
+        self._parts = []
+
+    def add(self, token):
+        if not token:
+            return
+        token = str(token)
+        self._pending.append(token)
+        self._pending_chars += len(token)
+        if (
+            self._pending_chars >= self._max_chars
+            or time.monotonic() - self._last_flush >= self._interval
+        ):
+            self.flush()
+
+    def time_left(self):
+        """Seconds until buffered tokens are due, or None when nothing is buffered."""
+        if not self._pending:
+            return None
+        return max(0.0, self._interval - (time.monotonic() - self._last_flush))
+
+    def flush(self):
+        if self._pending:
+            chunk = "".join(self._pending)
+            self._pending = []
+            self._pending_chars = 0
+            self._parts.append(chunk)
+            self._flush(chunk)
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        return "".join(self._parts)
+
+
+def _stream_sync(tokens, buffer):
+    """Feed `tokens` into `buffer`; return the streamed text."""
+    # tokens are pulled in a helper thread, so text that is already
+    # buffered is shown on time even when the producer stalls; widget
+    # updates stay on the calling thread
+    pulled = queue.Queue()
+    # set when the caller leaves early (interrupt, StopExecution, ...),
+    # so an abandoned LLM stream is not drained in the background
+    stop = threading.Event()
+    it = iter(tokens)
+
+    def pull():
+        try:
+            for token in it:
+                if stop.is_set():
+                    break
+                pulled.put((token, None))
+        except BaseException as e:
+            pulled.put((_STREAM_END, e))
+        else:
+            pulled.put((_STREAM_END, None))
+        finally:
+            close = getattr(it, "close", None)
+            if stop.is_set() and close is not None:
+                close()
+
+    threading.Thread(target=pull, name="mercury-stream", daemon=True).start()
+    try:
+        while True:
+            try:
+                token, error = pulled.get(timeout=buffer.time_left())
+            except queue.Empty:
+                buffer.flush()
+                continue
+            if token is _STREAM_END:
+                text = buffer.close()
+                if error is not None:
+                    raise error
+                return text
+            buffer.add(token)
+    finally:
+        stop.set()
+
+
+async def _stream_async(tokens, buffer):
+    """Feed async `tokens` into `buffer`; return the streamed text."""
+    # a loop timer flushes buffered text when the producer stalls; it runs
+    # between awaits, so it never interleaves with buffer.add()
+    loop = asyncio.get_running_loop()
+    timer = None
+
+    def on_timer():
+        nonlocal timer
+        timer = None
+        left = buffer.time_left()
+        if left is None:
+            return
+        if left > 0:
+            timer = loop.call_later(left, on_timer)
+        else:
+            buffer.flush()
+
+    try:
+        async for token in tokens:
+            buffer.add(token)
+            if timer is None and buffer.time_left() is not None:
+                timer = loop.call_later(buffer.time_left(), on_timer)
+    finally:
+        if timer is not None:
+            timer.cancel()
+    return buffer.close()
+
 
 class Message(widgets.HBox):
     def __init__(self, role="user", emoji="👤"):
@@ -14,40 +353,63 @@ class Message(widgets.HBox):
             f'<span style="font-size:18px;line-height:1;">{emoji}</span>'
             f'</div>'
         )
+        self._avatar_html = avatar_html
         avatar = widgets.HTML(
             value=avatar_html,
             layout=widgets.Layout(margin="0 8px 8px 0", align_self="flex-start"),
         )
+        # streamed text/markdown/html goes here, as deltas
+        self.content = _MessageContent()
+        # anything displayed with `with message:` goes below it
         self.output = widgets.Output(
+            layout=widgets.Layout(
+                overflow_y="visible",
+                overflow_x="visible",
+            )
+        )
+        body = widgets.VBox(
+            [self.content, self.output],
             layout=widgets.Layout(
                 align_self="flex-start",
                 margin="8px 0 0 0",
                 overflow_y="visible",
                 overflow_x="visible",
-            )
+            ),
         )
-        self.output.add_class(MSG_CSS_CLASS)
-        self.children = [avatar, self.output]
+        body.add_class(MSG_CSS_CLASS)
+        self.children = [avatar, body]
         self.layout.align_items = "flex-start"
 
         # Buffers + mode
         self._mode = None  # one of {"markdown","html","text", None}
         self._md_buffer = ""
+        self._md_committed = 0  # chars of _md_buffer already sent as blocks
         self._html_buffer = ""
         self._text_buffer = ""
 
     # ------- internal helpers -------
 
     def _render(self):
-        """Re-render the current buffer based on mode."""
-        self.output.clear_output(wait=True)
-        with self.output:
-            if self._mode == "markdown":
-                display(Markdown(self._md_buffer))
-            elif self._mode == "html":
-                display(DHTML(self._html_buffer))
-            elif self._mode == "text":
-                print(self._text_buffer)
+        """Send the whole current buffer (used when content is replaced)."""
+        if self._mode == "markdown":
+            self._md_committed = _markdown_cut(self._md_buffer)
+            blocks = []
+            if self._md_committed:
+                blocks.append(
+                    markdown_to_html(self._md_buffer[: self._md_committed], MD_EXTENSIONS, cache=False)
+                )
+            tail = self._md_tail_html()
+            self.content.reset("markdown", blocks, tail)
+        elif self._mode == "html":
+            self.content.reset("html", tail=self._html_buffer)
+        elif self._mode == "text":
+            self.content.reset("text", tail=self._text_buffer)
+        else:
+            self.content.reset(None)
+
+    def _md_tail_html(self):
+        tail = self._md_buffer[self._md_committed:]
+        return markdown_to_html(tail, MD_EXTENSIONS, cache=False) if tail.strip() else ""
 
     def _set_mode(self, mode):
         """Switch rendering mode and reset other buffers if needed."""
@@ -57,11 +419,13 @@ class Message(widgets.HBox):
             # switching mode: keep only the relevant buffer
             if mode == "markdown":
                 self._md_buffer = ""
+                self._md_committed = 0
             elif mode == "html":
                 self._html_buffer = ""
             elif mode == "text":
                 self._text_buffer = ""
             self._mode = mode
+            self.content.reset(mode)
 
     # ------- public API -------
 
@@ -83,22 +447,59 @@ class Message(widgets.HBox):
         self._render()
 
     def append_markdown(self, chunk: str):
-        """Append a markdown chunk and re-render."""
+        """
+        Append a markdown chunk. Blocks that are complete are converted and
+        sent once; only the last open block is re-rendered.
+        """
+        if not chunk:
+            return
         self._set_mode("markdown")
         self._md_buffer += chunk
-        self._render()
+        pending = self._md_buffer[self._md_committed:]
+        cut = _markdown_cut(pending)
+        block = None
+        if cut:
+            block = markdown_to_html(pending[:cut], MD_EXTENSIONS, cache=False)
+            self._md_committed += cut
+        self.content.commit(block, self._md_tail_html())
 
     def append_text(self, chunk: str):
-        """Append plain text (no markdown/HTML parsing) and re-render."""
+        """Append plain text (no markdown/HTML parsing); only the chunk is sent."""
+        if not chunk:
+            return
         self._set_mode("text")
         self._text_buffer += chunk
-        self._render()
+        self.content.append(chunk)
 
     def append_html(self, chunk: str):
-        """Append raw HTML and re-render."""
+        """Append raw HTML; only the chunk is sent."""
+        if not chunk:
+            return
         self._set_mode("html")
         self._html_buffer += chunk
-        self._render()
+        self.content.append(chunk)
+
+    def stream(self, tokens, mode="markdown", interval=STREAM_INTERVAL, max_chars=STREAM_MAX_CHARS):
+        """
+        Append tokens from an iterable or async iterable, coalescing them.
+
+        Tokens are buffered and flushed at most once every `interval` seconds
+        (or sooner when `max_chars` are waiting), with a final flush when the
+        iterable is exhausted. Buffered text is also flushed when the producer
+        pauses, so a slow token never holds back the ones before it. Returns the streamed text; for an async
+        iterable returns a coroutine, so use `await message.stream(...)`.
+        """
+        appenders = {
+            "markdown": self.append_markdown,
+            "text": self.append_text,
+            "html": self.append_html,
+        }
+        if mode not in appenders:
+            raise ValueError("mode must be 'markdown', 'html', or 'text'")
+        buffer = _TokenBuffer(appenders[mode], interval, max_chars)
+        if hasattr(tokens, "__aiter__"):
+            return _stream_async(tokens, buffer)
+        return _stream_sync(tokens, buffer)
 
     def set_bouncing_text(self, text: str, color="#444"):
         """Render any string with bouncing animation per character."""
@@ -164,8 +565,42 @@ class Message(widgets.HBox):
         self.set_message(html=html)
 
     def clear(self):
+        self._mode = None
+        self._md_buffer = ""
+        self._md_committed = 0
+        self._html_buffer = ""
+        self._text_buffer = ""
+        self._render()
         self.output.clear_output(wait=True)
-    
+
+    def to_html(self) -> str:
+        """Static HTML snapshot of the message (used to archive old messages)."""
+        if self._mode == "markdown":
+            content = markdown_to_html(self._md_buffer, MD_EXTENSIONS, cache=False)
+        elif self._mode == "html":
+            content = self._html_buffer
+        elif self._mode == "text":
+            content = f'<div style="white-space:pre-wrap">{escape(self._text_buffer)}</div>'
+        else:
+            content = ""
+        outputs = "".join(_output_to_html(o) for o in self.output.outputs)
+        return (
+            '<div style="display:flex;align-items:flex-start;">'
+            f'<div style="margin:0 8px 8px 0;flex:none;">{self._avatar_html}</div>'
+            f'<div class="{MSG_CSS_CLASS} jp-RenderedHTMLCommon" '
+            'style="margin:8px 0 0 0;min-width:0;">'
+            f"{content}{outputs}</div></div>"
+        )
+
+    def close(self):
+        """Close the message and all of its child widgets."""
+        for child in self.children:
+            if isinstance(child, widgets.Box):
+                for grandchild in child.children:
+                    grandchild.close()
+            child.close()
+        super().close()
+
     def __enter__(self):
         return self.output.__enter__()
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -3,7 +3,7 @@ import traitlets
 from IPython.display import display
 
 from .manager import WidgetsManager, MERCURY_MIMETYPE
-from .theme import THEME
+from .styles import ensure_theme_css
 
 
 def Checkbox(*args, key: str = "", **kwargs):
@@ -15,6 +15,7 @@ def Checkbox(*args, key: str = "", **kwargs):
     cb = Checkbox(label="Auto-refresh")               # toggle switch (default)
     cb = Checkbox(label="I agree", appearance="box")  # classic square checkbox
     """
+    ensure_theme_css()
     code_uid = WidgetsManager.get_code_uid("Checkbox", key=key, args=args, kwargs=kwargs)
     cached = WidgetsManager.get_widget(code_uid)
     if cached:
@@ -131,100 +132,6 @@ class CheckboxWidget(anywidget.AnyWidget):
     export default { render };
     """
 
-    _css = f"""
-    .mljar-checkbox-container {{
-        display: inline-flex;
-        align-items: center;
-        gap: 10px;
-        cursor: pointer;
-        user-select: none;
-        -webkit-tap-highlight-color: transparent;
-        font-family: {THEME.get('font_family', 'Arial, sans-serif')};
-        color: {THEME.get('text_color', '#222')};
-    }}
-    .mljar-checkbox-container.is-disabled {{
-        opacity: 0.6;
-        cursor: not-allowed;
-    }}
-
-    .mljar-checkbox-input {{
-        position: absolute;
-        opacity: 0;
-        width: 0;
-        height: 0;
-    }}
-
-    .mljar-checkbox-input:focus-visible + .mljar-checkbox-control {{
-        box-shadow: 0 0 0 3px rgba(0, 123, 255, 0.35);
-    }}
-
-    .mljar-checkbox-label {{
-        font-size: {THEME.get('font_size', '14px')};
-        line-height: 1.2;
-        padding-top: 2px;
-    }}
-
-    /* --- Toggle style (15% smaller) --- */
-    .mljar-checkbox-container.is-toggle .mljar-checkbox-control {{
-        position: relative;
-        width: 34px;  /* smaller */
-        height: 19px; /* smaller */
-        border-radius: 999px;
-        background: {THEME.get('panel_bg_hover', '#e5e7eb')};
-        border: 1px solid {THEME.get('border_color', '#d0d0d0')};
-        transition: background 150ms ease, border-color 150ms ease;
-    }}
-    .mljar-checkbox-container.is-toggle.is-checked .mljar-checkbox-control {{
-        background: {THEME.get('primary_color', '#007bff')};
-        border-color: {THEME.get('primary_color', '#007bff')};
-    }}
-    .mljar-checkbox-container.is-toggle .mljar-checkbox-control::after {{
-        content: "";
-        position: absolute;
-        top: 2px;
-        left: 2px;
-        width: 15px;   /* smaller thumb */
-        height: 15px;
-        border-radius: 50%;
-        background: {THEME.get('widget_background_color', '#ffffff')};
-        box-shadow: 0 1px 2px rgba(0,0,0,0.12), 0 0 0 1px rgba(0,0,0,0.04);
-        transition: transform 150ms ease;
-    }}
-    .mljar-checkbox-container.is-toggle.is-checked .mljar-checkbox-control::after {{
-        transform: translateX(15px);  /* adjusted distance */
-    }}
-
-    /* --- Classic box style --- */
-    .mljar-checkbox-container.is-box .mljar-checkbox-control {{
-        width: 16px;
-        height: 16px;
-        border-radius: {THEME.get('border_radius_sm', '4px')};
-        border: 1px solid {THEME.get('border_color', '#ccc')};
-        background: {THEME.get('widget_background_color', '#fff')};
-        display: inline-block;
-        position: relative;
-    }}
-    .mljar-checkbox-container.is-box.is-checked .mljar-checkbox-control {{
-        border-color: {THEME.get('primary_color', '#007bff')};
-        background: {THEME.get('primary_color', '#007bff')};
-    }}
-    .mljar-checkbox-container.is-box.is-checked .mljar-checkbox-control::after {{
-        content: "";
-        position: absolute;
-        left: 4px;
-        top: 0px;
-        width: 5px;
-        height: 10px;
-        border: solid #fff;
-        border-width: 0 2px 2px 0;
-        transform: rotate(45deg);
-    }}
-
-    .mljar-checkbox-container:not(.is-disabled):hover .mljar-checkbox-control {{
-        filter: brightness(0.98);
-    }}
-    """
-
     value = traitlets.Bool(False).tag(sync=True)
     label = traitlets.Unicode("Enable").tag(sync=True)
     disabled = traitlets.Bool(False).tag(sync=True)
@@ -1,8 +1,9 @@
 import ipywidgets as widgets
-from IPython.display import HTML, display
+from IPython.display import display
 import traitlets
 
 from .manager import WidgetsManager, MERCURY_MIMETYPE
+from .styles import ensure_stylesheet
 from .theme import THEME
 
 
@@ -11,14 +12,12 @@ def display_style():
     border_radius = THEME.get("border_radius", "4px")
 
     css = f"""
-    <style>
     .mljar-column {{
         border-radius: {border_radius} !important;
     }}
-    </style>
     """
 
-    display(HTML(css))
+    ensure_stylesheet("columns", css)
 
 
 class ColumnsBox(widgets.HBox):
@@ -0,0 +1,76 @@
+import re
+
+import traitlets
+
+DEFAULT_COMMIT = "debounce:100"
+
+_COMMIT_RE = re.compile(r"^(live|release|blur|(debounce|throttle):\d+)$")
+
+# Shared by input widgets: prepend to `_esm` and call
+#   const committer = createCommitter(model);
+#   committer.change()  after each model.set() while the user edits,
+#   committer.settle()  when the user is done (slider released, input blurred,
+#                       Enter pressed, dropdown closed).
+COMMIT_POLICY_JS = """
+function createCommitter(model) {
+  let timer = null;
+  let dirty = false;
+  let last = 0;
+
+  function policy() {
+    const [mode, ms] = String(model.get("commit") || "%s").split(":");
+    return { mode, ms: Number(ms) || 0 };
+  }
+
+  function flush() {
+    if (timer) {
+      clearTimeout(timer);
+      timer = null;
+    }
+    if (!dirty) return;
+    dirty = false;
+    last = Date.now();
+    model.save_changes();
+  }
+
+  function change() {
+    dirty = true;
+    const { mode, ms } = policy();
+    if (mode === "live") {
+      flush();
+    } else if (mode === "debounce") {
+      if (timer) clearTimeout(timer);
+      timer = setTimeout(flush, ms);
+    } else if (mode === "throttle") {
+      const wait = ms - (Date.now() - last);
+      if (wait <= 0) flush();
+      else if (!timer) timer = setTimeout(flush, wait);
+    }
+    // "release" / "blur": nothing is sent until settle()
+  }
+
+  return { change, settle: flush };
+}
+""" % DEFAULT_COMMIT
+
+
+def validate_commit(value: str) -> str:
+    """Check a commit policy: live, release, blur, debounce:<ms> or throttle:<ms>."""
+    if not isinstance(value, str) or not _COMMIT_RE.match(value):
+        raise traitlets.TraitError(
+            "commit must be 'live', 'release', 'blur', 'debounce:<ms>' or 'throttle:<ms>'"
+        )
+    return value
+
+
+class CommitPolicyMixin(traitlets.HasTraits):
+    """Adds the synced, validated `commit` trait read by COMMIT_POLICY_JS."""
+
+    commit = traitlets.Unicode(
+        DEFAULT_COMMIT,
+        help="When edits are sent to Python: live, debounce:<ms>, throttle:<ms>, release or blur",
+    ).tag(sync=True)
+
+    @traitlets.validate("commit")
+    def _validate_commit(self, proposal):
+        return validate_commit(proposal["value"])
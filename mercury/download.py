@@ -1,13 +1,79 @@
+import collections.abc
+import json
+import logging
+import os
+import secrets
+
 import anywidget
 import traitlets
+from IPython.display import display
 
 from .manager import WidgetsManager, MERCURY_MIMETYPE
+from .paths import data_dir
+
+log = logging.getLogger(__name__)
 
 def _filter_identity_kwargs(d, exclude=("value", "data")):
     # keep only config; drop state-like keys
     return {k: v for k, v in d.items() if k not in exclude}
 
+def _is_lazy(data):
+    """Producers: callables (run on every click) and one-shot iterators/generators."""
+    return callable(data) or isinstance(data, collections.abc.Iterator)
+
+def _iter_chunks(data):
+    """Yield bytes chunks from a producer: callable, generator, iterable, str or bytes."""
+    if callable(data):
+        data = data()
+    if isinstance(data, str):
+        yield data.encode("utf-8")
+    elif isinstance(data, (bytes, bytearray, memoryview)):
+        yield data
+    else:
+        for chunk in data:
+            yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
+def _start_download(filename, mime):
+    """Create the staging files of a download; return (token, path without suffix)."""
+    token = secrets.token_hex(16)
+    path = os.path.join(data_dir("downloads"), token)
+    with open(path + ".json", "w", encoding="utf-8") as f:
+        json.dump({"filename": filename, "mime": mime}, f)
+    open(path + ".part", "wb").close()
+    return token, path
+
+def _write_download(path, data):
+    """
+    Append produced chunks to `<path>.part` as they come; the server streams
+    the file while it grows. Renamed to `<path>` when complete, or replaced
+    by `<path>.error` when the producer fails.
+    """
+    try:
+        with open(path + ".part", "ab") as f:
+            for chunk in _iter_chunks(data):
+                f.write(chunk)
+                f.flush()
+        os.replace(path + ".part", path)
+    except Exception as e:
+        with open(path + ".error", "w", encoding="utf-8") as f:
+            f.write(str(e))
+        try:
+            os.remove(path + ".part")
+        except OSError:
+            pass
+        raise
+
 def Download(data, filename="file.txt", label="Download", mime="text/plain", key="", is_base64=False, **kwargs):
+    """
+    Display a download button.
+
+    `data` is text or base64 (`is_base64=True`) embedded in the widget, or a
+    producer: a callable returning str/bytes/iterable of chunks, or a generator
+    function. Producers run only when the button is clicked and the result is
+    streamed by the Mercury server while it is produced, so it never sits in
+    the widget state. A generator or iterator object can be downloaded once;
+    pass the generator function to allow repeated downloads.
+    """
     id_kwargs = _filter_identity_kwargs(
         dict(filename=filename, label=label, mime=mime, is_base64=is_base64, **kwargs),
         exclude=("value", "data")
@@ -15,6 +81,9 @@ def Download(data, filename="file.txt", label="Download", mime="text/plain", key
     code_uid = WidgetsManager.get_code_uid("Download", key=key, kwargs=id_kwargs)
     cached = WidgetsManager.get_widget(code_uid)
     if cached:
+        if cached.lazy and _is_lazy(data):
+            cached._producer = data
+            cached._consumed = False
         display(cached)
         return cached
     instance = DownloadWidget(
@@ -33,11 +102,22 @@ class DownloadWidget(anywidget.AnyWidget):
     _esm = """
     function base64ToBlob(base64, mime) {
         const binary = atob(base64);
-        const array = [];
+        const bytes = new Uint8Array(binary.length);
         for (let i = 0; i < binary.length; i++) {
-            array.push(binary.charCodeAt(i));
+            bytes[i] = binary.charCodeAt(i);
         }
-        return new Blob([new Uint8Array(array)], {type: mime});
+        return new Blob([bytes], {type: mime});
+    }
+
+    function serverUrl(path) {
+        let config = {};
+        try {
+            const el = document.getElementById("jupyter-config-data");
+            config = el ? JSON.parse(el.textContent) : {};
+        } catch (e) {}
+        const base = (config.baseUrl || "/").replace(/\\/?$/, "/");
+        const url = base + path;
+        return config.token ? `${url}?token=${encodeURIComponent(config.token)}` : url;
     }
 
     function render({ model, el }) {
@@ -52,7 +132,29 @@ class DownloadWidget(anywidget.AnyWidget):
         btn.innerHTML = model.get("label") || "Download";
         btn.classList.add("mljar-download-btn");
 
+        let pendingRequest = null;
+        model.on("msg:custom", (msg) => {
+            if (!msg || msg.request_id !== pendingRequest) return;
+            pendingRequest = null;
+            btn.disabled = false;
+            btn.innerHTML = model.get("label") || "Download";
+            if (msg.type === "ready") {
+                triggerDownload(serverUrl(`mercury/api/download/${msg.token}`), model.get("filename") || "file.txt", false);
+            } else if (msg.type === "error") {
+                alert("Download failed: " + msg.error);
+            }
+        });
+
         btn.onclick = () => {
+            if (model.get("lazy")) {
+                // data is produced in the kernel and streamed by the server
+                if (pendingRequest !== null) return;
+                pendingRequest = `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+                btn.disabled = true;
+                btn.innerHTML = "Preparing…";
+                model.send({ type: "prepare", request_id: pendingRequest });
+                return;
+            }
             const data = model.get("data") || "";
             const filename = model.get("filename") || "file.txt";
             const mime = model.get("mime") || "application/octet-stream";
@@ -70,14 +172,14 @@ class DownloadWidget(anywidget.AnyWidget):
             }
         };
 
-        function triggerDownload(url, filename) {
+        function triggerDownload(url, filename, revoke = true) {
             const a = document.createElement("a");
             a.href = url;
             a.download = filename;
             document.body.appendChild(a);
             a.click();
             document.body.removeChild(a);
-            setTimeout(() => URL.revokeObjectURL(url), 1000);
+            if (revoke) setTimeout(() => URL.revokeObjectURL(url), 1000);
         }
 
         container.appendChild(btn);
@@ -110,6 +212,7 @@ class DownloadWidget(anywidget.AnyWidget):
     mime = traitlets.Unicode("text/plain").tag(sync=True)
     label = traitlets.Unicode("Download").tag(sync=True)
     is_base64 = traitlets.Bool(False).tag(sync=True)  # True if data is base64
+    lazy = traitlets.Bool(False).tag(sync=True)  # True if data is produced on click
 
     # Optionally, custom CSS or placement as in your Slider
     custom_css = traitlets.Unicode(default_value="", help="Extra CSS to append to default styles").tag(sync=True)
@@ -119,6 +222,51 @@ class DownloadWidget(anywidget.AnyWidget):
         help="Widget placement: sidebar, inline, or bottom"
     ).tag(sync=True)
 
+    def __init__(self, data="", **kwargs):
+        self._producer = None
+        self._consumed = False
+        if _is_lazy(data):
+            self._producer = data
+            kwargs["lazy"] = True
+            data = ""
+        elif not isinstance(data, str):
+            raise TypeError(
+                "Download data must be str (text or base64), or a callable or "
+                f"generator producing chunks, not {type(data).__name__}"
+            )
+        super().__init__(data=data, **kwargs)
+        self.on_msg(self._handle_custom_msg)
+
+    def _handle_custom_msg(self, _widget, content, _buffers):
+        if not isinstance(content, dict) or content.get("type") != "prepare":
+            return
+        request_id = content.get("request_id")
+        producer = self._producer
+        if not callable(producer):
+            if self._consumed:
+                self.send({
+                    "type": "error",
+                    "request_id": request_id,
+                    "error": "this generator was already downloaded; pass a generator "
+                             "function to Download(data=...) to allow repeated downloads",
+                })
+                return
+            self._consumed = True
+        try:
+            token, path = _start_download(self.filename, self.mime)
+        except Exception as e:
+            log.warning(f"Failed to prepare download {self.filename}: {e}")
+            self.send({"type": "error", "request_id": request_id, "error": str(e)})
+            return
+        # the browser starts fetching while the producer is still running
+        self.send({"type": "ready", "request_id": request_id, "token": token})
+        try:
+            _write_download(path, producer)
+        except Exception as e:
+            # the server aborts the streamed response, so the browser reports
+            # the download as failed; nothing more to tell the widget
+            log.warning(f"Failed to produce download {self.filename}: {e}")
+
     def _repr_mimebundle_(self, **kwargs):
         data = super()._repr_mimebundle_()
         if len(data) > 1:
@@ -4,11 +4,11 @@ import ipywidgets as widgets
 from IPython.display import display
 
 from .manager import WidgetsManager, MERCURY_MIMETYPE
+from .styles import ensure_stylesheet, ensure_theme_css
 from .theme import THEME
 
 def _ensure_global_expander_styles():
     css = f"""
-    <style>
       .mljar-expander-box {{
         width: 100%;
         border: 1px solid {THEME.get('border_color', '#ddd')};
@@ -72,19 +72,45 @@ def _ensure_global_expander_styles():
           transform: none;
         }}
       }}
-    </style>
     """
-    style_html = widgets.HTML(css)
-    display(style_html)
+    ensure_stylesheet("expander", css)
 
 
-def Expander(label="Details", expanded=False, key=""):
+class _DeferredContent:
+    """
+    Runs the expander's content callable into its Output the first time the
+    expander is open, and keeps the result until the cell runs again.
+    """
+    def __init__(self, out):
+        self.out = out
+        self.content = None
+        self.rendered = False
+
+    def update(self, content):
+        self.content = content
+        self.rendered = False
+
+    def render(self):
+        if self.content is None or self.rendered:
+            return
+        self.out.clear_output(wait=True)
+        with self.out:
+            self.content()
+        self.rendered = True
+
+
+def Expander(label="Details", expanded=False, key="", content=None):
     """
     Displays an expander with one unified border and smooth animation.
 
     IMPORTANT: We DO NOT display() on the cached path to avoid duplicates.
     Use a stable `key` to make re-runs reuse the same cached instance.
+
+    `content` is an optional callable that fills the expander. It runs only
+    when the expander is opened (or right away if it is open), so collapsed
+    sections cost nothing; the result is kept until the cell runs again.
     """
+    ensure_theme_css()
     _ensure_global_expander_styles()
 
     code_uid = WidgetsManager.get_code_uid("Expander", key=key, kwargs=dict(label=label))
@@ -92,8 +118,11 @@ def Expander(label="Details", expanded=False, key=""):
     if cached:
         # Don't display again — that would append another copy in output.
         # Just return the existing Output area so user can write to it.
-        _box, out, _header, _content_box = cached
+        _box, out, header, _content_box, deferred = cached
+        deferred.update(content)
         display(_box)
+        if header.expanded:
+            deferred.render()
         return out
 
     header = _ExpanderHeaderWidget(label=label, expanded=expanded)
@@ -106,9 +135,13 @@ def Expander(label="Details", expanded=False, key=""):
     if expanded:
         content_box.add_class("is-open")
 
+    deferred = _DeferredContent(out)
+    deferred.update(content)
+
     def _on_expand_change(change):
         if change["new"]:
             content_box.add_class("is-open")
+            deferred.render()
         else:
             content_box.remove_class("is-open")
     header.observe(_on_expand_change, names="expanded")
@@ -118,7 +151,9 @@ def Expander(label="Details", expanded=False, key=""):
 
     # Only display on first creation
     display(box)
-    WidgetsManager.add_widget(code_uid, (box, out, header, content_box))
+    WidgetsManager.add_widget(code_uid, (box, out, header, content_box, deferred))
+    if expanded:
+        deferred.render()
     return out
 
 
@@ -177,45 +212,6 @@ class _ExpanderHeaderWidget(anywidget.AnyWidget):
     export default { render };
     """
 
-    _css = f"""
-    .mljar-expander-header {{
-      width: 100%;
-      display: flex;
-      align-items: center;
-      gap: 8px;
-      background: {THEME.get('panel_bg_hover', '#f7f7f9')};
-      border: 0;
-      padding: 8px 10px;
-      cursor: pointer;
-      text-align: left;
-      font-family: {THEME.get('font_family', 'Arial, sans-serif')};
-      font-size: {THEME.get('font_size', '14px')};
-      font-weight: {THEME.get('font_weight', '600')};
-      color: {THEME.get('text_color', '#222')};
-      transition: background 0.15s ease;
-      position: relative;
-    }}
-    .mljar-expander-header:hover {{
-      background: {THEME.get('panel_bg_hover_2', '#efefef')};
-    }}
-    .mljar-expander-icon {{
-      display: inline-block;
-      width: 0;
-      height: 0;
-      border-left: 6px solid transparent;
-      border-right: 6px solid transparent;
-      border-top: 8px solid {THEME.get('primary_color', '#007bff')};
-      transform: rotate(0deg);
-      transition: transform 0.15s ease;
-    }}
-    .mljar-expander-header.is-open .mljar-expander-icon {{
-      transform: rotate(180deg);
-    }}
-    .mljar-expander-label {{
-      flex: 1 1 auto;
-    }}
-    """
-
     def _repr_mimebundle_(self, **kwargs):
         data = super()._repr_mimebundle_()
         if len(data) > 1:
@@ -1,3 +1,9 @@
+import io
+import mmap
+import os
+import tempfile
+import weakref
+
 import anywidget
 import traitlets
 from IPython.display import display
@@ -5,12 +11,126 @@ from IPython.display import display
 from .manager import WidgetsManager, MERCURY_MIMETYPE
 from .theme import THEME
 
+_SIZE_UNITS = {"KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+
+
+def _parse_size(size):
+    """Convert sizes like '100MB' (same units as the browser check) to bytes."""
+    if isinstance(size, (int, float)):
+        return int(size)
+    text = str(size).strip().upper()
+    for unit, multiplier in _SIZE_UNITS.items():
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * multiplier)
+    return int(float(text.rstrip("B")))
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
 class UploadedFile:
-    def __init__(self, name, value):
+    """
+    File received by FileWidget.
+
+    Content is kept in memory until it grows past `spool_threshold` bytes,
+    then it is moved to a temporary file on disk. Use `.open()`, `.path` or
+    `.getbuffer()` to read it without building extra copies; `.value`
+    always returns a new `bytes` object.
+    """
+    def __init__(self, name, value=b"", spool_threshold=None):
         self.name = name
-        self.value = bytes(value)
+        self.size = 0
+        self._spool_threshold = spool_threshold
+        self._buffer = io.BytesIO()
+        self._path = None
+        self._disk = None
+        self._finalizer = None
+        if value:
+            self.write(value)
+
+    def write(self, chunk):
+        """Append a chunk, spilling to disk once the threshold is exceeded."""
+        if (
+            self._path is None
+            and self._spool_threshold is not None
+            and self.size + len(chunk) > self._spool_threshold
+        ):
+            self._spill()
+        if self._path is None:
+            self._buffer.write(chunk)
+        else:
+            self._disk.write(chunk)
+        self.size += len(chunk)
+
+    def _spill(self):
+        suffix = os.path.splitext(self.name or "")[1]
+        fd, path = tempfile.mkstemp(prefix="mercury-upload-", suffix=suffix)
+        self._disk = os.fdopen(fd, "wb")
+        self._disk.write(self._buffer.getbuffer())
+        self._buffer = None
+        self._path = path
+        self._finalizer = weakref.finalize(self, _remove_file, path)
+
+    def _flush(self):
+        if self._disk is not None:
+            self._disk.flush()
+
+    @property
+    def in_memory(self):
+        return self._path is None
+
+    @property
+    def path(self):
+        """Path of the file on disk (in-memory content is spilled on first access)."""
+        if self._path is None:
+            self._spill()
+        self._flush()
+        return self._path
+
+    def open(self, mode="rb"):
+        """Return a readable binary file object."""
+        if "b" not in mode or any(m in mode for m in "wax+"):
+            raise ValueError("UploadedFile can only be opened for binary reading")
+        if self._path is None:
+            return io.BytesIO(self._buffer.getbuffer())
+        self._flush()
+        return open(self._path, mode)
+
+    def getbuffer(self):
+        """Zero-copy read-only memoryview (memory-mapped when on disk)."""
+        if self._path is None:
+            return self._buffer.getbuffer().toreadonly()
+        if self.size == 0:
+            return memoryview(b"")
+        self._flush()
+        with open(self._path, "rb") as f:
+            return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @property
+    def value(self):
+        if self._path is None:
+            return self._buffer.getvalue()
+        with self.open() as f:
+            return f.read()
+
+    def close(self):
+        """Release memory and remove the temporary file, if any."""
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+        if self._finalizer is not None:
+            self._finalizer()
+        self._buffer = io.BytesIO()
+        self._path = None
+        self.size = 0
+
     def __repr__(self):
-        return f"UploadedFile(name={self.name!r}, value=<{len(self.value)} bytes>)"
+        where = "memory" if self.in_memory else "disk"
+        return f"UploadedFile(name={self.name!r}, value=<{self.size} bytes in {where}>)"
 
 
 class FileWidget(anywidget.AnyWidget):
@@ -55,9 +175,54 @@ class FileWidget(anywidget.AnyWidget):
       const openPicker = () => input.click();
       browseBtn.onclick = openPicker;
 
-      function handleFiles(files) {
+      // ---- chunked binary upload: one chunk in flight, next one sent on ack
+      const ackWaiters = new Map(); // upload id -> resolve
+      const uploading = new Map();  // upload id -> { name, received, total }
+
+      model.on("msg:custom", (msg) => {
+        if (!msg || msg.type !== "ack") return;
+        const resolve = ackWaiters.get(msg.id);
+        if (resolve) {
+          ackWaiters.delete(msg.id);
+          resolve(msg);
+        }
+      });
+
+      function sendChunk(id, name, offset, total, buf) {
+        return new Promise((resolve) => {
+          ackWaiters.set(id, resolve);
+          model.send({ type: "chunk", id, name, offset, total }, undefined, [buf]);
+        });
+      }
+
+      async function uploadFile(file) {
+        const chunkSize = model.get("chunk_size");
+        const id = `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+        uploading.set(id, { name: file.name, received: 0, total: file.size });
+        updateList();
+        let offset = 0;
+        do {
+          const buf = await file.slice(offset, offset + chunkSize).arrayBuffer();
+          const ack = await sendChunk(id, file.name, offset, file.size, buf);
+          if (ack.error) {
+            uploading.delete(id);
+            updateList();
+            alert("Upload of " + file.name + " failed: " + ack.error);
+            return;
+          }
+          offset = ack.received;
+          uploading.get(id).received = offset;
+          updateList();
+        } while (offset < file.size);
+        uploading.delete(id);
+        model.set("file_ids", [...model.get("file_ids"), id]);
+        model.set("filenames", [...model.get("filenames"), file.name]);
+        model.save_changes();
+      }
+
+      async function handleFiles(files) {
         const filesArr = Array.from(files);
-        filesArr.forEach(file => {
+        for (const file of filesArr) {
           const maxSize = model.get("max_file_size");
           let allowed = true;
           if (maxSize.endsWith("MB")) {
@@ -69,20 +234,10 @@ class FileWidget(anywidget.AnyWidget):
           }
           if (!allowed) {
             alert("File " + file.name + " is too large!");
-            return;
+            continue;
           }
-          const reader = new FileReader();
-          reader.onload = (evt) => {
-            const newVals = [...model.get("values")];
-            const newNames = [...model.get("filenames")];
-            newVals.push(Array.from(new Uint8Array(evt.target.result)));
-            newNames.push(file.name);
-            model.set("values", newVals);
-            model.set("filenames", newNames);
-            model.save_changes();
-          };
-          reader.readAsArrayBuffer(file);
-        });
+          await uploadFile(file);
+        }
       }
 
       input.addEventListener("change", () => handleFiles(input.files));
@@ -107,19 +262,26 @@ class FileWidget(anywidget.AnyWidget):
           remove.type = "button";
           remove.textContent = "×";
           remove.onclick = () => {
-            const newVals = [...model.get("values")];
+            const newIds = [...model.get("file_ids")];
             const newNames = [...model.get("filenames")];
-            newVals.splice(i,1);
+            newIds.splice(i,1);
             newNames.splice(i,1);
-            model.set("values", newVals);
+            model.set("file_ids", newIds);
             model.set("filenames", newNames);
             model.save_changes();
           };
           li.appendChild(remove);
           fileList.appendChild(li);
         }
+        for (const { name, received, total } of uploading.values()) {
+          const pct = total > 0 ? Math.floor((received / total) * 100) : 0;
+          const li = document.createElement("li");
+          li.classList.add("mljar-file-list-item", "is-uploading");
+          li.innerHTML = `<span class="mljar-file-icon">⏳</span> <span class="mljar-file-name" title="${name}">${name}</span> <span class="mljar-file-progress">${pct}%</span>`;
+          fileList.appendChild(li);
+        }
       }
-      model.on("change:values", updateList);
+      model.on("change:file_ids", updateList);
       model.on("change:filenames", updateList);
 
       dropzone.appendChild(browseBtn);
@@ -212,6 +374,8 @@ class FileWidget(anywidget.AnyWidget):
         .mljar-file-icon { margin-right: 7px; }
         .mljar-file-name { overflow: hidden; text-overflow: ellipsis; white-space: nowrap; max-width: calc(100% - 42px); }
         .mljar-file-remove-btn { margin-left: 8px; background: none; border: none; color: #f44; font-size: 1.1em; cursor: pointer; font-weight: 700; }
+        .mljar-file-list-item.is-uploading { color: #666; }
+        .mljar-file-progress { margin-left: 8px; font-size: 0.9em; font-variant-numeric: tabular-nums; }
 
         /* ======= Container queries: ONE breakpoint ======= */
         /* Narrow < 320px: stack button full width under text */
@@ -273,16 +437,101 @@ class FileWidget(anywidget.AnyWidget):
     hidden = traitlets.Bool(False).tag(sync=True)
     multiple = traitlets.Bool(False).tag(sync=True)
     key = traitlets.Unicode("").tag(sync=True)
-    values = traitlets.List(traitlets.List(traitlets.Int())).tag(sync=True)
+    chunk_size = traitlets.Int(1024 * 1024).tag(sync=True)
+    # uploads larger than this are streamed to a temporary file (kernel only);
+    # bytes as int or a size string like "10MB"
+    spool_threshold = traitlets.Union([traitlets.Int(), traitlets.Unicode()], default_value="10MB")
+    # ids of completed uploads; file bytes stay in the kernel, never in widget state
+    file_ids = traitlets.List(traitlets.Unicode()).tag(sync=True)
     filenames = traitlets.List(traitlets.Unicode()).tag(sync=True)
     custom_css = traitlets.Unicode(default_value="", help="Extra CSS to append to default styles").tag(sync=True)
     position = traitlets.Enum(["sidebar", "inline", "bottom"], default_value="sidebar").tag(sync=True)
     cell_id = traitlets.Unicode(allow_none=True).tag(sync=True)
 
+    @traitlets.validate("spool_threshold")
+    def _validate_spool_threshold(self, proposal):
+        try:
+            _parse_size(proposal["value"])
+        except ValueError:
+            raise traitlets.TraitError(
+                f"spool_threshold must be bytes or a size like '10MB', got {proposal['value']!r}"
+            ) from None
+        return proposal["value"]
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._uploads = {}  # upload id -> UploadedFile (in progress)
+        self._files = {}    # upload id -> UploadedFile (completed)
+        self.on_msg(self._handle_custom_msg)
+        self.observe(self._on_file_ids_change, names="file_ids")
+
+    def _handle_custom_msg(self, _widget, content, buffers):
+        if not isinstance(content, dict):
+            return
+        if content.get("type") == "chunk":
+            self._receive_chunk(content, buffers or [])
+        elif content.get("type") == "cancel":
+            self._discard_upload(str(content.get("id", "")))
+
+    def _receive_chunk(self, content, buffers):
+        upload_id = str(content.get("id", ""))
+        offset = int(content.get("offset", 0))
+        total = int(content.get("total", 0))
+
+        if total > _parse_size(self.max_file_size):
+            self._discard_upload(upload_id)
+            self.send({"type": "ack", "id": upload_id, "error": "file is too large"})
+            return
+        if offset == 0:
+            self._discard_upload(upload_id)
+            self._uploads[upload_id] = UploadedFile(
+                content.get("name", ""), spool_threshold=_parse_size(self.spool_threshold)
+            )
+        upload = self._uploads.get(upload_id)
+        if upload is None or offset != upload.size:
+            self._discard_upload(upload_id)
+            self.send({"type": "ack", "id": upload_id, "error": "unexpected chunk offset"})
+            return
+
+        for chunk in buffers:
+            upload.write(chunk)
+        if upload.size >= total:
+            del self._uploads[upload_id]
+            self._files[upload_id] = upload
+        self.send({"type": "ack", "id": upload_id, "received": upload.size, "total": total})
+
+    def _discard_upload(self, upload_id):
+        upload = self._uploads.pop(upload_id, None)
+        if upload is not None:
+            upload.close()
+
+    def _on_file_ids_change(self, change):
+        keep = set(change["new"])
+        for upload_id in list(self._files):
+            if upload_id not in keep:
+                self._files.pop(upload_id).close()
+
+    def close(self):
+        uploads = getattr(self, "_uploads", {})
+        files = getattr(self, "_files", {})
+        for upload in [*uploads.values(), *files.values()]:
+            upload.close()
+        uploads.clear()
+        files.clear()
+        super().close()
+
+    def _uploaded(self):
+        return [self._files[i] for i in self.file_ids if i in self._files]
+
+    @property
+    def values(self):
+        return [f.value for f in self._uploaded()]
+
     @property
     def value(self):
-        if self.values and self.values[0]:
-            return bytes(self.values[0])
+        files = self._uploaded()
+        if files and files[0].value:
+            return files[0].value
         return None
 
     @property
@@ -292,15 +541,15 @@ class FileWidget(anywidget.AnyWidget):
         return None
 
     def __iter__(self):
-        return (UploadedFile(name, value) for name, value in zip(self.filenames, self.values))
+        return iter(self._uploaded())
 
     @property
     def files(self):
-        return [UploadedFile(name, value) for name, value in zip(self.filenames, self.values)]
+        return self._uploaded()
 
     @property
     def values_bytes(self):
-        return [bytes(val) for val in self.values]
+        return self.values
 
     @property
     def names(self):
@@ -322,10 +571,13 @@ class FileWidget(anywidget.AnyWidget):
         return data
 
 
-def File(label="Choose a file", max_file_size="100MB", key="", disabled=False, hidden=False, multiple=False):
+def File(label="Choose a file", max_file_size="100MB", key="", disabled=False, hidden=False, multiple=False,
+         spool_threshold="10MB"):
     code_uid = WidgetsManager.get_code_uid("File", key=key, kwargs=dict(label=label, max_file_size=max_file_size, multiple=multiple))
     cached = WidgetsManager.get_widget(code_uid)
     if cached:
+        # kernel-only setting: apply it without recreating the widget (and its uploads)
+        cached.spool_threshold = spool_threshold
         display(cached)
         return cached
     instance = FileWidget(
@@ -335,6 +587,7 @@ def File(label="Choose a file", max_file_size="100MB", key="", disabled=False, h
         hidden=hidden,
         multiple=multiple,
         key=key,
+        spool_threshold=spool_threshold,
     )
     WidgetsManager.add_widget(code_uid, instance)
     display(instance)
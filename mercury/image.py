@@ -1,18 +1,33 @@
 import os
 import base64
 import mimetypes
+import warnings
 import ipywidgets as widgets
 from IPython.display import display
 from html import escape
 
 from .manager import WidgetsManager
+from .media import file_digest, media_served, register_media
+from .paths import data_dir
+from .styles import ensure_stylesheet
 from .theme import THEME
 
+try:
+    # Optional: resizing and WebP/AVIF variants of local images
+    from PIL import Image as PILImage, ImageOps, features as pil_features
+except ImportError:
+    PILImage = None
+
+# CSS pixels for thumbnails; variants are encoded at 2x for high-DPI screens
+THUMBNAIL_WIDTH = 320
+# encoded width used when the card width is relative (e.g. '100%')
+DEFAULT_MAX_WIDTH = 1600
+VARIANT_QUALITY = 80
+
 
 # ---------- Global CSS (injected once) ----------
 def _ensure_global_image_styles():
     css = f"""
-    <style>
       .mljar-image-card {{
         width: 100%;
         display: flex;
@@ -54,9 +69,8 @@ def _ensure_global_image_styles():
         max-width: 100%;
         box-sizing: border-box;
       }}
-    </style>
     """
-    display(widgets.HTML(css))
+    ensure_stylesheet("image", css)
 
 
 def _path_to_data_uri(path: str) -> str:
@@ -70,19 +84,97 @@ def _path_to_data_uri(path: str) -> str:
 
 
 def _img_src(url_or_path: str) -> str:
-    """Return an <img> src from URL or local file path (as data URI)."""
+    """
+    Return an <img> src from URL or local file path: served from the media
+    store under a Mercury server, embedded as a data: URI anywhere else.
+    """
     if isinstance(url_or_path, str) and url_or_path.lower().startswith(("http://", "https://")):
         return url_or_path
     if isinstance(url_or_path, str) and os.path.exists(url_or_path):
+        if media_served():
+            try:
+                return register_media(url_or_path)
+            except OSError:
+                pass
         return _path_to_data_uri(url_or_path)
     return url_or_path
 
 
+# ---------- Resized / transcoded variants (on-disk cache) ----------
+def _pil_supports(fmt: str) -> bool:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            return bool(pil_features.check(fmt))
+        except Exception:
+            return False
+
+
+def _target_width(width: str, max_width, thumbnail: bool) -> int:
+    if thumbnail:
+        return THUMBNAIL_WIDTH * 2
+    if max_width:
+        return int(max_width)
+    if isinstance(width, str) and width.strip().endswith("px"):
+        return int(float(width.strip()[:-2]) * 2)
+    return DEFAULT_MAX_WIDTH
+
+
+def _encode_variant(path: str, digest: str, width: int, fmt: str) -> str:
+    """Resize `path` to at most `width` pixels and encode as `fmt`; cached on disk."""
+    ext = "jpg" if fmt == "jpeg" else fmt
+    out = os.path.join(data_dir("image_cache"), f"{digest}-w{width}-q{VARIANT_QUALITY}.{ext}")
+    if os.path.exists(out):
+        return out
+    with PILImage.open(path) as im:
+        im = ImageOps.exif_transpose(im)
+        if im.width > width:
+            im.thumbnail((width, im.height), PILImage.LANCZOS)
+        if fmt == "jpeg" and im.mode not in ("RGB", "L"):
+            im = im.convert("RGB")
+        tmp = f"{out}.{os.getpid()}.part"
+        im.save(tmp, format=fmt.upper(), quality=VARIANT_QUALITY)
+    os.replace(tmp, out)
+    return out
+
+
+def _image_variants(path: str, width: int):
+    """
+    Return (sources, fallback_url) for a <picture> element, or None when the
+    file cannot be processed (no Pillow, animated or unsupported image).
+    """
+    if PILImage is None:
+        return None
+    try:
+        with PILImage.open(path) as im:
+            if getattr(im, "is_animated", False):
+                return None
+            has_alpha = im.mode in ("RGBA", "LA", "P")
+        digest = file_digest(path)
+        fallback = _encode_variant(path, digest, width, "png" if has_alpha else "jpeg")
+        if not media_served():
+            # embedded: one data: URI only, alternative formats would multiply the size
+            return [], _path_to_data_uri(fallback)
+        sources = []
+        for fmt in ("avif", "webp"):
+            if _pil_supports(fmt):
+                try:
+                    variant = _encode_variant(path, digest, width, fmt)
+                    sources.append((f"image/{fmt}", register_media(variant, link=True)))
+                except Exception:
+                    pass
+        # cached variants are never rewritten in place, so link them into the store
+        return sources, register_media(fallback, link=True)
+    except Exception:
+        return None
+
+
 # ---------- Public API ----------
 def ImageCard(src: str, caption: str = "",
               width: str = "100%", height: str | None = None,
               rounded: bool = True, show_border: bool = True,
-              key: str = "") -> widgets.VBox:
+              optimize: bool = False, max_width: int | None = None,
+              thumbnail: bool = False, key: str = "") -> widgets.VBox:
     """
     Display an image from URL or local file with a caption (centered, italic).
 
@@ -100,6 +192,15 @@ def ImageCard(src: str, caption: str = "",
         Apply theme border radius to the image area.
     show_border : bool
         Show or hide the border around the image card.
+    optimize : bool
+        For local files (requires Pillow), send a copy resized to the card
+        width and re-encoded (lossy, quality 80) plus AVIF/WebP versions
+        picked by the browser. Variants are cached on disk and shared
+        between sessions. Off by default.
+    max_width : int | None
+        Pixel width of the resized copy. Defaults to 2x a px `width`, or 1600.
+    thumbnail : bool
+        Show a small thumbnail (for galleries) linking to the full image.
     key : str
         Stable cache key to reuse the same widget instance.
 
@@ -112,7 +213,8 @@ def ImageCard(src: str, caption: str = "",
 
     code_uid = WidgetsManager.get_code_uid("ImageCard", key=key or src or "image", 
                 kwargs=dict(src=src, caption=caption, width=width, 
-                height=height, rounded=rounded, show_border=show_border
+                height=height, rounded=rounded, show_border=show_border,
+                optimize=optimize, max_width=max_width, thumbnail=thumbnail
                 ))
     cached = WidgetsManager.get_widget(code_uid)
     if cached:
@@ -125,7 +227,26 @@ def ImageCard(src: str, caption: str = "",
     if height:
         style_parts = ["width:100%;", f"height:{height};", "object-fit:contain;"]
 
-    img_html = f'<img src="{escape(img_src, quote=True)}" alt="image" style={"".join(style_parts)} />'
+    variants = None
+    is_local = isinstance(src, str) and img_src != src
+    if is_local and (optimize or thumbnail):
+        variants = _image_variants(src, _target_width(width, max_width, thumbnail))
+
+    if variants:
+        sources, fallback = variants
+        source_tags = "".join(
+            f'<source type="{mime}" srcset="{escape(url, quote=True)}" />' for mime, url in sources
+        )
+        img_html = (
+            f'<picture>{source_tags}'
+            f'<img src="{escape(fallback, quote=True)}" alt="image" loading="lazy" style={"".join(style_parts)} />'
+            f'</picture>'
+        )
+    else:
+        img_html = f'<img src="{escape(img_src, quote=True)}" alt="image" style={"".join(style_parts)} />'
+    # browsers refuse to open data: URIs in a new tab, so embedded thumbnails are not links
+    if thumbnail and is_local and not img_src.startswith("data:"):
+        img_html = f'<a href="{escape(img_src, quote=True)}" target="_blank" rel="noopener">{img_html}</a>'
 
     # Optional rounded style
     wrap_style = f"border-radius:{THEME.get('border_radius','8px')};" if rounded else "border-radius:0;"
@@ -1,11 +1,14 @@
 import anywidget
 import traitlets
 import json
+import math
+from IPython.display import display
 from .manager import WidgetsManager, MERCURY_MIMETYPE
-from .theme import THEME
+from .styles import ensure_theme_css
 
 
 def JSON(*args, key="", **kwargs):
+    ensure_theme_css()
     code_uid = WidgetsManager.get_code_uid("JSON", key=key, args=args, kwargs=kwargs)
     cached = WidgetsManager.get_widget(code_uid)
     if cached:
@@ -56,11 +59,163 @@ class JSONViewer(anywidget.AnyWidget):
         }
       }
 
-      draw();
+      // lazy mode: the kernel keeps the object, nodes are fetched when expanded
+      let requestSeq = 0;
+      const pending = new Map();
+      model.on("msg:custom", (msg) => {
+        if (!msg || (msg.type !== "root" && msg.type !== "children")) return;
+        const callback = pending.get(msg.request_id);
+        if (callback) {
+          pending.delete(msg.request_id);
+          callback(msg);
+        }
+      });
+
+      function request(type, path, offset, depth, callback) {
+        const request_id = ++requestSeq;
+        pending.set(request_id, callback);
+        model.send({ type, request_id, path, offset, depth });
+      }
+
+      function span(cls, text) {
+        const s = document.createElement("span");
+        if (cls) s.className = cls;
+        s.textContent = text;
+        return s;
+      }
+
+      function valueSpan(v) {
+        if (v === null) return span("keyword", "null");
+        if (typeof v === "string") return span("string", JSON.stringify(v));
+        return span(typeof v, String(v));
+      }
+
+      // kernel could not serve the request (stale path, changed data): say so
+      // next to the element, the user can click again to retry
+      function showError(parent, error) {
+        let note = parent.querySelector(":scope > .mljar-json-error");
+        if (!note) {
+          note = span("syntax mljar-json-error", "");
+          parent.appendChild(note);
+        }
+        note.textContent = `  ⚠ ${error}`;
+      }
+
+      function appendItems(list, msg, path, indent) {
+        msg.items.forEach((item, i) => {
+          list.appendChild(nodeEl(item, path.concat([msg.offset + i]), indent));
+        });
+        const shown = msg.offset + msg.items.length;
+        if (shown < msg.total) {
+          const row = document.createElement("div");
+          const more = document.createElement("a");
+          more.href = "#";
+          more.className = "disclosure";
+          more.textContent = `${indent}… show more (${msg.total - shown} left)`;
+          more.onclick = (e) => {
+            e.preventDefault();
+            request("children", path, shown, 1, (m) => {
+              if (m.error) return showError(row, m.error);
+              row.remove();
+              appendItems(list, m, path, indent);
+            });
+          };
+          row.appendChild(more);
+          list.appendChild(row);
+        }
+      }
+
+      function nodeEl(item, path, indent) {
+        const wrap = document.createElement("div");
+        const row = document.createElement("div");
+        wrap.appendChild(row);
+        row.appendChild(document.createTextNode(indent));
+        if (item.key !== undefined) {
+          row.appendChild(span("key", JSON.stringify(item.key)));
+          row.appendChild(span("syntax", ": "));
+        }
+        if (item.kind === "value") {
+          row.appendChild(valueSpan(item.value));
+          return wrap;
+        }
+        const [open, close] = item.kind === "array" ? ["[", "]"] : ["{", "}"];
+        if (item.size === 0) {
+          row.appendChild(span("syntax", open + close));
+          return wrap;
+        }
+        const collapsedText = `${open} ${item.size} item${item.size === 1 ? "" : "s"} ${close}`;
+        const toggle = document.createElement("a");
+        toggle.href = "#";
+        toggle.className = "disclosure";
+        const summary = span("syntax", collapsedText);
+        row.appendChild(toggle);
+        row.appendChild(document.createTextNode(" "));
+        row.appendChild(summary);
+
+        const body = document.createElement("div");
+        wrap.appendChild(body);
+        let loaded = false;
+
+        function setExpanded(next) {
+          toggle.textContent = next ? "⊖" : "⊕";
+          summary.textContent = next ? open : collapsedText;
+          body.style.display = next ? "" : "none";
+          wrap.dataset.expanded = next ? "1" : "";
+        }
+
+        function load(msg) {
+          loaded = true;
+          const list = document.createElement("div");
+          body.appendChild(list);
+          appendItems(list, msg, path, indent + "    ");
+          const end = document.createElement("div");
+          end.appendChild(document.createTextNode(indent));
+          end.appendChild(span("syntax", close));
+          body.appendChild(end);
+        }
+
+        toggle.onclick = (e) => {
+          e.preventDefault();
+          if (wrap.dataset.expanded) return setExpanded(false);
+          if (loaded) return setExpanded(true);
+          request("children", path, 0, 1, (msg) => {
+            if (msg.error) return showError(row, msg.error);
+            row.querySelector(":scope > .mljar-json-error")?.remove();
+            if (!loaded) load(msg);
+            setExpanded(true);
+          });
+        };
+
+        if (item.children) {
+          load(item.children);
+          setExpanded(true);
+        } else {
+          setExpanded(false);
+        }
+        return wrap;
+      }
+
+      function drawLazy() {
+        holder.innerHTML = "";
+        const pre = document.createElement("pre");
+        pre.className = "renderjson";
+        holder.appendChild(pre);
+        request("root", [], 0, model.get("level") ?? 1, (msg) => {
+          if (msg.error) return showError(pre, msg.error);
+          pre.replaceChildren(nodeEl(msg.node, [], ""));
+        });
+      }
+
+      function redraw() {
+        if (model.get("lazy")) drawLazy();
+        else draw();
+      }
+
+      redraw();
 
       // sync
-      model.on("change:data", draw);
-      model.on("change:level", draw);
+      model.on("change:data", redraw);
+      model.on("change:level", redraw);
       model.on("change:label", () => {
         if (model.get("label")) {
           if (!container.contains(labelEl)) container.insertBefore(labelEl, holder);
@@ -81,39 +236,12 @@ class JSONViewer(anywidget.AnyWidget):
     export default { render };
     """
 
-    _css = f"""
-    .mljar-json-container {{
-      display: flex;
-      flex-direction: column;
-      width: 100%;
-      font-family: {THEME.get('font_family', 'Arial, monospace')};
-      font-size: {THEME.get('font_size', '14px')};
-      color: {THEME.get('text_color', '#222')};
-      margin-bottom: 8px;
-      box-sizing: border-box;
-    }}
-    .mljar-json-label {{
-      margin-bottom: 6px;
-      font-weight: bold;
-    }}
-    .mljar-json-holder pre.renderjson {{
-      margin: 0;
-      white-space: pre-wrap;
-      word-break: break-word;
-    }}
-    /* renderjson */
-    .renderjson .key {{ color: #2684ff; }}
-    .renderjson .string {{ color: #fe46a5; }}
-    .renderjson .number {{ color: #0f9b8e; }}
-    .renderjson .boolean {{ color: #111; }}
-    .renderjson .syntax {{ color: #666; }}
-    .renderjson .disclosure {{ color: #666; font-size: 120%; text-decoration: none; }}
-    """
-
     # traits
     data = traitlets.Unicode(default_value="{}").tag(sync=True)
     label = traitlets.Unicode(default_value="").tag(sync=True)
     level = traitlets.Int(default_value=1).tag(sync=True)
+    lazy = traitlets.Bool(default_value=False, help="Keep data in the kernel, send nodes on expand").tag(sync=True)
+    page_size = traitlets.Int(default_value=100, help="Children sent per request in lazy mode").tag(sync=True)
     custom_css = traitlets.Unicode(default_value="", help="Extra CSS").tag(sync=True)
     position = traitlets.Enum(
         values=["sidebar", "inline", "bottom"],
@@ -123,7 +251,15 @@ class JSONViewer(anywidget.AnyWidget):
 
     def __init__(self, json_data=None, **kwargs):
         super().__init__(**kwargs)
-        if json_data is None:
+        self._obj = None
+        self._key_index = {}  # id(dict) -> list of its keys, for ordinal lookups
+        if self.lazy:
+            # only the expanded levels are sent, on request from the browser
+            if isinstance(json_data, (str, bytes)):
+                json_data = json.loads(json_data)
+            self._obj = {} if json_data is None else json_data
+            self.on_msg(self._handle_custom_msg)
+        elif json_data is None:
             self.data = "{}"
         else:
             if isinstance(json_data, (dict, list)):
@@ -131,6 +267,79 @@ class JSONViewer(anywidget.AnyWidget):
             else:
                 self.data = str(json_data)
 
+    # -------- lazy mode ---------------------------------------------------------
+
+    @staticmethod
+    def _is_container(value):
+        return isinstance(value, (dict, list, tuple))
+
+    def _describe(self, value, depth):
+        if isinstance(value, dict):
+            node = {"kind": "object", "size": len(value)}
+        elif isinstance(value, (list, tuple)):
+            node = {"kind": "array", "size": len(value)}
+        elif value is None or isinstance(value, (bool, int, str)):
+            return {"kind": "value", "value": value}
+        elif isinstance(value, float):
+            # NaN/Infinity are not valid JSON
+            return {"kind": "value", "value": value if math.isfinite(value) else str(value)}
+        else:
+            return {"kind": "value", "value": repr(value)}
+        if depth > 0 and node["size"]:
+            node["children"] = self._children(value, 0, depth)
+        return node
+
+    def _dict_keys(self, node):
+        """Keys of `node` in order, built once per dict (rebuilt if its size changed)."""
+        keys = self._key_index.get(id(node))
+        if keys is None or len(keys) != len(node):
+            keys = self._key_index[id(node)] = list(node)
+        return keys
+
+    def _children(self, node, offset, depth):
+        limit = max(1, self.page_size)
+        if isinstance(node, dict):
+            items = []
+            for key in self._dict_keys(node)[offset:offset + limit]:
+                item = self._describe(node[key], depth - 1)
+                item["key"] = key if isinstance(key, str) else str(key)
+                items.append(item)
+        else:
+            items = [self._describe(v, depth - 1) for v in node[offset:offset + limit]]
+        return {"items": items, "offset": offset, "total": len(node)}
+
+    def _resolve(self, path):
+        node = self._obj
+        for index in path:
+            index = int(index)
+            if not self._is_container(node) or not 0 <= index < len(node):
+                raise LookupError("this part of the data is no longer available")
+            if isinstance(node, dict):
+                node = node[self._dict_keys(node)[index]]
+            else:
+                node = node[index]
+        return node
+
+    def _handle_custom_msg(self, widget, content, buffers):
+        if not isinstance(content, dict):
+            return
+        kind = content.get("type")
+        if kind not in ("root", "children"):
+            return
+        reply = {"type": kind, "request_id": content.get("request_id")}
+        try:
+            if kind == "root":
+                reply["node"] = self._describe(self._obj, int(content.get("depth") or 0))
+            else:
+                node = self._resolve(content.get("path") or [])
+                if not self._is_container(node):
+                    raise LookupError("this part of the data is no longer available")
+                reply.update(self._children(node, int(content.get("offset") or 0), 1))
+        except (LookupError, TypeError, ValueError) as e:
+            # always answer, or the browser waits for this node forever
+            reply["error"] = str(e) or type(e).__name__
+        self.send(reply)
+
     def _repr_mimebundle_(self, **kwargs):
         data = super()._repr_mimebundle_(**kwargs)
         if len(data) > 1:
@@ -2,6 +2,8 @@ import inspect
 import logging
 import hashlib 
 
+from .cancel import watch_widget
+
 log = logging.getLogger(__name__)
 
 MERCURY_MIMETYPE = "application/mercury+json"
@@ -84,6 +86,7 @@ class WidgetsManager:
     @staticmethod
     def add_widget(code_uid, widget):
         WidgetsManager.widgets[code_uid] = widget
+        watch_widget(widget)
         
 
     @staticmethod
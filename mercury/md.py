@@ -1,5 +1,8 @@
 # markdown.py
 
+import functools
+from html import escape
+
 import ipywidgets as widgets
 import traitlets
 from IPython.display import display
@@ -13,6 +16,35 @@ except ImportError:
     md_lib = None
 
 
+MARKDOWN_CACHE_SIZE = 256  # converted texts kept in memory
+
+
+def _convert(text: str, extensions: tuple) -> str:
+    if md_lib is not None:
+        return md_lib.markdown(text, extensions=list(extensions))
+    # Fallback: keep it visible, but not nicely formatted
+    return f"<pre>{escape(text)}</pre>"
+
+
+@functools.lru_cache(maxsize=MARKDOWN_CACHE_SIZE)
+def _cached_convert(text: str, extensions: tuple) -> str:
+    return _convert(text, extensions)
+
+
+def markdown_to_html(text: str, extensions=(), cache: bool = True) -> str:
+    """
+    Convert markdown to HTML if possible; otherwise use <pre>.
+
+    Results are kept in a shared LRU cache keyed by text and extensions, so
+    re-running a cell with unchanged Markdown does not convert it again.
+    Pass cache=False for one-off texts (e.g. streamed chunks) so they do not
+    push useful entries out of the cache.
+    """
+    if cache:
+        return _cached_convert(text, tuple(extensions))
+    return _convert(text, tuple(extensions))
+
+
 class MarkdownWidget(widgets.HTML):
     """
     Markdown widget rendered as an ipywidgets.HTML, with Mercury
@@ -47,10 +79,7 @@ class MarkdownWidget(widgets.HTML):
 
     def _to_html(self, text: str) -> str:
         """Convert markdown to HTML if possible; otherwise use <pre>."""
-        if md_lib is not None:
-            return md_lib.markdown(text)
-        # Fallback: keep it visible, but not nicely formatted
-        return f"<pre>{text}</pre>"
+        return markdown_to_html(text)
 
     @property
     def text(self) -> str:
@@ -58,8 +87,13 @@ class MarkdownWidget(widgets.HTML):
 
     @text.setter
     def text(self, value: str) -> None:
+        if value == self._raw_text:
+            return
         self._raw_text = value
-        self.value = self._to_html(value)
+        html = self._to_html(value)
+        # same HTML (e.g. whitespace-only edit) -> no trait change, no comm message
+        if html != self.value:
+            self.value = html
 
     # -------- Jupyter / Mercury integration -----------------------------------
 
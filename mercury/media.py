@@ -0,0 +1,74 @@
+import hashlib
+import os
+import shutil
+
+from .paths import data_dir
+
+MEDIA_URL_PREFIX = "mercury/api/media/"
+
+# (path, mtime_ns, size) -> sha256, so unchanged files are hashed once
+_digests = {}
+
+
+def _sha256_file(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """sha256 of a local file, cached by (path, mtime, size)."""
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    cache_key = (path, st.st_mtime_ns, st.st_size)
+    digest = _digests.get(cache_key)
+    if digest is None:
+        digest = _sha256_file(path)
+        _digests[cache_key] = digest
+    return digest
+
+
+def media_served() -> bool:
+    """
+    True when a Mercury server started this kernel (it exports MERCURY_BASE_URL).
+
+    Elsewhere (plain JupyterLab, VS Code, nbconvert, a saved notebook opened
+    later) nothing serves the media store, so callers should embed files.
+    """
+    return bool(os.environ.get("MERCURY_BASE_URL"))
+
+
+def register_media(path: str, link: bool = False) -> str:
+    """
+    Copy a local file into the content-addressed media store shared with
+    the Mercury server and return its URL (`<base_url>mercury/api/media/<sha256><ext>`).
+
+    With link=True the file is hard-linked instead of copied (falling back to
+    a copy across filesystems). Only for files that are never modified in
+    place, such as generated cache files, or the stored copy would change too.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    name = f"{file_digest(path)}{ext}"
+    target = os.path.join(data_dir("media"), name)
+    if not os.path.exists(target):
+        tmp = f"{target}.{os.getpid()}.part"
+        linked = False
+        if link:
+            try:
+                os.link(path, tmp)
+                linked = True
+            except OSError:
+                pass
+        if not linked:
+            shutil.copyfile(path, tmp)
+        os.replace(tmp, target)
+    return media_url(name)
+
+
+def media_url(name: str) -> str:
+    base = os.environ.get("MERCURY_BASE_URL", "/")
+    if not base.endswith("/"):
+        base += "/"
+    return f"{base}{MEDIA_URL_PREFIX}{name}"
@@ -1,12 +1,14 @@
 import anywidget
 import traitlets
 import json
-# from IPython.display import display
+from IPython.display import display
+from .commit import COMMIT_POLICY_JS, CommitPolicyMixin
 from .manager import WidgetsManager, MERCURY_MIMETYPE
-from .theme import THEME
+from .styles import ensure_theme_css
 
 
 def MultiSelect(*args, key: str = "", **kwargs):
+    ensure_theme_css()
     code_uid = WidgetsManager.get_code_uid("MultiSelect", key=key, args=args, kwargs=kwargs)
     cached = WidgetsManager.get_widget(code_uid)
     if cached:
@@ -18,20 +20,17 @@ def MultiSelect(*args, key: str = "", **kwargs):
     return instance
 
 
-class MultiSelectWidget(anywidget.AnyWidget):
-    _esm = """
+class MultiSelectWidget(CommitPolicyMixin, anywidget.AnyWidget):
+    _esm = COMMIT_POLICY_JS + """
     function render({ model, el }) {
       const getSelected = () => Array.isArray(model.get("value")) ? [...model.get("value")] : [];
       const getChoices  = () => Array.isArray(model.get("choices")) ? [...model.get("choices")] : [];
       const isDisabled  = () => !!model.get("disabled");
-      const setModelValueDebounced = (() => {
-        let t = null;
-        return (val) => {
-          model.set("value", val);
-          if (t) clearTimeout(t);
-          t = setTimeout(() => model.save_changes(), 100);
-        };
-      })();
+      const committer = createCommitter(model);
+      const setModelValue = (val) => {
+        model.set("value", val);
+        committer.change();
+      };
 
       const container = document.createElement("div");
       container.classList.add("mljar-ms-container");
@@ -99,7 +98,8 @@ class MultiSelectWidget(anywidget.AnyWidget):
               e.stopPropagation();
               if (isDisabled()) return;
               const newSel = getSelected().filter(v => v !== val);
-              setModelValueDebounced(newSel);
+              setModelValue(newSel);
+              if (!open) committer.settle();
             });
             chip.appendChild(x);
             chipsWrap.appendChild(chip);
@@ -129,13 +129,15 @@ class MultiSelectWidget(anywidget.AnyWidget):
             const sel = new Set(getSelected());
             if (sel.has(val)) sel.delete(val);
             else sel.add(val);
-            setModelValueDebounced([...sel]);
+            setModelValue([...sel]);
           });
           list.appendChild(li);
         });
       }
 
       function setOpen(next) {
+        // closing the dropdown means the user settled on a selection
+        if (open && !next) committer.settle();
         open = !!next;
         dropdown.style.display = open ? "block" : "none";
       }
@@ -152,7 +154,8 @@ class MultiSelectWidget(anywidget.AnyWidget):
       clearBtn.addEventListener("click", (e) => {
         e.stopPropagation();
         if (isDisabled()) return;
-        setModelValueDebounced([]);
+        setModelValue([]);
+        if (!open) committer.settle();
       });
 
       document.addEventListener("click", (e) => {
@@ -211,70 +214,6 @@ class MultiSelectWidget(anywidget.AnyWidget):
     """
 
     # minimal CSS
-    _css = f"""
-    .mljar-ms-container {{
-      display: flex;
-      flex-direction: column;
-      width: 100%;
-      font-family: {THEME.get('font_family', 'Arial, sans-serif')};
-      font-size: {THEME.get('font_size', '14px')};
-      margin-bottom: 8px;
-    }}
-    .mljar-ms-label {{
-      margin-bottom: 4px;
-      font-weight: bold;
-    }}
-    .mljar-ms-control {{
-      display: flex;
-      justify-content: space-between;
-      border: 1px solid {THEME.get('border_color', '#ccc')};
-      border-radius: {THEME.get('border_radius', '6px')};
-      padding: 4px;
-      background: #fff;
-      cursor: pointer;
-    }}
-    .mljar-ms-chips {{
-      display: flex;
-      flex-wrap: wrap;
-      gap: 4px;
-    }}
-    .mljar-ms-placeholder {{
-      color: #888;
-    }}
-    .mljar-ms-chip {{
-      background: #e9ecef;
-      padding: 2px 6px;
-      border-radius: 10px;
-    }}
-    .mljar-ms-chip-x {{
-      border: none;
-      background: transparent;
-      cursor: pointer;
-    }}
-    .mljar-ms-dropdown {{
-      display: none;
-      border: 1px solid {THEME.get('border_color', '#ccc')};
-      border-radius: {THEME.get('border_radius', '6px')};
-      margin-top: 4px;
-      background: #fff;
-    }}
-    .mljar-ms-list {{
-      list-style: none;
-      margin: 0;
-      padding: 0;
-      max-height: 150px;
-      overflow: auto;
-    }}
-    .mljar-ms-item {{
-      display: flex;
-      gap: 6px;
-      padding: 4px;
-      cursor: pointer;
-    }}
-    .mljar-ms-item:hover {{
-      background: #f6f6f6;
-    }}
-    """
 
     value = traitlets.List(traitlets.Unicode(), default_value=[]).tag(sync=True)
     choices = traitlets.List(traitlets.Unicode(), default_value=[]).tag(sync=True)
@@ -2,11 +2,13 @@ import anywidget
 import traitlets
 import json
 from IPython.display import display
+from .commit import COMMIT_POLICY_JS, CommitPolicyMixin
 from .manager import WidgetsManager, MERCURY_MIMETYPE
-from .theme import THEME
+from .styles import ensure_theme_css
 
 
 def NumberInput(*args, key="", **kwargs):
+    ensure_theme_css()
     code_uid = WidgetsManager.get_code_uid("NumberInput", key=key, args=args, kwargs=kwargs)
     cached = WidgetsManager.get_widget(code_uid)
     if cached:
@@ -18,8 +20,8 @@ def NumberInput(*args, key="", **kwargs):
     return instance
 
 
-class NumberInputWidget(anywidget.AnyWidget):
-    _esm = """
+class NumberInputWidget(CommitPolicyMixin, anywidget.AnyWidget):
+    _esm = COMMIT_POLICY_JS + """
     function render({ model, el }) {
       let container = document.createElement("div");
       container.classList.add("mljar-number-container");
@@ -36,7 +38,7 @@ class NumberInputWidget(anywidget.AnyWidget):
       input.value = model.get("value");
       input.classList.add("mljar-number-input");
 
-      let debounceTimer = null;
+      const committer = createCommitter(model);
       input.addEventListener("input", () => {
         let val = Number(input.value);
         const min = Number(model.get("min"));
@@ -45,9 +47,10 @@ class NumberInputWidget(anywidget.AnyWidget):
         if (!isNaN(max) && val > max) val = max;
         input.value = val;
         model.set("value", val);
-        if (debounceTimer) clearTimeout(debounceTimer);
-        debounceTimer = setTimeout(() => model.save_changes(), 100);
+        committer.change();
       });
+      // blur, Enter or a spinner click
+      input.addEventListener("change", () => committer.settle());
 
       model.on("change:value", () => {
         input.value = model.get("value");
@@ -93,26 +96,6 @@ class NumberInputWidget(anywidget.AnyWidget):
     export default { render };
     """
 
-    _css = f"""
-    .mljar-number-container {{
-      display: flex;
-      flex-direction: column;
-      width: 100%;
-      font-family: {THEME.get('font_family', 'Arial, sans-serif')};
-      font-size: {THEME.get('font_size', '14px')};
-      margin-bottom: 8px;
-    }}
-    .mljar-number-label {{
-      margin-bottom: 4px;
-      font-weight: bold;
-    }}
-    .mljar-number-input {{
-      padding: 6px;
-      border: 1px solid {THEME.get('border_color', '#ccc')};
-      border-radius: {THEME.get('border_radius', '6px')};
-    }}
-    """
-
     value = traitlets.Float(0).tag(sync=True)
     min = traitlets.Float(0).tag(sync=True)
     max = traitlets.Float(100).tag(sync=True)
@@ -0,0 +1,47 @@
+import os
+import stat
+import tempfile
+
+_checked_roots = set()
+
+
+def _default_root():
+    # per user: in a shared temp dir other local users could otherwise
+    # plant files (e.g. cache pickles) that the kernel loads
+    getuid = getattr(os, "getuid", None)
+    name = f"mercury-{getuid()}" if getuid is not None else "mercury"
+    return os.path.join(tempfile.gettempdir(), name)
+
+
+def _ensure_private(root, default):
+    """Create `root` with mode 0o700; refuse a directory owned by another user."""
+    os.makedirs(root, mode=0o700, exist_ok=True)
+    if not hasattr(os, "getuid"):
+        # Windows: the temp dir is per user already
+        return
+    st = os.lstat(root) if default else os.stat(root)
+    if stat.S_ISLNK(st.st_mode) or st.st_uid != os.getuid():
+        raise PermissionError(
+            f"Mercury data dir {root} is not a directory owned by the current user; "
+            "set MERCURY_DATA_DIR to a private directory"
+        )
+    if stat.S_IMODE(st.st_mode) & 0o077:
+        os.chmod(root, 0o700)
+
+
+def data_dir(*parts):
+    """
+    Return (and create) a directory shared by the Mercury server and kernels.
+
+    The Mercury server (mercury_app) imports this function too and exports
+    MERCURY_DATA_DIR to the kernels it starts, so both sides resolve the
+    same location. The root is private to the current user.
+    """
+    env_root = os.environ.get("MERCURY_DATA_DIR")
+    root = env_root or _default_root()
+    if root not in _checked_roots:
+        _ensure_private(root, default=not env_root)
+        _checked_roots.add(root)
+    path = os.path.join(root, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -4,10 +4,12 @@ import base64
 import json
 from IPython.display import display
 from .manager import WidgetsManager, MERCURY_MIMETYPE
-from .theme import THEME
+from .media import media_served, register_media
+from .styles import ensure_theme_css
 
 
 def PDF(*args, key="", **kwargs):
+    ensure_theme_css()
     code_uid = WidgetsManager.get_code_uid("PDF", key=key, args=args, kwargs=kwargs)
     cached = WidgetsManager.get_widget(code_uid)
     if cached:
@@ -52,23 +54,6 @@ class PDFWidget(anywidget.AnyWidget):
     export default { render };
     """
 
-    _css = f"""
-    .mljar-pdf-container {{
-      display: flex;
-      flex-direction: column;
-      width: 95%;
-      margin: auto;
-      font-family: {THEME.get('font_family', 'Arial, sans-serif')};
-      font-size: {THEME.get('font_size', '14px')};
-      color: {THEME.get('text_color', '#222')};
-      margin-bottom: 8px;
-    }}
-    .mljar-pdf-label {{
-      margin-bottom: 6px;
-      font-weight: bold;
-    }}
-    """
-
     # --- traits ---
     file_path = traitlets.Unicode(default_value="").tag(sync=True)
     data_url = traitlets.Unicode(default_value="").tag(sync=True)
@@ -85,14 +70,29 @@ class PDFWidget(anywidget.AnyWidget):
     def __init__(self, file_path=None, **kwargs):
         super().__init__(**kwargs)
         if file_path:
+            if not media_served():
+                # no Mercury server to serve the media store: keep it self-contained
+                self.data_url = self._data_uri(file_path)
+                return
             try:
-                with open(file_path, "rb") as fin:
-                    content = fin.read()
-                base64_pdf = base64.b64encode(content).decode("utf-8")
-                self.data_url = f"data:application/pdf;base64,{base64_pdf}"
+                # served by the Mercury media endpoint, cached by the browser
+                self.data_url = register_media(file_path)
+            except OSError:
+                self.data_url = self._data_uri(file_path)
             except Exception as e:
                 print("Problem with displaying PDF:", e)
 
+    @staticmethod
+    def _data_uri(file_path):
+        try:
+            with open(file_path, "rb") as fin:
+                content = fin.read()
+            base64_pdf = base64.b64encode(content).decode("utf-8")
+            return f"data:application/pdf;base64,{base64_pdf}"
+        except Exception as e:
+            print("Problem with displaying PDF:", e)
+            return ""
+
     def _repr_mimebundle_(self, **kwargs):
         data = super()._repr_mimebundle_(**kwargs)
         if len(data) > 1:
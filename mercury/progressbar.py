@@ -1,15 +1,25 @@
+import asyncio
+import concurrent.futures
+import os
+import queue as queue_mod
+import threading
+import time
+
 import ipywidgets as widgets
 import traitlets
 from IPython.display import display
 
 from .manager import WidgetsManager, MERCURY_MIMETYPE
+from .styles import ensure_stylesheet
 from .theme import THEME
 
+MIN_INTERVAL = 0.1  # seconds between visual updates
+MIN_STEP = 1.0  # percent change that is pushed regardless of the interval
+
 
 # ---------- Global CSS (injected once) ----------
 def _ensure_global_progress_styles():
     css = f"""
-    <style>
       .mljar-progress {{
         width: 100%;
         display: flex;
@@ -67,6 +77,10 @@ def _ensure_global_progress_styles():
         opacity: 0.95;
       }}
 
+      .mljar-progress-fill.is-failed {{
+        background: {THEME.get('danger_color', '#dc3545')};
+      }}
+
       @keyframes mljar-progress-stripes {{
         0% {{ transform: translateX(-100%); }}
         100% {{ transform: translateX(300%); }}
@@ -78,9 +92,8 @@ def _ensure_global_progress_styles():
         max-width: 100%;
         box-sizing: border-box;
       }}
-    </style>
     """
-    display(widgets.HTML(css))
+    ensure_stylesheet("progress", css)
 
 
 # ---------- Container that carries "position" and emits Mercury MIME ----------
@@ -111,8 +124,15 @@ class _ProgressVBox(widgets.VBox):
 
 # ---------- Handle returned to the caller ----------
 class ProgressHandle:
-    """Simple controller for the Progress widget."""
-    def __init__(self, container, label_w, percent_w, fill_w, min_v, max_v, indeterminate):
+    """
+    Simple controller for the Progress widget.
+
+    Visual updates are throttled: a new value is pushed to the frontend only
+    when it moved by at least `min_step` percent or `min_interval` seconds
+    passed since the last push. Reaching min/max and flush() always push.
+    """
+    def __init__(self, container, label_w, percent_w, fill_w, min_v, max_v, indeterminate,
+                 min_interval=MIN_INTERVAL, min_step=MIN_STEP):
         self._container = container
         self._label_w = label_w
         self._percent_w = percent_w
@@ -120,15 +140,44 @@ class ProgressHandle:
         self._min = min_v
         self._max = max_v
         self._indeterminate = indeterminate
-
-    def set(self, value: float):
-        """Set determinate value; switches off indeterminate mode if enabled."""
+        self.min_interval = min_interval
+        self.min_step = min_step
+        self._pct = 0.0
+        self._status = ""
+        self._pushed_pct = None
+        self._pushed_at = 0.0
+
+    def set(self, value: float, status: str = None):
+        """
+        Set determinate value; switches off indeterminate mode if enabled.
+        `status` is optional text shown after the percentage (e.g. rate, ETA).
+        """
         self.set_indeterminate(False)
         clamped = max(self._min, min(self._max, float(value)))
-        pct = 0 if self._max == self._min else (clamped - self._min) / (self._max - self._min) * 100.0
-        self._fill_w.layout.width = f"{pct:.2f}%"
+        self._pct = 0 if self._max == self._min else (clamped - self._min) / (self._max - self._min) * 100.0
+        if status is not None:
+            self._status = status
+        now = time.monotonic()
+        if (
+            self._pushed_pct is None
+            or clamped in (self._min, self._max)
+            or abs(self._pct - self._pushed_pct) >= self.min_step
+            or now - self._pushed_at >= self.min_interval
+        ):
+            self._push(now)
+
+    def flush(self):
+        """Push the latest value to the frontend now."""
+        if not self._indeterminate:
+            self._push(time.monotonic())
+
+    def _push(self, now):
+        self._pushed_pct = self._pct
+        self._pushed_at = now
+        self._fill_w.layout.width = f"{self._pct:.2f}%"
         if self._percent_w is not None:
-            self._percent_w.value = f"{pct:.0f}%"
+            text = f"{self._pct:.0f}%"
+            self._percent_w.value = f"{text} · {self._status}" if self._status else text
 
     def set_label(self, text: str):
         if self._label_w is not None:
@@ -144,6 +193,14 @@ class ProgressHandle:
         elif not on and self._indeterminate:
             self._fill_w.remove_class("is-indeterminate")
             self._indeterminate = False
+            self._pushed_pct = None  # next set() is always shown
+
+    def fail(self, message: str = "Failed"):
+        """Mark the bar as failed; `message` is shown after the percentage."""
+        self.set_indeterminate(False)
+        self._fill_w.add_class("is-failed")
+        self._status = message
+        self._push(time.monotonic())
 
     def show(self):
         display(self._container)
@@ -158,7 +215,8 @@ class ProgressHandle:
 # ---------- Public factory ----------
 def Progressbar(label: str = "", value: float = 0, min: float = 0, max: float = 100,
                 show_percent: bool = True, indeterminate: bool = False,
-                key: str = "", position: str = "inline") -> ProgressHandle:
+                key: str = "", position: str = "inline",
+                min_interval: float = MIN_INTERVAL, min_step: float = MIN_STEP) -> ProgressHandle:
     """
     Create a theme-aware progress bar.
 
@@ -178,11 +236,15 @@ def Progressbar(label: str = "", value: float = 0, min: float = 0, max: float =
         Stable cache key for reuse.
     position : {"sidebar","inline","bottom"}
         Placement hint for Mercury/JupyterLab integration. Defaults to "inline".
+    min_interval : float
+        Minimum seconds between visual updates from .set().
+    min_step : float
+        Percent change that is shown even before min_interval passed.
 
     Returns
     -------
     ProgressHandle
-        Controller with .set(value), .set_label(text), .set_indeterminate(on), .show(), .hide().
+        Controller with .set(value), .flush(), .set_label(text), .set_indeterminate(on), .fail(message), .show(), .hide().
     """
     _ensure_global_progress_styles()
 
@@ -192,6 +254,8 @@ def Progressbar(label: str = "", value: float = 0, min: float = 0, max: float =
     cached = WidgetsManager.get_widget(code_uid)
     if cached:
         container, handle = cached
+        handle.min_interval = min_interval
+        handle.min_step = min_step
         display(container)
         return handle
 
@@ -235,6 +299,8 @@ def Progressbar(label: str = "", value: float = 0, min: float = 0, max: float =
         min_v=float(min),
         max_v=float(max),
         indeterminate=bool(indeterminate),
+        min_interval=float(min_interval),
+        min_step=float(min_step),
     )
 
     # Initialize
@@ -246,3 +312,311 @@ def Progressbar(label: str = "", value: float = 0, min: float = 0, max: float =
     display(container)
     WidgetsManager.add_widget(code_uid, (container, handle))
     return handle
+
+
+# ---------- tqdm-like iterable wrapper ----------
+def _format_time(seconds: float) -> str:
+    seconds = int(seconds)
+    h, rest = divmod(seconds, 3600)
+    m, s = divmod(rest, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m:02d}:{s:02d}"
+
+
+class ProgressIterator:
+    """
+    Iterable wrapper that drives a Progressbar, tqdm-style.
+
+    Rate and ETA are computed only when the bar is actually refreshed,
+    so the per-item cost is a counter increment and a time check.
+    """
+    def __init__(self, iterable=None, total=None, desc="", unit="it", key="",
+                 position="inline", min_interval=MIN_INTERVAL):
+        if total is None and iterable is not None:
+            try:
+                total = len(iterable)
+            except (TypeError, AttributeError):
+                total = None
+        self.iterable = iterable
+        self.total = total
+        self.unit = unit
+        self.n = 0
+        self.min_interval = min_interval
+        self._start = time.monotonic()
+        self._refreshed_at = self._start
+        self._handle = Progressbar(
+            label=desc,
+            max=total or 1,
+            indeterminate=not total,
+            key=key or desc or "progress",
+            position=position,
+            min_interval=min_interval,
+        )
+        self._refresh(force=True)
+
+    def __iter__(self):
+        try:
+            for item in self.iterable:
+                yield item
+                self.update(1)
+        finally:
+            self.close()
+
+    def __len__(self):
+        return self.total or 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def update(self, n: int = 1):
+        """Advance the counter by n (like tqdm.update)."""
+        self.n += n
+        now = time.monotonic()
+        if now - self._refreshed_at >= self.min_interval or (self.total and self.n >= self.total):
+            self._refresh(now)
+
+    def set_description(self, desc: str):
+        self._handle.set_label(desc)
+
+    def close(self):
+        """Show the final state."""
+        self._refresh(force=True)
+
+    @property
+    def format_dict(self):
+        elapsed = time.monotonic() - self._start
+        rate = self.n / elapsed if elapsed > 0 else 0.0
+        remaining = (self.total - self.n) / rate if (self.total and rate > 0) else None
+        return {"n": self.n, "total": self.total, "elapsed": elapsed, "rate": rate, "remaining": remaining}
+
+    def _refresh(self, now=None, force=False):
+        self._refreshed_at = now or time.monotonic()
+        info = self.format_dict
+        parts = [f"{self.n}/{self.total}" if self.total else f"{self.n}"]
+        if info["rate"]:
+            parts.append(f"{info['rate']:.1f} {self.unit}/s")
+        parts.append(_format_time(info["elapsed"]))
+        if info["remaining"] is not None and self.n < self.total:
+            parts.append(f"ETA {_format_time(info['remaining'])}")
+        status = " · ".join(parts)
+        if self.total:
+            self._handle.set(self.n, status=status)
+            if force:
+                self._handle.flush()
+        elif self._handle._percent_w is not None:
+            self._handle._percent_w.value = status
+
+
+def progress(iterable=None, total=None, desc="", unit="it", key="", position="inline",
+             min_interval=MIN_INTERVAL) -> ProgressIterator:
+    """
+    Wrap an iterable with a progress bar: `for x in mercury.progress(items): ...`
+
+    Parameters
+    ----------
+    iterable : iterable, optional
+        Items to iterate. Can be omitted and progress reported with .update(n).
+    total : int, optional
+        Number of items; taken from len(iterable) when available. Without it
+        the bar is indeterminate and only the count and rate are shown.
+    desc : str
+        Label shown above the bar.
+    unit : str
+        Unit used in the rate text.
+    key : str
+        Stable cache key for reuse.
+    position : {"sidebar","inline","bottom"}
+        Placement hint. Defaults to "inline".
+    min_interval : float
+        Minimum seconds between visual updates.
+    """
+    return ProgressIterator(iterable, total=total, desc=desc, unit=unit, key=key,
+                            position=position, min_interval=min_interval)
+
+
+# ---------- aggregated progress for thread / process pools ----------
+class _QueueReporter:
+    """Picklable callable used in child processes: reporter(n=1, worker=None)."""
+    def __init__(self, queue):
+        self.queue = queue
+
+    def __call__(self, n: int = 1, worker=None):
+        self.queue.put((os.getpid() if worker is None else worker, n))
+
+
+class ProgressAggregator:
+    """
+    Progress bar fed from many workers.
+
+    Increments are accepted from any thread (`agg.update(n)` or `agg(n)`)
+    and from child processes through `agg.reporter()`, which sends them over
+    a queue. Widgets are touched only on the kernel's main thread: the
+    counters are reduced into one throttled Progressbar update either by
+    `agg.as_completed(futures)` / `agg.wait(futures)` while the cell waits
+    for results, or by a timer on the kernel's event loop when it is idle.
+
+    With `workers=N`, N sub-bars are shown and assigned to workers (thread
+    names or process ids) as they first report.
+    """
+    def __init__(self, total=None, desc="", unit="it", workers: int = 0, key="",
+                 position="inline", min_interval=MIN_INTERVAL):
+        self.total = total
+        self.unit = unit
+        self.min_interval = min_interval
+        self._key = key or desc or "progress-aggregator"
+        self._lock = threading.Lock()
+        self._n = 0
+        self._per_worker = {}
+        self._manager = None
+        self._queue = None
+        self._start = time.monotonic()
+        self._flush_scheduled = False
+        self._closed = False
+        try:
+            self._loop = asyncio.get_event_loop()
+        except RuntimeError:
+            self._loop = None
+
+        self._bar = ProgressIterator(
+            total=total, desc=desc, unit=unit, key=self._key,
+            position=position, min_interval=min_interval,
+        )
+        self._sub_bars = [
+            Progressbar(label=f"worker {i + 1}", indeterminate=True, key=f"{self._key}-worker-{i}",
+                        position=position, min_interval=min_interval)
+            for i in range(int(workers))
+        ]
+        self._worker_slots = {}
+
+    # -- reporting (any thread) --
+    def update(self, n: int = 1, worker=None):
+        """Add n to the counter; safe to call from any thread."""
+        if worker is None and self._sub_bars:
+            worker = threading.current_thread().name
+        with self._lock:
+            self._n += n
+            if worker is not None:
+                self._per_worker[worker] = self._per_worker.get(worker, 0) + n
+        if threading.current_thread() is threading.main_thread():
+            if time.monotonic() - self._bar._refreshed_at >= self.min_interval:
+                self.flush()
+        else:
+            self._schedule_flush()
+
+    __call__ = update
+
+    def reporter(self):
+        """Return a picklable callable for child processes: reporter(n=1, worker=None)."""
+        if self._queue is None:
+            import multiprocessing
+
+            # a Manager queue can be passed to pool workers as an argument
+            self._manager = multiprocessing.Manager()
+            self._queue = self._manager.Queue()
+        return _QueueReporter(self._queue)
+
+    # -- reducing (main thread) --
+    def _drain(self):
+        if self._queue is None:
+            return
+        while True:
+            try:
+                worker, n = self._queue.get_nowait()
+            except (queue_mod.Empty, EOFError, OSError):
+                return
+            with self._lock:
+                self._n += n
+                self._per_worker[worker] = self._per_worker.get(worker, 0) + n
+
+    def _schedule_flush(self):
+        # at most one pending flush on the event loop
+        if self._loop is None or self._flush_scheduled or self._closed:
+            return
+        self._flush_scheduled = True
+        try:
+            self._loop.call_soon_threadsafe(
+                self._loop.call_later, self.min_interval, self._scheduled_flush
+            )
+        except RuntimeError:  # loop closed
+            self._flush_scheduled = False
+
+    def _scheduled_flush(self):
+        self._flush_scheduled = False
+        self.flush()
+
+    def flush(self):
+        """Show the current counts; does nothing outside the main thread."""
+        if threading.current_thread() is not threading.main_thread():
+            self._schedule_flush()
+            return
+        self._drain()
+        with self._lock:
+            n = self._n
+            per_worker = dict(self._per_worker)
+        self._bar.n = n
+        self._bar._refresh(force=True)
+        for worker, count in per_worker.items():
+            slot = self._worker_slots.get(worker)
+            if slot is None:
+                if len(self._worker_slots) >= len(self._sub_bars):
+                    continue
+                slot = self._worker_slots[worker] = len(self._worker_slots)
+                self._sub_bars[slot].set_label(f"worker {worker}")
+            bar = self._sub_bars[slot]
+            if bar._percent_w is not None:
+                bar._percent_w.value = f"{count} {self.unit}"
+        if self._queue is not None and not self._closed and not (self.total and n >= self.total):
+            # child processes do not wake the event loop; keep polling
+            self._schedule_flush()
+
+    # -- waiting for futures (main thread) --
+    def as_completed(self, futures, count: bool = True):
+        """
+        Like concurrent.futures.as_completed, flushing progress while waiting.
+        With count=True each finished future adds 1; use count=False when
+        the workers report progress themselves.
+        """
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = concurrent.futures.wait(
+                    pending, timeout=self.min_interval,
+                    return_when=concurrent.futures.FIRST_COMPLETED,
+                )
+                if count and done:
+                    with self._lock:
+                        self._n += len(done)
+                self.flush()
+                yield from done
+        finally:
+            self.flush()
+
+    def wait(self, futures, count: bool = True):
+        """Block until all futures finish, showing progress; returns the futures."""
+        futures = list(futures)
+        for _ in self.as_completed(futures, count=count):
+            pass
+        return futures
+
+    def close(self):
+        """Show the final state and release the process queue."""
+        self.flush()
+        self._closed = True
+        with self._lock:
+            per_worker = dict(self._per_worker)
+        for worker, slot in self._worker_slots.items():
+            self._sub_bars[slot].set(self._sub_bars[slot]._max, status=f"{per_worker.get(worker, 0)} {self.unit}")
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+            self._queue = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
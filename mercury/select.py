@@ -1,12 +1,13 @@
 import anywidget
 import traitlets
 import json
-# from IPython.display import display
+from IPython.display import display
 from .manager import WidgetsManager, MERCURY_MIMETYPE
-from .theme import THEME
+from .styles import ensure_theme_css
 
 
 def Select(*args, key="", **kwargs):
+    ensure_theme_css()
     code_uid = WidgetsManager.get_code_uid("Select", key=key, args=args, kwargs=kwargs)
     cached = WidgetsManager.get_widget(code_uid)
     if cached:
@@ -103,37 +104,6 @@ class SelectWidget(anywidget.AnyWidget):
     """
 
     # simplified CSS
-    _css = f"""
-    .mljar-select-container {{
-      display: flex;
-      flex-direction: column;
-      width: 100%;
-      font-family: {THEME.get('font_family', 'Arial, sans-serif')};
-      font-size: {THEME.get('font_size', '14px')};
-      color: {THEME.get('text_color', '#222')};
-      margin-bottom: 8px;
-    }}
-
-    .mljar-select-label {{
-      margin-bottom: 4px;
-      font-weight: 600;
-    }}
-
-    .mljar-select-input {{
-      width: 100%;
-      padding: 6px;
-      border: 1px solid {THEME.get('border_color', '#ccc')};
-      border-radius: {THEME.get('border_radius', '6px')};
-      background: #fff;
-      box-sizing: border-box;
-    }}
-
-    .mljar-select-input:disabled {{
-      background: #f5f5f5;
-      color: #888;
-      cursor: not-allowed;
-    }}
-    """
 
     value = traitlets.Unicode(default_value="").tag(sync=True)
     choices = traitlets.List(traitlets.Unicode(), default_value=[]).tag(sync=True)
@@ -0,0 +1,127 @@
+import logging
+import os
+import re
+import time
+
+from .caching import _source_hash
+from .paths import data_dir
+
+log = logging.getLogger(__name__)
+
+_loaded = {}  # path -> table / DataFrame already mapped by this kernel
+
+
+def _lock_is_stale(lock_path):
+    try:
+        with open(lock_path, "r", encoding="utf-8") as f:
+            pid = int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return False
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True  # the kernel that took the lock is gone
+    except PermissionError:
+        return False
+    return False
+
+
+def _acquire_lock(lock_path, poll=0.2):
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if _lock_is_stale(lock_path):
+                try:
+                    os.remove(lock_path)
+                except FileNotFoundError:
+                    pass
+                continue
+            time.sleep(poll)
+            continue
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(str(os.getpid()))
+        return
+
+
+def _write_arrow(pa, data, path):
+    table = data if isinstance(data, pa.Table) else pa.Table.from_pandas(data)
+    tmp = f"{path}.{os.getpid()}.part"
+    try:
+        # uncompressed IPC file, so readers can memory-map it without copies
+        with pa.OSFile(tmp, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _remove_old_versions(folder, prefix, keep):
+    for name in os.listdir(folder):
+        if name.startswith(prefix) and name.endswith(".arrow") and name != keep:
+            try:
+                os.remove(os.path.join(folder, name))
+            except OSError:
+                pass
+
+
+def shared_data(name, loader, version=None, to_pandas=True):
+    """
+    Load a dataset once per server and memory-map it in every kernel.
+
+    The first kernel that asks for `name` calls `loader()` (returning a
+    pandas DataFrame or pyarrow Table) and writes the result as an Arrow IPC
+    file in the Mercury data dir. Other kernels (and re-runs) memory-map
+    that file, so read-only data is shared through the OS page cache
+    instead of being copied into each session.
+
+    Parameters
+    ----------
+    name : str
+        Dataset name, unique per server.
+    loader : callable
+        Produces the data; only called when the file is missing or outdated.
+    version : str, optional
+        Explicit version. By default the loader's source hash is used, so
+        editing the loader rebuilds the file.
+    to_pandas : bool
+        Return a pandas DataFrame (numeric columns without nulls are not
+        copied) instead of the pyarrow Table.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("shared_data requires pyarrow: pip install pyarrow") from e
+
+    version = str(version) if version is not None else _source_hash(loader)
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+    safe_version = re.sub(r"[^A-Za-z0-9_.-]", "_", version)
+    folder = data_dir("shared_data")
+    file_name = f"{safe_name}--{safe_version}.arrow"
+    path = os.path.join(folder, file_name)
+
+    key = (path, to_pandas)
+    if key in _loaded and os.path.exists(path):
+        return _loaded[key]
+
+    if not os.path.exists(path):
+        lock_path = os.path.join(folder, f"{safe_name}.lock")
+        _acquire_lock(lock_path)
+        try:
+            # another kernel may have written it while we waited
+            if not os.path.exists(path):
+                log.info(f"Materializing shared dataset {name!r} ({version})")
+                _write_arrow(pa, loader(), path)
+                _remove_old_versions(folder, f"{safe_name}--", file_name)
+        finally:
+            os.remove(lock_path)
+
+    source = pa.memory_map(path, "r")
+    table = pa.ipc.open_file(source).read_all()
+    result = table.to_pandas(split_blocks=True) if to_pandas else table
+    _loaded[key] = result
+    return result
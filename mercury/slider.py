@@ -1,10 +1,13 @@
 import anywidget
 import traitlets
+from IPython.display import display
 
+from .commit import COMMIT_POLICY_JS, CommitPolicyMixin
 from .manager import WidgetsManager, MERCURY_MIMETYPE
-from .theme import THEME
+from .styles import ensure_theme_css
 
 def Slider(*args, key="", **kwargs):
+    ensure_theme_css()
     code_uid = WidgetsManager.get_code_uid("Slider", key=key, args=args, kwargs=kwargs)
     cached = WidgetsManager.get_widget(code_uid)
     if cached:
@@ -15,8 +18,8 @@ def Slider(*args, key="", **kwargs):
     display(instance)
     return instance
 
-class SliderWidget(anywidget.AnyWidget):
-    _esm = """
+class SliderWidget(CommitPolicyMixin, anywidget.AnyWidget):
+    _esm = COMMIT_POLICY_JS + """
 function render({ model, el }) {
   // Your existing UI creation code (unchanged) ...
   const container = document.createElement("div");
@@ -40,12 +43,13 @@ function render({ model, el }) {
   valueLabel.classList.add("mljar-slider-value-label");
   valueLabel.innerHTML = model.get("value");
 
-  let debounceTimer = null;
+  const committer = createCommitter(model);
   slider.addEventListener("input", () => {
     model.set("value", Number(slider.value));
-    if (debounceTimer) clearTimeout(debounceTimer);
-    debounceTimer = setTimeout(() => model.save_changes(), 100);
+    committer.change();
   });
+  // fired when the thumb is released (or after keyboard changes)
+  slider.addEventListener("change", () => committer.settle());
 
   model.on("change:value", () => {
     slider.value = model.get("value");
@@ -94,88 +98,6 @@ if (cellId) {
 }
 export default { render };
     """
-    _css = f"""
-    .mljar-slider-container {{
-        display: flex;
-        flex-direction: column;
-        align-items: flex-start;
-        width: 100%;
-        min-width: 120px;
-        font-family: {THEME.get('font_family', 'Arial, sans-serif')};
-        font-size: {THEME.get('font_size', '14px')};
-        font-weight: {THEME.get('font_weight', 'normal')};
-        color: {THEME.get('text_color', '#222')};
-    }}
-
-    .mljar-slider-top-label {{
-        margin-bottom: 6px;
-        font-weight: bold;
-    }}
-
-    .mljar-slider-row {{
-        display: flex;
-        flex-direction: row;
-        align-items: center;
-        width: 100%;
-        overflow: hidden;
-    }}
-
-    .mljar-slider-input {{
-        flex: 1 1 auto;
-        min-width: 60px;
-        max-width: 100%;
-        margin-right: 16px;
-        background: transparent;
-        -webkit-appearance: none;
-        appearance: none;
-        border: none;
-        height: 24px; /* big enough for thumb */
-        padding: 0;
-    }}
-
-    .mljar-slider-input:focus {{
-        outline: none;
-    }}
-
-    /* Track */
-    .mljar-slider-input::-webkit-slider-runnable-track {{
-        height: 6px;
-        background: {THEME.get('slider_track_color', '#e0e0e0')};
-        border-radius: {THEME.get('border_radius', '6px')};
-        margin: auto; /* center track in the input box */
-    }}
-    .mljar-slider-input::-moz-range-track {{
-        height: 6px;
-        background: {THEME.get('slider_track_color', '#e0e0e0')};
-        border-radius: {THEME.get('border_radius', '6px')};
-    }}
-
-    /* Thumb */
-    .mljar-slider-input::-webkit-slider-thumb {{
-        -webkit-appearance: none;
-        appearance: none;
-        width: 16px;
-        height: 16px;
-        border-radius: 50%;
-        background: {THEME.get('primary_color', '#007bff')};
-        cursor: pointer;
-        margin-top: -5px; /* centers thumb on track */
-    }}
-    .mljar-slider-input::-moz-range-thumb {{
-        width: 16px;
-        height: 16px;
-        border-radius: 50%;
-        background: {THEME.get('primary_color', '#007bff')};
-        cursor: pointer;
-    }}
-
-    .mljar-slider-value-label {{
-        font-weight: bold;
-        font-size: 1.1em;
-        color: {THEME.get('text_color', '#000')};
-        margin-left: 8px;
-    }}
-    """
 
 
 
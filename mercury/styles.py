@@ -0,0 +1,112 @@
+import functools
+import os
+
+import anywidget
+import traitlets
+
+from .theme import THEME
+from .theme_css import build_theme_css, css_version
+
+
+class StyleSheetWidget(anywidget.AnyWidget):
+    """
+    Puts a named <style> element (or a <link> when `href` is set) into
+    document.head.
+
+    The widget is never displayed: the stylesheet is injected when the
+    frontend creates the model, and replaced only when its version changes.
+    """
+
+    _esm = """
+    function apply(model) {
+        const id = `mljar-style-${model.get("name")}`;
+        const version = model.get("version");
+        const href = model.get("href");
+        const tag = href ? "LINK" : "STYLE";
+        let el = document.getElementById(id);
+        // e.g. the theme <link> already put into the page by the server
+        if (el && el.dataset.version === version) return;
+        if (el && el.tagName !== tag) {
+            el.remove();
+            el = null;
+        }
+        if (!el) {
+            el = document.createElement(tag);
+            el.id = id;
+            document.head.appendChild(el);
+        }
+        if (href) {
+            el.rel = "stylesheet";
+            el.href = href;
+        } else {
+            el.textContent = model.get("css");
+        }
+        el.dataset.version = version;
+    }
+
+    function initialize({ model }) {
+        apply(model);
+        model.on("change:version", () => apply(model));
+    }
+
+    function render({ model, el }) {
+        apply(model);
+    }
+
+    export default { initialize, render };
+    """
+
+    name = traitlets.Unicode("").tag(sync=True)
+    css = traitlets.Unicode("").tag(sync=True)
+    href = traitlets.Unicode("").tag(sync=True)
+    version = traitlets.Unicode("").tag(sync=True)
+
+
+_stylesheets = {}  # name -> StyleSheetWidget
+
+
+def ensure_stylesheet(name: str, css: str, href: str = "", version: str = "") -> StyleSheetWidget:
+    """
+    Inject `css` into the page once per kernel under `name`.
+
+    With `href`, a <link> to that URL is used instead of inline CSS (the
+    `css` is then only used for versioning, unless `version` is given).
+    Later calls with the same CSS (same THEME) do nothing; changed CSS
+    replaces the stylesheet in place.
+    """
+    version = version or css_version(css)
+    sheet = _stylesheets.get(name)
+    if sheet is not None and sheet.comm is not None:
+        if sheet.version != version or sheet.href != href:
+            with sheet.hold_sync():
+                sheet.css = "" if href else css
+                sheet.href = href
+                sheet.version = version
+        return sheet
+    sheet = StyleSheetWidget(name=name, css="" if href else css, href=href, version=version)
+    _stylesheets[name] = sheet
+    return sheet
+
+
+@functools.lru_cache(maxsize=1)
+def _theme_stylesheet():
+    css = build_theme_css(THEME)
+    return css, css_version(css)
+
+
+def ensure_theme_css() -> StyleSheetWidget:
+    """
+    Make the shared widget stylesheet available on the page.
+
+    Under the Mercury server the versioned /mercury/api/theme.css is linked
+    (the app page usually has it already, then nothing is injected). The
+    server compiles it from its own config, so its version is taken from
+    MERCURY_THEME_CSS_VERSION. Elsewhere the kernel's CSS is inlined once.
+    """
+    css, version = _theme_stylesheet()
+    base_url = os.environ.get("MERCURY_BASE_URL")
+    if not base_url:
+        return ensure_stylesheet("theme", css)
+    version = os.environ.get("MERCURY_THEME_CSS_VERSION") or version
+    href = f"{base_url}mercury/api/theme.css?v={version}"
+    return ensure_stylesheet("theme", css, href=href, version=version)
@@ -1,119 +1,599 @@
-import uuid
 import json
+import logging
+import operator
+from collections import OrderedDict
+
+import anywidget
+import numpy as np
 import pandas as pd
-from IPython.display import HTML
-
-
-def Table(df: pd.DataFrame, page_size: int = 50):
-    grid_id = f"aggrid_{uuid.uuid4().hex}"
-
-    data = df.to_dict(orient="records")
-    columns = [{"field": str(c)} for c in df.columns]
-
-    html = f"""
-    <style>
-      /* hide default AG Grid sort icons */
-      #{grid_id} .ag-header-icon,
-      #{grid_id} .ag-icon-asc,
-      #{grid_id} .ag-icon-desc,
-      #{grid_id} .ag-icon-sort-ascending,
-      #{grid_id} .ag-icon-sort-descending,
-      #{grid_id} .ag-paging-button .ag-icon,
-      #{grid_id} .ag-paging-panel .ag-icon,
-      #{grid_id} .ag-paging-button[ref="btFirst"],
-      #{grid_id} .ag-paging-button[ref="btLast"] {{
-        display: none !important;
-      }}
-      
-      #{grid_id} .ag-paging-button::after {{
-        font-size: 14px;
-        padding: 0 6px;
-        cursor: pointer;
-        opacity: 0.8;
-        color: #bbb;
-        transition: color 0.2s ease;
-      }}
-
-      #{grid_id} .ag-paging-button[ref="btPrevious"]::after {{
-          content: "◄";
-      }}
-
-      #{grid_id} .ag-paging-button[ref="btNext"]::after {{
-          content: "►";
-      }}
-
-      #{grid_id} .ag-paging-button:hover::after {{
-          color: black;
-      }}
-
-      /* custom sort arrows */
-      #{grid_id} .ag-header-cell-label::after {{
-        content: "";
-        margin-left: 4px;
-        font-size: 0.7em;
-      }}
-      #{grid_id} .ag-header-cell-sorted-asc .ag-header-cell-label::after {{
-        content: "▲";
-      }}
-      #{grid_id} .ag-header-cell-sorted-desc .ag-header-cell-label::after {{
-        content: "▼";
-      }}
-    </style>
-
-    <!-- table container -->
-    <div id="{grid_id}" class="ag-theme-balham" style="width:100%;"></div>
-
-    <script>
-    (function() {{
-      const SCRIPT_URL = "/files/mercury/external/ag-grid-community.min.js";
-
-      document.querySelectorAll('script[src*="ag-grid-community"]').forEach(el => el.remove());
-
-      function ensureScript(src) {{
-        return new Promise((resolve, reject) => {{
-          const existing = document.querySelector(`script[src="${{src}}"]`);
-          if (existing && window.agGrid && window.agGrid.Grid) {{
-            resolve();
-            return;
-          }}
-          const s = existing || document.createElement("script");
+import traitlets
+
+from .manager import MERCURY_MIMETYPE
+
+log = logging.getLogger(__name__)
+
+# numpy dtypes that are shipped as raw little-endian buffers and read in the
+# browser with the matching TypedArray; everything else is sent as JSON list
+_BINARY_DTYPES = {
+    "float64": "<f8",
+    "float32": "<f4",
+    "int32": "<i4",
+    "uint32": "<u4",
+    "int16": "<i2",
+    "uint16": "<u2",
+    "int8": "<i1",
+    "uint8": "<u1",
+}
+
+
+# how many (sort, filter) views are kept per table
+_VIEW_CACHE_SIZE = 8
+
+_NUMBER_OPS = {
+    "equals": operator.eq,
+    "notEqual": operator.ne,
+    "lessThan": operator.lt,
+    "lessThanOrEqual": operator.le,
+    "greaterThan": operator.gt,
+    "greaterThanOrEqual": operator.ge,
+}
+
+
+def _is_numeric(series):
+    return series.dtype.kind in "iuf"
+
+
+def _column_schema(df: pd.DataFrame):
+    """Column definitions without data, used when rows are served by the kernel."""
+    return [
+        {
+            "field": f"c{i}",
+            "name": str(name),
+            "filter": "agNumberColumnFilter" if _is_numeric(df.iloc[:, i]) else "agTextColumnFilter",
+        }
+        for i, name in enumerate(df.columns)
+    ]
+
+
+def _encode_column(index, name, series):
+    """Encode a single column as a typed buffer (numeric) or a JSON list."""
+    col = {
+        "field": f"c{index}",
+        "name": str(name),
+        "filter": "agNumberColumnFilter" if _is_numeric(series) else "agTextColumnFilter",
+    }
+    kind = series.dtype.kind
+    dtype_name = str(series.dtype).lower()
+
+    if kind == "b" and dtype_name == "bool":
+        col["dtype"] = "bool"
+        col["buffer"] = memoryview(np.ascontiguousarray(series.to_numpy(dtype="<u1")))
+        return col
+
+    if kind in "iuf":
+        target = dtype_name if dtype_name in _BINARY_DTYPES else "float64"
+        if kind in "iu" and target == "float64" and not _exact_as_float64(series):
+            # float64 rounds integers beyond 2**53; send the exact values as strings
+            col["dtype"] = "json"
+            col["values"] = [None if pd.isna(v) else str(v) for v in series.tolist()]
+            return col
+        try:
+            arr = series.to_numpy(dtype=_BINARY_DTYPES[target])
+        except (TypeError, ValueError):
+            # nullable integer columns (Int64 with <NA>) need a float container
+            target = "float64"
+            arr = series.to_numpy(dtype="<f8", na_value=np.nan)
+        col["dtype"] = target
+        col["buffer"] = memoryview(np.ascontiguousarray(arr))
+        return col
+
+    if kind in "mM" or dtype_name == "category":
+        # mask after stringifying: .where(..., None) on a str column gives NaN
+        # (pandas 3), which the comm's JSON encoder rejects
+        present = series.notna().to_numpy()
+        values = [v if ok else None for v, ok in zip(series.astype(str).tolist(), present)]
+    else:
+        values = [_json_safe(v) for v in series.tolist()]
+    col["dtype"] = "json"
+    col["values"] = values
+    return col
+
+
+def _exact_as_float64(series):
+    """True when every (non-missing) integer in `series` is exactly representable as float64."""
+    values = series.dropna()
+    if values.empty:
+        return True
+    return -(2**53) <= int(values.min()) and int(values.max()) <= 2**53
+
+
+def _json_safe(value):
+    if value is None or isinstance(value, (str, bool, int)):
+        return value
+    if isinstance(value, float):
+        return None if value != value else value
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return str(value)
+
+
+def _encode_columns(df: pd.DataFrame):
+    return [_encode_column(i, name, df.iloc[:, i]) for i, name in enumerate(df.columns)]
+
+
+def _split_buffers(columns):
+    """Move column buffers out of the message body for Widget.send()."""
+    buffers = []
+    out = []
+    for col in columns:
+        col = dict(col)
+        if "buffer" in col:
+            col["buffer_index"] = len(buffers)
+            buffers.append(col.pop("buffer"))
+        out.append(col)
+    return out, buffers
+
+
+def _filter_number(cond, key):
+    value = cond.get(key)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(
+            f"Number filter {cond.get('type')!r} needs a numeric {key!r}, got {value!r}"
+        ) from None
+
+
+def _condition_mask(series, cond):
+    """Vectorized mask for a single AG Grid filter condition."""
+    if not isinstance(cond, dict):
+        raise ValueError(f"Filter condition must be an object, got {cond!r}")
+    kind = cond.get("type")
+    if cond.get("filterType") == "number":
+        values = pd.to_numeric(series, errors="coerce")
+        if kind == "inRange":
+            low, high = _filter_number(cond, "filter"), _filter_number(cond, "filterTo")
+            return ((values > low) & (values < high)).to_numpy()
+        fn = _NUMBER_OPS.get(kind)
+        if fn is None or cond.get("filter") is None:
+            return np.ones(len(series), dtype=bool)
+        return fn(values, _filter_number(cond, "filter")).to_numpy()
+
+    text = series.astype(str).str.lower()
+    needle = str(cond.get("filter") or "").lower()
+    if kind == "equals":
+        mask = text == needle
+    elif kind == "notEqual":
+        mask = text != needle
+    elif kind == "startsWith":
+        mask = text.str.startswith(needle)
+    elif kind == "endsWith":
+        mask = text.str.endswith(needle)
+    elif kind == "notContains":
+        mask = ~text.str.contains(needle, regex=False)
+    else:
+        mask = text.str.contains(needle, regex=False)
+    return mask.to_numpy(dtype=bool)
+
+
+def _filter_mask(series, model):
+    if not isinstance(model, dict):
+        raise ValueError(f"Filter model must be an object, got {model!r}")
+    if "operator" in model:
+        # AG Grid >= 29 sends `conditions`, older versions condition1/condition2
+        conditions = model.get("conditions")
+        if conditions is None:
+            conditions = [model.get("condition1") or {}, model.get("condition2") or {}]
+        if not isinstance(conditions, list):
+            raise ValueError(f"Filter conditions must be a list, got {conditions!r}")
+        masks = [_condition_mask(series, cond) for cond in conditions]
+        if not masks:
+            return np.ones(len(series), dtype=bool)
+        combine = np.logical_or if model["operator"] == "OR" else np.logical_and
+        return combine.reduce(masks)
+    return _condition_mask(series, model)
+
+
+def _column_field(df: pd.DataFrame, label):
+    """Field id (`c<position>`, as in _encode_column) of the column labelled `label`."""
+    try:
+        loc = df.columns.get_loc(label)
+    except KeyError:
+        raise ValueError(f"Unknown column {label!r}") from None
+    if not isinstance(loc, (int, np.integer)):
+        raise ValueError(f"Column label {label!r} is not unique")
+    return f"c{int(loc)}"
+
+
+def _group_frame(df: pd.DataFrame, group_by, aggregate=None):
+    """Aggregate `df` by `group_by` columns; numeric columns are summed by default."""
+    grouped = df.groupby(list(group_by), dropna=False, sort=True)
+    if aggregate is None:
+        out = grouped.sum(numeric_only=True)
+        out.insert(0, "count" if "count" not in out.columns else "_count", grouped.size())
+    else:
+        out = grouped.agg(aggregate)
+    if isinstance(out.columns, pd.MultiIndex):
+        out.columns = ["_".join(str(p) for p in col if str(p)) for col in out.columns]
+    return out.reset_index()
+
+
+class TableWidget(anywidget.AnyWidget):
+    _esm = """
+    const SCRIPT_URL = "/files/mercury/external/ag-grid-community.min.js";
+
+    const TYPED_ARRAYS = {
+      float64: Float64Array,
+      float32: Float32Array,
+      int32: Int32Array,
+      uint32: Uint32Array,
+      int16: Int16Array,
+      uint16: Uint16Array,
+      int8: Int8Array,
+      uint8: Uint8Array,
+      bool: Uint8Array,
+    };
+
+    function ensureScript(src) {
+      return new Promise((resolve, reject) => {
+        if (window.agGrid && window.agGrid.Grid) {
+          resolve();
+          return;
+        }
+        const existing = document.querySelector(`script[src="${src}"]`);
+        const s = existing || document.createElement("script");
+        s.addEventListener("load", resolve);
+        s.addEventListener("error", reject);
+        if (!existing) {
           s.src = src;
           s.async = true;
-          s.onload = resolve;
-          s.onerror = reject;
-          if (!existing) document.head.appendChild(s);
-        }});
-      }}
-
-      (async () => {{
-        await ensureScript(SCRIPT_URL);
-
-        const gridOptions = {{
-          columnDefs: {json.dumps(columns)},
-          rowData: {json.dumps(data)},
+          document.head.appendChild(s);
+        }
+      });
+    }
+
+    // DataView -> TypedArray without copying when the buffer is aligned
+    function toTypedArray(view, dtype) {
+      const Ctor = TYPED_ARRAYS[dtype];
+      const size = Ctor.BYTES_PER_ELEMENT;
+      if (view.byteOffset % size === 0) {
+        return new Ctor(view.buffer, view.byteOffset, view.byteLength / size);
+      }
+      const copy = view.buffer.slice(view.byteOffset, view.byteOffset + view.byteLength);
+      return new Ctor(copy);
+    }
+
+    function decodeColumn(col) {
+      if (col.dtype === "json") return col.values || [];
+      const arr = toTypedArray(col.buffer, col.dtype);
+      if (col.dtype === "bool") return Array.from(arr, (v) => v !== 0);
+      if (col.dtype === "float64" || col.dtype === "float32") {
+        return Array.from(arr, (v) => (Number.isNaN(v) ? null : v));
+      }
+      return arr;
+    }
+
+    function buildRows(columns, numRows) {
+      const decoded = columns.map(decodeColumn);
+      const rows = new Array(numRows);
+      for (let i = 0; i < numRows; i++) {
+        const row = {};
+        for (let j = 0; j < columns.length; j++) {
+          row[columns[j].field] = decoded[j][i];
+        }
+        rows[i] = row;
+      }
+      return rows;
+    }
+
+    function columnDefs(columns) {
+      return columns.map((c) => ({ field: c.field, headerName: c.name, filter: c.filter }));
+    }
+
+    async function render({ model, el }) {
+      const gridDiv = document.createElement("div");
+      gridDiv.classList.add("ag-theme-balham", "mljar-table");
+      gridDiv.style.width = "100%";
+      el.appendChild(gridDiv);
+
+      // pages requested from the kernel, by request id
+      const pending = new Map();
+      let nextRequestId = 0;
+      let gridOptions = null;
+
+      model.on("msg:custom", (msg, buffers) => {
+        if (!msg || msg.type !== "rows") return;
+        const params = pending.get(msg.request_id);
+        if (!params) return;
+        pending.delete(msg.request_id);
+        if (msg.error) {
+          console.warn(`[mercury.Table] ${msg.error}`);
+          params.failCallback();
+          return;
+        }
+        const columns = msg.columns.map((c) =>
+          c.buffer_index === undefined ? c : { ...c, buffer: buffers[c.buffer_index] }
+        );
+        params.successCallback(buildRows(columns, msg.num_rows), msg.row_count);
+      });
+
+      const datasource = {
+        getRows(params) {
+          const requestId = nextRequestId++;
+          pending.set(requestId, params);
+          model.send({
+            type: "rows",
+            request_id: requestId,
+            start: params.startRow,
+            end: params.endRow,
+            sort_model: params.sortModel || [],
+            filter_model: params.filterModel || {},
+          });
+        },
+      };
+
+      function build() {
+        if (gridOptions && gridOptions.api) gridOptions.api.destroy();
+        gridDiv.innerHTML = "";
+        pending.clear();
+
+        const pageSize = model.get("page_size");
+        const serverSide = model.get("server_side");
+        gridOptions = {
+          columnDefs: columnDefs(model.get("columns")),
           animateRows: true,
           rowSelection: "multiple",
-          domLayout: "autoHeight",
           suppressSizeToFit: false,
           pagination: true,
-          paginationPageSize: {page_size},
-
-          defaultColDef: {{
+          paginationPageSize: pageSize,
+          defaultColDef: {
             sortable: true,
-            resizable: true
-          }}
-        }};
+            resizable: true,
+          },
+        };
+        if (serverSide) {
+          // the browser only keeps the visible page (and one neighbour)
+          gridOptions.rowModelType = "infinite";
+          gridOptions.datasource = datasource;
+          gridOptions.cacheBlockSize = pageSize;
+          gridOptions.maxBlocksInCache = 2;
+          gridOptions.infiniteInitialRowCount = pageSize;
+          gridDiv.style.height = `${Math.min(pageSize, 25) * 28 + 90}px`;
+        } else {
+          gridOptions.rowData = buildRows(model.get("columns"), model.get("num_rows"));
+          gridOptions.domLayout = "autoHeight";
+          gridDiv.style.height = "";
+        }
+
+        new window.agGrid.Grid(gridDiv, gridOptions);
+        const api = gridOptions.api;
+        requestAnimationFrame(() => api.sizeColumnsToFit());
+      }
+
+      await ensureScript(SCRIPT_URL);
+      build();
+
+      // several traits change together when the frame is regrouped
+      let scheduled = false;
+      function scheduleBuild() {
+        if (scheduled) return;
+        scheduled = true;
+        queueMicrotask(() => {
+          scheduled = false;
+          build();
+        });
+      }
+      model.on("change:columns", scheduleBuild);
+      model.on("change:num_rows", scheduleBuild);
+      model.on("change:server_side", scheduleBuild);
+      model.on("change:page_size", scheduleBuild);
+    }
+    export default { render };
+    """
+
+    _css = """
+    /* hide default AG Grid sort icons */
+    .mljar-table .ag-header-icon,
+    .mljar-table .ag-icon-asc,
+    .mljar-table .ag-icon-desc,
+    .mljar-table .ag-icon-sort-ascending,
+    .mljar-table .ag-icon-sort-descending,
+    .mljar-table .ag-paging-button .ag-icon,
+    .mljar-table .ag-paging-panel .ag-icon,
+    .mljar-table .ag-paging-button[ref="btFirst"],
+    .mljar-table .ag-paging-button[ref="btLast"] {
+      display: none !important;
+    }
 
-        const gridDiv = document.getElementById("{grid_id}");
-        const grid = new window.agGrid.Grid(gridDiv, gridOptions);
+    .mljar-table .ag-paging-button::after {
+      font-size: 14px;
+      padding: 0 6px;
+      cursor: pointer;
+      opacity: 0.8;
+      color: #bbb;
+      transition: color 0.2s ease;
+    }
 
-        requestAnimationFrame(() => {{
-          gridOptions.api.sizeColumnsToFit();
-        }});
+    .mljar-table .ag-paging-button[ref="btPrevious"]::after {
+      content: "◄";
+    }
 
-      }})();
-    }})();
-    </script>
+    .mljar-table .ag-paging-button[ref="btNext"]::after {
+      content: "►";
+    }
+
+    .mljar-table .ag-paging-button:hover::after {
+      color: black;
+    }
+
+    /* custom sort arrows */
+    .mljar-table .ag-header-cell-label::after {
+      content: "";
+      margin-left: 4px;
+      font-size: 0.7em;
+    }
+    .mljar-table .ag-header-cell-sorted-asc .ag-header-cell-label::after {
+      content: "▲";
+    }
+    .mljar-table .ag-header-cell-sorted-desc .ag-header-cell-label::after {
+      content: "▼";
+    }
+    """
+
+    # column-oriented payload: numeric columns carry a binary `buffer`
+    # (sent over the comm's buffer channel), others carry JSON `values`;
+    # in server-side mode only the schema is synced and pages are requested
+    columns = traitlets.List(traitlets.Dict()).tag(sync=True)
+    num_rows = traitlets.Int(0).tag(sync=True)
+    page_size = traitlets.Int(50).tag(sync=True)
+    server_side = traitlets.Bool(False).tag(sync=True)
+    # field ids (`c<position>` in the original frame) of the grouping columns
+    group_by = traitlets.List(traitlets.Unicode()).tag(sync=True)
+    position = traitlets.Enum(
+        values=["sidebar", "inline", "bottom"],
+        default_value="inline",
+        help="Widget placement"
+    ).tag(sync=True)
+
+    def __init__(self, df: pd.DataFrame, max_client_rows=10_000, aggregate=None, **kwargs):
+        self._df = df
+        self._frame = df
+        self._aggregate = aggregate
+        self._max_client_rows = max_client_rows
+        self._views = OrderedDict()
+        super().__init__(**kwargs)
+        self._publish()
+        self.observe(self._on_group_by_change, names="group_by")
+        self.on_msg(self._handle_custom_msg)
+
+    def _publish(self):
+        """Sync the current frame: full columnar data if small, schema only if large."""
+        if self.group_by:
+            labels = [self._df.columns[self._field_position(self._df, f)] for f in self.group_by]
+            frame = _group_frame(self._df, labels, self._aggregate)
+        else:
+            frame = self._df
+        self._frame = frame
+        self._views.clear()
+        server_side = len(frame) > self._max_client_rows
+        with self.hold_sync():
+            self.server_side = server_side
+            self.num_rows = len(frame)
+            self.columns = _column_schema(frame) if server_side else _encode_columns(frame)
+
+    def _on_group_by_change(self, change):
+        self._publish()
+
+    @staticmethod
+    def _field_position(frame, field):
+        try:
+            pos = int(str(field)[1:])
+        except ValueError:
+            raise ValueError(f"Unknown column {field!r}") from None
+        if not 0 <= pos < frame.shape[1]:
+            raise ValueError(f"Unknown column {field!r}")
+        return pos
+
+    def _column_position(self, field):
+        return self._field_position(self._frame, field)
+
+    def _view_positions(self, sort_model, filter_model):
+        """Row positions after filtering and sorting, cached per (sort, filter)."""
+        if not isinstance(filter_model, dict):
+            raise ValueError(f"filter_model must be an object, got {filter_model!r}")
+        if not isinstance(sort_model, list) or not all(
+            isinstance(s, dict) and "colId" in s for s in sort_model
+        ):
+            raise ValueError(f"sort_model must be a list of {{colId, sort}}, got {sort_model!r}")
+        key = json.dumps([sort_model, filter_model], sort_keys=True)
+        positions = self._views.get(key)
+        if positions is not None:
+            self._views.move_to_end(key)
+            return positions
+
+        frame = self._frame
+        mask = np.ones(len(frame), dtype=bool)
+        for field, model in filter_model.items():
+            mask &= _filter_mask(frame.iloc[:, self._column_position(field)], model)
+        positions = np.flatnonzero(mask)
+
+        if sort_model:
+            cols = [self._column_position(s["colId"]) for s in sort_model]
+            keys = frame.iloc[positions, cols].reset_index(drop=True)
+            keys.columns = range(len(cols))
+            order = keys.sort_values(
+                by=list(keys.columns),
+                ascending=[s.get("sort") != "desc" for s in sort_model],
+                kind="mergesort",
+                na_position="last",
+            ).index.to_numpy()
+            positions = positions[order]
+
+        self._views[key] = positions
+        if len(self._views) > _VIEW_CACHE_SIZE:
+            self._views.popitem(last=False)
+        return positions
+
+    def _handle_custom_msg(self, _widget, content, _buffers):
+        if not isinstance(content, dict) or content.get("type") != "rows":
+            return
+        request_id = content.get("request_id")
+        try:
+            start = max(0, int(content.get("start", 0)))
+            end = max(start, int(content.get("end", start + self.page_size)))
+            positions = self._view_positions(
+                content.get("sort_model") or [], content.get("filter_model") or {}
+            )
+            page = self._frame.iloc[positions[start:end]]
+            columns, buffers = _split_buffers(_encode_columns(page))
+            self.send(
+                {
+                    "type": "rows",
+                    "request_id": request_id,
+                    "columns": columns,
+                    "num_rows": len(page),
+                    "row_count": int(len(positions)),
+                },
+                buffers,
+            )
+        except ValueError as e:
+            # malformed sort/filter model from the grid
+            self.send({"type": "rows", "request_id": request_id, "error": f"Invalid request: {e}"})
+        except Exception as e:
+            log.warning(f"Failed to serve table rows: {e}")
+            self.send({"type": "rows", "request_id": request_id, "error": str(e)})
+
+    def _repr_mimebundle_(self, **kwargs):
+        data = super()._repr_mimebundle_(**kwargs)
+        if len(data) > 1:
+            mercury_mime = {
+                "widget": type(self).__qualname__,
+                "model_id": self.model_id,
+                "position": self.position
+            }
+            data[0][MERCURY_MIMETYPE] = mercury_mime
+            if "text/plain" in data[0]:
+                del data[0]["text/plain"]
+        return data
+
+
+def Table(df: pd.DataFrame, page_size: int = 50, max_client_rows: int = 10_000,
+          group_by=None, aggregate=None):
     """
+    Display a DataFrame in an interactive grid.
 
-    return HTML(html)
+    Frames with more than `max_client_rows` rows stay in the kernel: the grid
+    forwards its sort and filter models and receives only the visible page.
+    `group_by` (column labels, of any type) aggregates the frame in the kernel first, with
+    `aggregate` passed to `DataFrame.groupby(...).agg` (numeric sums by default).
+    """
+    return TableWidget(
+        df,
+        page_size=page_size,
+        max_client_rows=max_client_rows,
+        aggregate=aggregate,
+        group_by=[_column_field(df, label) for label in (group_by or [])],
+    )
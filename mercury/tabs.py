@@ -3,14 +3,15 @@ import traitlets
 import ipywidgets as widgets
 from IPython.display import display
 
+from .caching import _hash_value
 from .manager import WidgetsManager, MERCURY_MIMETYPE
+from .styles import ensure_stylesheet, ensure_theme_css
 from .theme import THEME
 
 
 # ---------- Global CSS (injected once) ----------
 def _ensure_global_tabs_styles():
     css = f"""
-    <style>
       .mljar-tabs {{
         width: 100%;
         border: 1px solid {THEME.get('border_color', '#ddd')};
@@ -110,24 +111,65 @@ def _ensure_global_tabs_styles():
           transition: none;
         }}
       }}
-    </style>
     """
-    display(widgets.HTML(css))
+    ensure_stylesheet("tabs", css)
+
+
+# ---------- Lazy tab content ----------
+class _LazyTabContent:
+    """
+    Renders tab content callables into the tab Outputs on demand.
+
+    A tab is rendered when it is active and its cached result was made for
+    other inputs (or, without `inputs`, by an earlier run of the cell).
+    """
+    def __init__(self, outs):
+        self.outs = outs
+        self.renderers = None
+        self.version = None
+        self.rendered = {}  # tab index -> version it was rendered for
+        self._runs = 0
+
+    def update(self, renderers, inputs=None):
+        if renderers is not None and len(renderers) != len(self.outs):
+            raise ValueError("content must have one callable per tab label")
+        self.renderers = list(renderers) if renderers is not None else None
+        self._runs += 1
+        self.version = _hash_value(inputs) if inputs is not None else f"run-{self._runs}"
+
+    def render(self, idx):
+        if self.renderers is None or not (0 <= idx < len(self.outs)):
+            return
+        if self.rendered.get(idx) == self.version:
+            return
+        out = self.outs[idx]
+        out.clear_output(wait=True)
+        with out:
+            self.renderers[idx]()
+        self.rendered[idx] = self.version
 
 
 # ---------- Public API ----------
-def Tabs(labels=("Tab 1", "Tab 2"), active=0, key=""):
+def Tabs(labels=("Tab 1", "Tab 2"), active=0, key="", content=None, inputs=None):
     """
     Create a tabbed container with one ipywidgets.Output per tab.
+
+    With `content` (one callable per tab) the tabs are lazy: a tab's
+    callable runs only when the tab is shown, and its output is kept until
+    `inputs` change (any hashable-by-value object, e.g. a tuple of widget
+    values). Without `inputs`, results are kept until the cell runs again.
     """
+    ensure_theme_css()
     _ensure_global_tabs_styles()
 
     code_uid = WidgetsManager.get_code_uid("Tabs", key=key or "|".join(map(str, labels)), 
                 kwargs=dict(labels=labels))
     cached = WidgetsManager.get_widget(code_uid)
     if cached:
-        box, outs, _header, _panels = cached
+        box, outs, header, _panels, lazy = cached
+        lazy.update(content, inputs)
         display(box)
+        lazy.render(int(header.active))
         return outs
 
     header = _TabsHeaderWidget(labels=list(labels), active=int(active))
@@ -150,6 +192,9 @@ def Tabs(labels=("Tab 1", "Tab 2"), active=0, key=""):
     panel_box = widgets.VBox(panels, layout=widgets.Layout(width="100%"))
     panel_box.add_class("mljar-tabpanels")
 
+    lazy = _LazyTabContent(outs)
+    lazy.update(content, inputs)
+
     def _on_active_change(change):
         idx = int(change["new"])
         for j, p in enumerate(panels):
@@ -157,6 +202,7 @@ def Tabs(labels=("Tab 1", "Tab 2"), active=0, key=""):
                 p.add_class("is-active")
             else:
                 p.remove_class("is-active")
+        lazy.render(idx)
 
     header.observe(_on_active_change, names="active")
 
@@ -164,7 +210,8 @@ def Tabs(labels=("Tab 1", "Tab 2"), active=0, key=""):
     container.add_class("mljar-tabs")
 
     display(container)
-    WidgetsManager.add_widget(code_uid, (container, outs, header, panels))
+    WidgetsManager.add_widget(code_uid, (container, outs, header, panels, lazy))
+    lazy.render(int(active))
     return outs
 
 
@@ -272,15 +319,6 @@ class _TabsHeaderWidget(anywidget.AnyWidget):
     export default { render };
     """
 
-    _css = f"""
-    .mljar-tab {{
-      font-family: {THEME.get('font_family', 'Arial, sans-serif')};
-      font-size: {THEME.get('font_size', '14px')};
-      font-weight: {THEME.get('font_weight', '600')};
-      color: {THEME.get('text_color', '#222')};
-    }}
-    """
-
     def _repr_mimebundle_(self, **kwargs):
         data = super()._repr_mimebundle_()
         if len(data) > 1:
@@ -0,0 +1,261 @@
+import asyncio
+import concurrent.futures
+import inspect
+import logging
+import queue as queue_mod
+import threading
+import traceback
+
+from . import cancel
+from .manager import WidgetsManager
+
+log = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.1  # seconds between checks for results of process tasks
+
+_thread_pool = None
+_process_pool = None
+_manager = None
+_tasks_by_key = {}  # code uid -> last BackgroundTask started there
+_current = threading.local()  # .task for code running in a background thread
+
+
+def _get_executor(kind):
+    global _thread_pool, _process_pool
+    if kind == "thread":
+        if _thread_pool is None:
+            _thread_pool = concurrent.futures.ThreadPoolExecutor(thread_name_prefix="mercury-bg")
+        return _thread_pool
+    if _process_pool is None:
+        _process_pool = concurrent.futures.ProcessPoolExecutor()
+    return _process_pool
+
+
+def _get_manager():
+    global _manager
+    if _manager is None:
+        import multiprocessing
+
+        _manager = multiprocessing.Manager()
+    return _manager
+
+
+def current_task():
+    """The BackgroundTask running in this thread, or None."""
+    return getattr(_current, "task", None)
+
+
+def _run_in_thread(task, fn, args, kwargs):
+    _current.task = task
+    try:
+        result = fn(*args, **kwargs)
+        if not inspect.isgenerator(result):
+            return result
+        try:
+            while not task.cancelled:
+                task._post(next(result))
+        except StopIteration as stop:
+            return stop.value
+        result.close()
+        return None
+    finally:
+        _current.task = None
+
+
+def _run_in_process(fn, args, kwargs, results, cancel_event):
+    # module level, so it can be pickled into the worker process
+    result = fn(*args, **kwargs)
+    if not inspect.isgenerator(result):
+        return result
+    try:
+        while not cancel_event.is_set():
+            results.put(next(result))
+    except StopIteration as stop:
+        return stop.value
+    result.close()
+    return None
+
+
+def _deliver(target, item):
+    """Show one partial or final result in the target (main thread only)."""
+    if item is None or target is None:
+        return
+    if callable(getattr(target, "append_markdown", None)):  # chat Message
+        target.append_markdown(item if isinstance(item, str) else str(item))
+    elif callable(getattr(target, "set", None)) and isinstance(item, (int, float)):  # ProgressHandle
+        target.set(item)
+    elif callable(getattr(target, "append_display_data", None)):  # ipywidgets Output
+        if isinstance(item, str):
+            target.append_stdout(item)
+        else:
+            target.append_display_data(item)
+    elif callable(target):
+        target(item)
+    else:
+        raise TypeError(f"Cannot show background results in {type(target).__name__}")
+
+
+def _deliver_error(target, error):
+    """Show that the task failed in the target (main thread only)."""
+    if callable(getattr(target, "append_markdown", None)):  # chat Message
+        target.append_markdown(f"\n\n**Error:** `{type(error).__name__}: {error}`\n")
+    elif callable(getattr(target, "fail", None)):  # ProgressHandle
+        target.fail(f"Failed: {type(error).__name__}")
+    elif callable(getattr(target, "append_stderr", None)):  # ipywidgets Output
+        tb = "".join(traceback.format_exception(type(error), error, error.__traceback__))
+        target.append_stderr(tb)
+    elif callable(target):
+        target(error)
+
+
+class BackgroundTask:
+    """Handle returned by mercury.background()."""
+
+    def __init__(self, target, executor, loop, streams):
+        self.target = target
+        self.executor = executor
+        self._loop = loop
+        self._streams = streams  # fn is a generator function
+        self.generation = cancel.generation()  # widget changes seen at start
+        self._future = None
+        self._cancel_event = None
+        self._results = None  # queue with partial results from a process
+
+    # -- public API --
+    @property
+    def cancelled(self) -> bool:
+        """True once cancel() was called; long loops in `fn` can check it."""
+        return self._cancel_event is not None and self._cancel_event.is_set()
+
+    def cancel(self) -> bool:
+        """
+        Ask the task to stop. Pending tasks never start; generators stop at
+        the next yield; plain functions can poll `mercury.cancelled()`
+        (thread executor only).
+        Results that arrive afterwards are not shown.
+        """
+        self._cancel_event.set()
+        if self._future is not None:
+            self._future.cancel()
+        return True
+
+    def done(self) -> bool:
+        return self._future is not None and self._future.done()
+
+    def result(self, timeout=None):
+        """
+        Wait for and return the function's result (for generator functions,
+        the value they return). Raises CancelledError if cancelled before start.
+        """
+        return self._future.result(timeout)
+
+    def exception(self, timeout=None):
+        return self._future.exception(timeout)
+
+    # -- delivery --
+    def _on_main_loop(self, callback, *args):
+        if self._loop is None or self._loop.is_closed():
+            callback(*args)
+        else:
+            self._loop.call_soon_threadsafe(callback, *args)
+
+    def _post(self, item):
+        # called from the worker thread
+        self._on_main_loop(self._deliver, item)
+
+    def _deliver(self, item):
+        if self.cancelled:
+            return
+        try:
+            _deliver(self.target, item)
+        except Exception:
+            log.exception("Failed to show background result")
+
+    def _poll_process_results(self):
+        while True:
+            try:
+                item = self._results.get_nowait()
+            except (queue_mod.Empty, EOFError, OSError):
+                break
+            self._deliver(item)
+        if not self.done() and self._loop is not None:
+            self._loop.call_later(POLL_INTERVAL, self._poll_process_results)
+
+    def _on_done(self, future):
+        # called in the worker (thread pool) or a pool management thread
+        self._on_main_loop(self._finish, future)
+
+    def _finish(self, future):
+        if self._results is not None:
+            self._poll_process_results()
+        if future.cancelled() or self.cancelled:
+            return
+        error = future.exception()
+        if error is not None:
+            log.error("Background task failed: %s", error)
+            try:
+                _deliver_error(self.target, error)
+            except Exception:
+                log.exception("Failed to show background task error")
+            return
+        if not self._streams:
+            self._deliver(future.result())
+
+
+def background(fn, *args, target=None, executor="thread", key="", **kwargs):
+    """
+    Run `fn(*args, **kwargs)` without blocking the kernel.
+
+    While it runs, widgets stay responsive and other cells can execute.
+    Results are shown in `target` on the kernel's event loop:
+
+    - a chat Message (text is appended as markdown),
+    - a ProgressHandle (numbers are passed to .set()),
+    - an ipywidgets Output (text to stdout, other objects displayed),
+    - or any callable.
+
+    If `fn` is a generator function, every yielded value is a partial
+    result; otherwise the return value is shown when it finishes. When `fn`
+    raises, the error is shown too: appended to the Message, the progress
+    bar is marked as failed, the traceback goes to the Output's stderr, and
+    a callable is called with the exception.
+
+    Each call site remembers its last task: when the cell runs again
+    (e.g. after a widget change), the stale task is cancelled first.
+    Calls with the same `key` replace each other wherever they are made.
+
+    executor : {"thread", "process"}
+        Threads share memory with the notebook; processes avoid the GIL for
+        CPU-bound work but `fn`, arguments and results must be picklable.
+
+    Returns a BackgroundTask with cancel(), result(), done().
+    """
+    if executor not in ("thread", "process"):
+        raise ValueError("executor must be 'thread' or 'process'")
+
+    # an explicit key is shared by all call sites, otherwise the line is the key
+    code_uid = f"Background..{key}" if key else WidgetsManager.get_code_uid("Background")
+    stale = _tasks_by_key.get(code_uid)
+    if stale is not None and not stale.done():
+        stale.cancel()
+
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = None
+
+    task = BackgroundTask(target, executor, loop, inspect.isgeneratorfunction(fn))
+    pool = _get_executor(executor)
+    if executor == "thread":
+        task._cancel_event = threading.Event()
+        task._future = pool.submit(_run_in_thread, task, fn, args, kwargs)
+    else:
+        manager = _get_manager()
+        task._cancel_event = manager.Event()
+        task._results = manager.Queue()
+        task._future = pool.submit(_run_in_process, fn, args, kwargs, task._results, task._cancel_event)
+        if task._streams and loop is not None:
+            loop.call_later(POLL_INTERVAL, task._poll_process_results)
+    task._future.add_done_callback(task._on_done)
+    _tasks_by_key[code_uid] = task
+    return task
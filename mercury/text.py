@@ -1,10 +1,13 @@
 import anywidget
 import traitlets
+from IPython.display import display
 
+from .commit import COMMIT_POLICY_JS, CommitPolicyMixin
 from .manager import WidgetsManager, MERCURY_MIMETYPE
-from .theme import THEME
+from .styles import ensure_theme_css
 
 def TextInput(*args, key="", **kwargs):
+    ensure_theme_css()
     code_uid = WidgetsManager.get_code_uid("TextInput", key=key, args=args, kwargs=kwargs)
     cached = WidgetsManager.get_widget(code_uid)
     if cached:
@@ -15,8 +18,8 @@ def TextInput(*args, key="", **kwargs):
     display(instance)
     return instance
 
-class TextInputWidget(anywidget.AnyWidget):
-    _esm = """
+class TextInputWidget(CommitPolicyMixin, anywidget.AnyWidget):
+    _esm = COMMIT_POLICY_JS + """
     function render({ model, el }) {
       // Container
       let container = document.createElement("div");
@@ -33,12 +36,13 @@ class TextInputWidget(anywidget.AnyWidget):
       input.value = model.get("value");
       input.classList.add("mljar-textinput-input");
 
-      let debounceTimer = null;
+      const committer = createCommitter(model);
       input.addEventListener("input", () => {
         model.set("value", input.value);
-        if (debounceTimer) clearTimeout(debounceTimer);
-        debounceTimer = setTimeout(() => model.save_changes(), 100);
+        committer.change();
       });
+      // blur or Enter
+      input.addEventListener("change", () => committer.settle());
 
       model.on("change:value", () => {
         input.value = model.get("value");
@@ -82,43 +86,6 @@ class TextInputWidget(anywidget.AnyWidget):
     }
     export default { render };
     """
-    _css = f"""
-    .mljar-textinput-container {{
-        display: flex;
-        flex-direction: column;
-        align-items: flex-start;
-        width: 100%;
-        min-width: 120px;
-        font-family: {THEME.get('font_family', 'Arial, sans-serif')};
-        font-size: {THEME.get('font_size', '14px')};
-        font-weight: {THEME.get('font_weight', 'bold')};
-        color: {THEME.get('text_color', '#222')};
-
-    }}
-
-    .mljar-textinput-top-label {{
-        margin-bottom: 6px;
-        text-align: left;
-        width: 100%;
-        font-weight: bold;
-    }}
-
-    .mljar-textinput-input {{
-        width: 100%;
-        border: { '1px solid ' + THEME.get('border_color', '#ccc') if THEME.get('border_visible', True) else 'none'};
-        border-radius: {THEME.get('border_radius', '6px')};
-        padding: 6px 10px;
-        min-height: 1.6em;
-        box-sizing: border-box;
-        background: {THEME.get('widget_background_color', '#fff')};
-        color: {THEME.get('text_color', '#222')};
-    }}
-
-    .mljar-textinput-input:focus {{
-        outline: none;
-        border-color: {THEME.get('primary_color', '#007bff')};
-    }}
-    """
 
 
     value = traitlets.Unicode("").tag(sync=True)
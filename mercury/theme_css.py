@@ -0,0 +1,643 @@
+"""
+CSS for Mercury widgets, built from the [theme] section of config.toml.
+
+The same stylesheet is served by the Mercury server as one cacheable asset
+(/mercury/api/theme.css) and, when widgets run without the server, injected
+once per page by the kernel. Widgets only carry class names.
+"""
+import hashlib
+
+
+def _button_css(theme):
+    # ButtonWidget
+    return f"""
+    .mljar-button-container {{
+        display: inline-flex;
+        width: auto;
+        font-family: {theme.get('font_family', 'Arial, sans-serif')};
+    }}
+
+    .mljar-button {{
+        border: 1px solid {theme.get('border_color', '#d0d0d0')};
+        background: {theme.get('widget_background_color', '#ffffff')};
+        color: {theme.get('text_color', '#222')};
+        border-radius: {theme.get('border_radius', '8px')};
+        padding: 4px 12px 4px 12px;  
+        margin-top: 5px;
+        margin-bottom: 5px;
+        cursor: pointer;
+        transition: transform 120ms ease, box-shadow 120ms ease, background 120ms ease, border-color 120ms ease;
+        user-select: none;
+        outline: none;
+        display: inline-flex;
+        align-items: center;
+        justify-content: center;
+        gap: 8px;
+        font-size: {theme.get('font_size', '14px')};
+        font-weight: {theme.get('font_weight', '600')};
+        box-shadow: {theme.get('button_shadow', '0 1px 2px rgba(0,0,0,0.06)')};
+    }}
+
+    .mljar-button:hover:not(:disabled) {{
+        transform: translateY(-1px);
+        box-shadow: {theme.get('button_shadow_hover', '0 2px 6px rgba(0,0,0,0.08)')};
+        border-color: {theme.get('primary_color', '#007bff')};
+    }}
+
+    .mljar-button:active:not(:disabled) {{
+        transform: translateY(0);
+        box-shadow: {theme.get('button_shadow', '0 1px 2px rgba(0,0,0,0.06)')};
+    }}
+
+    .mljar-button:disabled {{
+        opacity: 0.6;
+        cursor: not-allowed;
+    }}
+
+    /* Variants */
+    .mljar-button.is-primary {{
+        background: {theme.get('primary_color', '#007bff')};
+        color: {theme.get('button_primary_text', '#fff')};
+        border-color: {theme.get('primary_color', '#007bff')};
+    }}
+    .mljar-button.is-primary:hover:not(:disabled) {{
+        filter: brightness(0.98);
+    }}
+
+    .mljar-button.is-secondary {{
+        background: {theme.get('panel_bg', '#f7f7fa')};
+        color: {theme.get('text_color', '#222')};
+    }}
+
+    .mljar-button.is-outline {{
+        background: transparent;
+        color: {theme.get('primary_color', '#007bff')};
+        border: 1px solid {theme.get('primary_color', '#007bff')};
+    }}
+    .mljar-button.is-outline:hover:not(:disabled) {{
+        background: {theme.get('primary_color', '#007bff')};
+        color: #fff;
+    }}
+
+    .mljar-button.is-danger {{
+        background: {theme.get('danger_color', '#dc3545')};
+        color: #fff;
+        border-color: {theme.get('danger_color', '#dc3545')};
+    }}
+
+    /* Sizes */
+    .mljar-button.is-sm {{
+        padding: 3px 10px 3px 10px;
+        font-size: 12px;
+        border-radius: {theme.get('border_radius_sm', '2px')};
+    }}
+    .mljar-button.is-md {{
+        padding: 4px 12px 4px 12px;  
+    }}
+    .mljar-button.is-lg {{
+        padding: 8px 16px 8px 16px;
+        font-size: 16px;
+        border-radius: {theme.get('border_radius_lg', '4px')};
+    }}
+    """
+
+
+def _chatinput_css(theme):
+    # ChatInputWidget
+    return f"""
+    .mljar-chatinput-container {{
+        display: flex;
+        flex-direction: row;
+        align-items: center;
+        width: 100%;
+        min-width: 160px;
+        box-sizing: border-box;
+        gap: 8px;
+        font-family: {theme.get('font_family', 'Arial, sans-serif')};
+        font-size: {theme.get('font_size', '14px')};
+        color: {theme.get('text_color', '#222')};
+    }}
+
+    .mljar-chatinput-input {{
+        flex: 1 1 auto;
+        width: 100%;
+        border: { '1px solid ' + theme.get('border_color', '#ccc') if theme.get('border_visible', True) else 'none'};
+        border-radius: {theme.get('border_radius', '6px')};
+        padding: 6px 10px;
+        min-height: 1.6em;
+        background: {theme.get('widget_background_color', '#fff')};
+        color: {theme.get('text_color', '#222')};
+        box-sizing: border-box;
+    }}
+    .mljar-chatinput-input:focus {{
+        outline: none;
+        border-color: {theme.get('primary_color', '#007bff')};
+    }}
+
+    .mljar-chatinput-button {{
+        flex: 0 0 auto;
+        border: none;
+        border-radius: {theme.get('border_radius', '6px')};
+        padding: 6px 12px;
+        min-height: 1.6em;
+        cursor: pointer;
+        background: {theme.get('primary_color', '#007bff')};
+        color: {theme.get('button_text_color', '#fff')};
+        font-weight: bold;
+    }}
+    .mljar-chatinput-button:hover {{
+        filter: brightness(0.95);
+    }}
+    """
+
+
+def _checkbox_css(theme):
+    # CheckboxWidget
+    return f"""
+    .mljar-checkbox-container {{
+        display: inline-flex;
+        align-items: center;
+        gap: 10px;
+        cursor: pointer;
+        user-select: none;
+        -webkit-tap-highlight-color: transparent;
+        font-family: {theme.get('font_family', 'Arial, sans-serif')};
+        color: {theme.get('text_color', '#222')};
+    }}
+    .mljar-checkbox-container.is-disabled {{
+        opacity: 0.6;
+        cursor: not-allowed;
+    }}
+
+    .mljar-checkbox-input {{
+        position: absolute;
+        opacity: 0;
+        width: 0;
+        height: 0;
+    }}
+
+    .mljar-checkbox-input:focus-visible + .mljar-checkbox-control {{
+        box-shadow: 0 0 0 3px rgba(0, 123, 255, 0.35);
+    }}
+
+    .mljar-checkbox-label {{
+        font-size: {theme.get('font_size', '14px')};
+        line-height: 1.2;
+        padding-top: 2px;
+    }}
+
+    /* --- Toggle style (15% smaller) --- */
+    .mljar-checkbox-container.is-toggle .mljar-checkbox-control {{
+        position: relative;
+        width: 34px;  /* smaller */
+        height: 19px; /* smaller */
+        border-radius: 999px;
+        background: {theme.get('panel_bg_hover', '#e5e7eb')};
+        border: 1px solid {theme.get('border_color', '#d0d0d0')};
+        transition: background 150ms ease, border-color 150ms ease;
+    }}
+    .mljar-checkbox-container.is-toggle.is-checked .mljar-checkbox-control {{
+        background: {theme.get('primary_color', '#007bff')};
+        border-color: {theme.get('primary_color', '#007bff')};
+    }}
+    .mljar-checkbox-container.is-toggle .mljar-checkbox-control::after {{
+        content: "";
+        position: absolute;
+        top: 2px;
+        left: 2px;
+        width: 15px;   /* smaller thumb */
+        height: 15px;
+        border-radius: 50%;
+        background: {theme.get('widget_background_color', '#ffffff')};
+        box-shadow: 0 1px 2px rgba(0,0,0,0.12), 0 0 0 1px rgba(0,0,0,0.04);
+        transition: transform 150ms ease;
+    }}
+    .mljar-checkbox-container.is-toggle.is-checked .mljar-checkbox-control::after {{
+        transform: translateX(15px);  /* adjusted distance */
+    }}
+
+    /* --- Classic box style --- */
+    .mljar-checkbox-container.is-box .mljar-checkbox-control {{
+        width: 16px;
+        height: 16px;
+        border-radius: {theme.get('border_radius_sm', '4px')};
+        border: 1px solid {theme.get('border_color', '#ccc')};
+        background: {theme.get('widget_background_color', '#fff')};
+        display: inline-block;
+        position: relative;
+    }}
+    .mljar-checkbox-container.is-box.is-checked .mljar-checkbox-control {{
+        border-color: {theme.get('primary_color', '#007bff')};
+        background: {theme.get('primary_color', '#007bff')};
+    }}
+    .mljar-checkbox-container.is-box.is-checked .mljar-checkbox-control::after {{
+        content: "";
+        position: absolute;
+        left: 4px;
+        top: 0px;
+        width: 5px;
+        height: 10px;
+        border: solid #fff;
+        border-width: 0 2px 2px 0;
+        transform: rotate(45deg);
+    }}
+
+    .mljar-checkbox-container:not(.is-disabled):hover .mljar-checkbox-control {{
+        filter: brightness(0.98);
+    }}
+    """
+
+
+def _expander_css(theme):
+    # _ExpanderHeaderWidget
+    return f"""
+    .mljar-expander-header {{
+      width: 100%;
+      display: flex;
+      align-items: center;
+      gap: 8px;
+      background: {theme.get('panel_bg_hover', '#f7f7f9')};
+      border: 0;
+      padding: 8px 10px;
+      cursor: pointer;
+      text-align: left;
+      font-family: {theme.get('font_family', 'Arial, sans-serif')};
+      font-size: {theme.get('font_size', '14px')};
+      font-weight: {theme.get('font_weight', '600')};
+      color: {theme.get('text_color', '#222')};
+      transition: background 0.15s ease;
+      position: relative;
+    }}
+    .mljar-expander-header:hover {{
+      background: {theme.get('panel_bg_hover_2', '#efefef')};
+    }}
+    .mljar-expander-icon {{
+      display: inline-block;
+      width: 0;
+      height: 0;
+      border-left: 6px solid transparent;
+      border-right: 6px solid transparent;
+      border-top: 8px solid {theme.get('primary_color', '#007bff')};
+      transform: rotate(0deg);
+      transition: transform 0.15s ease;
+    }}
+    .mljar-expander-header.is-open .mljar-expander-icon {{
+      transform: rotate(180deg);
+    }}
+    .mljar-expander-label {{
+      flex: 1 1 auto;
+    }}
+    """
+
+
+def _json_css(theme):
+    # JSONViewer
+    return f"""
+    .mljar-json-container {{
+      display: flex;
+      flex-direction: column;
+      width: 100%;
+      font-family: {theme.get('font_family', 'Arial, monospace')};
+      font-size: {theme.get('font_size', '14px')};
+      color: {theme.get('text_color', '#222')};
+      margin-bottom: 8px;
+      box-sizing: border-box;
+    }}
+    .mljar-json-label {{
+      margin-bottom: 6px;
+      font-weight: bold;
+    }}
+    .mljar-json-holder pre.renderjson {{
+      margin: 0;
+      white-space: pre-wrap;
+      word-break: break-word;
+    }}
+    /* renderjson */
+    .renderjson .key {{ color: #2684ff; }}
+    .renderjson .string {{ color: #fe46a5; }}
+    .renderjson .number {{ color: #0f9b8e; }}
+    .renderjson .boolean {{ color: #111; }}
+    .renderjson .syntax {{ color: #666; }}
+    .renderjson .disclosure {{ color: #666; font-size: 120%; text-decoration: none; }}
+    """
+
+
+def _multiselect_css(theme):
+    # MultiSelectWidget
+    return f"""
+    .mljar-ms-container {{
+      display: flex;
+      flex-direction: column;
+      width: 100%;
+      font-family: {theme.get('font_family', 'Arial, sans-serif')};
+      font-size: {theme.get('font_size', '14px')};
+      margin-bottom: 8px;
+    }}
+    .mljar-ms-label {{
+      margin-bottom: 4px;
+      font-weight: bold;
+    }}
+    .mljar-ms-control {{
+      display: flex;
+      justify-content: space-between;
+      border: 1px solid {theme.get('border_color', '#ccc')};
+      border-radius: {theme.get('border_radius', '6px')};
+      padding: 4px;
+      background: #fff;
+      cursor: pointer;
+    }}
+    .mljar-ms-chips {{
+      display: flex;
+      flex-wrap: wrap;
+      gap: 4px;
+    }}
+    .mljar-ms-placeholder {{
+      color: #888;
+    }}
+    .mljar-ms-chip {{
+      background: #e9ecef;
+      padding: 2px 6px;
+      border-radius: 10px;
+    }}
+    .mljar-ms-chip-x {{
+      border: none;
+      background: transparent;
+      cursor: pointer;
+    }}
+    .mljar-ms-dropdown {{
+      display: none;
+      border: 1px solid {theme.get('border_color', '#ccc')};
+      border-radius: {theme.get('border_radius', '6px')};
+      margin-top: 4px;
+      background: #fff;
+    }}
+    .mljar-ms-list {{
+      list-style: none;
+      margin: 0;
+      padding: 0;
+      max-height: 150px;
+      overflow: auto;
+    }}
+    .mljar-ms-item {{
+      display: flex;
+      gap: 6px;
+      padding: 4px;
+      cursor: pointer;
+    }}
+    .mljar-ms-item:hover {{
+      background: #f6f6f6;
+    }}
+    """
+
+
+def _number_css(theme):
+    # NumberInputWidget
+    return f"""
+    .mljar-number-container {{
+      display: flex;
+      flex-direction: column;
+      width: 100%;
+      font-family: {theme.get('font_family', 'Arial, sans-serif')};
+      font-size: {theme.get('font_size', '14px')};
+      margin-bottom: 8px;
+    }}
+    .mljar-number-label {{
+      margin-bottom: 4px;
+      font-weight: bold;
+    }}
+    .mljar-number-input {{
+      padding: 6px;
+      border: 1px solid {theme.get('border_color', '#ccc')};
+      border-radius: {theme.get('border_radius', '6px')};
+    }}
+    """
+
+
+def _pdf_css(theme):
+    # PDFWidget
+    return f"""
+    .mljar-pdf-container {{
+      display: flex;
+      flex-direction: column;
+      width: 95%;
+      margin: auto;
+      font-family: {theme.get('font_family', 'Arial, sans-serif')};
+      font-size: {theme.get('font_size', '14px')};
+      color: {theme.get('text_color', '#222')};
+      margin-bottom: 8px;
+    }}
+    .mljar-pdf-label {{
+      margin-bottom: 6px;
+      font-weight: bold;
+    }}
+    """
+
+
+def _select_css(theme):
+    # SelectWidget
+    return f"""
+    .mljar-select-container {{
+      display: flex;
+      flex-direction: column;
+      width: 100%;
+      font-family: {theme.get('font_family', 'Arial, sans-serif')};
+      font-size: {theme.get('font_size', '14px')};
+      color: {theme.get('text_color', '#222')};
+      margin-bottom: 8px;
+    }}
+
+    .mljar-select-label {{
+      margin-bottom: 4px;
+      font-weight: 600;
+    }}
+
+    .mljar-select-input {{
+      width: 100%;
+      padding: 6px;
+      border: 1px solid {theme.get('border_color', '#ccc')};
+      border-radius: {theme.get('border_radius', '6px')};
+      background: #fff;
+      box-sizing: border-box;
+    }}
+
+    .mljar-select-input:disabled {{
+      background: #f5f5f5;
+      color: #888;
+      cursor: not-allowed;
+    }}
+    """
+
+
+def _slider_css(theme):
+    # SliderWidget
+    return f"""
+    .mljar-slider-container {{
+        display: flex;
+        flex-direction: column;
+        align-items: flex-start;
+        width: 100%;
+        min-width: 120px;
+        font-family: {theme.get('font_family', 'Arial, sans-serif')};
+        font-size: {theme.get('font_size', '14px')};
+        font-weight: {theme.get('font_weight', 'normal')};
+        color: {theme.get('text_color', '#222')};
+    }}
+
+    .mljar-slider-top-label {{
+        margin-bottom: 6px;
+        font-weight: bold;
+    }}
+
+    .mljar-slider-row {{
+        display: flex;
+        flex-direction: row;
+        align-items: center;
+        width: 100%;
+        overflow: hidden;
+    }}
+
+    .mljar-slider-input {{
+        flex: 1 1 auto;
+        min-width: 60px;
+        max-width: 100%;
+        margin-right: 16px;
+        background: transparent;
+        -webkit-appearance: none;
+        appearance: none;
+        border: none;
+        height: 24px; /* big enough for thumb */
+        padding: 0;
+    }}
+
+    .mljar-slider-input:focus {{
+        outline: none;
+    }}
+
+    /* Track */
+    .mljar-slider-input::-webkit-slider-runnable-track {{
+        height: 6px;
+        background: {theme.get('slider_track_color', '#e0e0e0')};
+        border-radius: {theme.get('border_radius', '6px')};
+        margin: auto; /* center track in the input box */
+    }}
+    .mljar-slider-input::-moz-range-track {{
+        height: 6px;
+        background: {theme.get('slider_track_color', '#e0e0e0')};
+        border-radius: {theme.get('border_radius', '6px')};
+    }}
+
+    /* Thumb */
+    .mljar-slider-input::-webkit-slider-thumb {{
+        -webkit-appearance: none;
+        appearance: none;
+        width: 16px;
+        height: 16px;
+        border-radius: 50%;
+        background: {theme.get('primary_color', '#007bff')};
+        cursor: pointer;
+        margin-top: -5px; /* centers thumb on track */
+    }}
+    .mljar-slider-input::-moz-range-thumb {{
+        width: 16px;
+        height: 16px;
+        border-radius: 50%;
+        background: {theme.get('primary_color', '#007bff')};
+        cursor: pointer;
+    }}
+
+    .mljar-slider-value-label {{
+        font-weight: bold;
+        font-size: 1.1em;
+        color: {theme.get('text_color', '#000')};
+        margin-left: 8px;
+    }}
+    """
+
+
+def _tabs_css(theme):
+    # _TabsHeaderWidget
+    return f"""
+    .mljar-tab {{
+      font-family: {theme.get('font_family', 'Arial, sans-serif')};
+      font-size: {theme.get('font_size', '14px')};
+      font-weight: {theme.get('font_weight', '600')};
+      color: {theme.get('text_color', '#222')};
+    }}
+    """
+
+
+def _text_css(theme):
+    # TextInputWidget
+    return f"""
+    .mljar-textinput-container {{
+        display: flex;
+        flex-direction: column;
+        align-items: flex-start;
+        width: 100%;
+        min-width: 120px;
+        font-family: {theme.get('font_family', 'Arial, sans-serif')};
+        font-size: {theme.get('font_size', '14px')};
+        font-weight: {theme.get('font_weight', 'bold')};
+        color: {theme.get('text_color', '#222')};
+
+    }}
+
+    .mljar-textinput-top-label {{
+        margin-bottom: 6px;
+        text-align: left;
+        width: 100%;
+        font-weight: bold;
+    }}
+
+    .mljar-textinput-input {{
+        width: 100%;
+        border: { '1px solid ' + theme.get('border_color', '#ccc') if theme.get('border_visible', True) else 'none'};
+        border-radius: {theme.get('border_radius', '6px')};
+        padding: 6px 10px;
+        min-height: 1.6em;
+        box-sizing: border-box;
+        background: {theme.get('widget_background_color', '#fff')};
+        color: {theme.get('text_color', '#222')};
+    }}
+
+    .mljar-textinput-input:focus {{
+        outline: none;
+        border-color: {theme.get('primary_color', '#007bff')};
+    }}
+    """
+
+
+_WIDGET_CSS = (
+    _button_css,
+    _chatinput_css,
+    _checkbox_css,
+    _expander_css,
+    _json_css,
+    _multiselect_css,
+    _number_css,
+    _pdf_css,
+    _select_css,
+    _slider_css,
+    _tabs_css,
+    _text_css,
+)
+
+
+def _theme_variables(theme):
+    """Expose theme values as CSS custom properties, e.g. --mljar-primary-color."""
+    lines = [
+        f"  --mljar-{key.replace('_', '-')}: {value};"
+        for key, value in sorted(theme.items())
+        if isinstance(value, (str, int, float)) and not isinstance(value, bool)
+    ]
+    return ":root {\n" + "\n".join(lines) + "\n}\n"
+
+
+def build_theme_css(theme) -> str:
+    """Return the stylesheet for all widgets for the given theme dict."""
+    return _theme_variables(theme) + "".join(css(theme) for css in _WIDGET_CSS)
+
+
+def css_version(css: str) -> str:
+    """Short content hash used to version stylesheets."""
+    return hashlib.sha1(css.encode("utf-8")).hexdigest()[:12]
@@ -11,14 +11,20 @@ from traitlets import Bool, Integer
 # ⬇️ NEW: import CaselessStrEnum for a nice --log-level string flag
 from traitlets import CaselessStrEnum
 
+from mercury.paths import data_dir
+
 from ._version import __version__
 from .custom_contents_handler import MercuryContentsHandler
-from .handlers import MercuryHandler, MAIN_CONFIG
+from .download_handler import DownloadHandler
+from .handlers import MercuryHandler, MAIN_CONFIG, theme_css
 from .idle_timeout import (TimeoutActivityTransform, TimeoutManager,
                            patch_kernel_websocket_handler)
+from .media_handler import MediaHandler
+from .metrics import install_request_metrics, patch_kernel_culler
+from .metrics_handler import MetricsHandler
 from .notebooks import NotebooksAPIHandler
 from .root import RootIndexHandler
-from .theme_handler import ThemeHandler
+from .theme_handler import ThemeCSSHandler, ThemeHandler
 
 from traitlets.config import Config
 
@@ -77,6 +83,14 @@ class MercuryApp(LabServerApp):
         self.handlers.append((r"/", RootIndexHandler))
         self.handlers.append(("/mercury/api/notebooks", NotebooksAPIHandler))
         self.handlers.append(("/mercury/api/theme", ThemeHandler))
+        self.handlers.append((r"/mercury/api/theme\.css", ThemeCSSHandler))
+        self.handlers.append(("/mercury/api/metrics", MetricsHandler))
+        self.handlers.append((r"/mercury/api/download/([0-9a-f]{32})", DownloadHandler))
+        self.handlers.append((
+            r"/mercury/api/media/([0-9a-f]{64}(?:\.[A-Za-z0-9]+)?)",
+            MediaHandler,
+            {"path": data_dir("media")},
+        ))
         self.handlers.append((f"/mercury{path_regex}", MercuryHandler))
         if sys.argv[0].endswith("mercury_app/__main__.py"):
             self.handlers.append((r"/api/contents/(.*\.ipynb)$", MercuryContentsHandler))
@@ -128,7 +142,21 @@ class MercuryApp(LabServerApp):
 
     def initialize(self, argv=None):
         super().initialize()
+
+        # kernels started by this server inherit the shared data directory,
+        # the base URL used to build media links and the theme CSS version
+        os.environ.setdefault("MERCURY_DATA_DIR", data_dir())
+        if hasattr(self, 'serverapp'):
+            os.environ.setdefault("MERCURY_BASE_URL", self.serverapp.base_url)
+        os.environ["MERCURY_THEME_CSS_VERSION"] = theme_css()[1]
         
+        if hasattr(self, 'serverapp'):
+            install_request_metrics(
+                self.serverapp.web_app,
+                (MercuryHandler, MercuryContentsHandler, NotebooksAPIHandler, RootIndexHandler),
+            )
+            patch_kernel_culler(self.serverapp.kernel_manager)
+
         if hasattr(self, 'serverapp') and getattr(self, 'timeout', 0) > 0:
             self._timeout_manager = TimeoutManager(self.timeout, self.serverapp)
             self.serverapp.web_app._timeout_manager = self._timeout_manager
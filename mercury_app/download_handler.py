@@ -0,0 +1,123 @@
+import asyncio
+import json
+import os
+import time
+from urllib.parse import quote
+
+import tornado
+from jupyter_server.base.handlers import JupyterHandler
+
+from mercury.paths import data_dir
+
+CHUNK_SIZE = 64 * 1024
+# staged downloads nobody fetched are removed after this many seconds
+STALE_AFTER = 60 * 60
+# while the kernel is still producing a download, wait this long between reads
+POLL_INTERVAL = 0.05
+# give up when a running producer writes nothing for this many seconds
+PRODUCER_TIMEOUT = 10 * 60
+
+
+def _content_disposition(filename: str) -> str:
+    ascii_name = filename.encode("ascii", "replace").decode("ascii").replace('"', "")
+    return f"attachment; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(filename)}"
+
+
+def _remove(*paths):
+    for p in paths:
+        try:
+            os.remove(p)
+        except OSError:
+            pass
+
+
+def _cleanup_stale(folder: str):
+    cutoff = time.time() - STALE_AFTER
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+class DownloadHandler(JupyterHandler):
+    """
+    Stream a file produced by a lazy mercury.Download widget, then delete it.
+
+    The kernel writes `<token>.part` while its producer runs and renames it to
+    `<token>` when done, so the response starts before the file is complete.
+    """
+
+    @tornado.web.authenticated
+    async def get(self, token: str):
+        folder = data_dir("downloads")
+        _cleanup_stale(folder)
+
+        path = os.path.join(folder, token)
+        meta_path = path + ".json"
+        part_path = path + ".part"
+        error_path = path + ".error"
+        # .part first: if it is renamed in between, the final file exists
+        try:
+            source = open(part_path, "rb")
+            complete = False
+        except FileNotFoundError:
+            try:
+                source = open(path, "rb")
+                complete = True
+            except FileNotFoundError:
+                raise tornado.web.HTTPError(404, reason="Download expired or not found")
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+
+        self.set_header("Content-Type", meta.get("mime") or "application/octet-stream")
+        self.set_header("Content-Disposition", _content_disposition(meta.get("filename") or "download"))
+        if complete:
+            self.set_header("Content-Length", str(os.fstat(source.fileno()).st_size))
+        self.set_header("Cache-Control", "no-store")
+
+        try:
+            # the open file survives the kernel's rename from .part
+            with source as f:
+                idle_since = time.monotonic()
+                while True:
+                    chunk = f.read(CHUNK_SIZE)
+                    if chunk:
+                        self.write(chunk)
+                        await self.flush()
+                        idle_since = time.monotonic()
+                        continue
+                    if complete:
+                        break
+                    if os.path.exists(error_path):
+                        self._abort(500, "Download producer failed")
+                        return
+                    if not os.path.exists(part_path):
+                        # renamed: everything is written, read what is left
+                        complete = True
+                        continue
+                    if time.monotonic() - idle_since > PRODUCER_TIMEOUT:
+                        self._abort(504, "Download producer stalled")
+                        return
+                    await asyncio.sleep(POLL_INTERVAL)
+        finally:
+            # downloads are one-shot
+            _remove(path, meta_path, error_path)
+        self.finish()
+
+    def _abort(self, status: int, reason: str):
+        """
+        Fail the download. Before the headers are sent this is a plain HTTP
+        error; afterwards the status can not change anymore, so the connection
+        is dropped without the terminating chunk and the browser reports the
+        download as failed instead of saving a truncated file.
+        """
+        if not self._headers_written:
+            raise tornado.web.HTTPError(status, reason=reason)
+        self.log.warning("Aborting download %s: %s", self.request.path, reason)
+        self.request.connection.close()
@@ -1,4 +1,5 @@
 # handlers.py 
+import functools
 import uuid
 from pathlib import Path
 from typing import Optional, List, Dict
@@ -13,6 +14,7 @@ from jupyterlab_server.config import (LabConfig, get_page_config,
                                       recursive_update)
 from jupyterlab_server.handlers import _camelCase, is_url
 from tornado import web
+from mercury.theme_css import build_theme_css, css_version
 
 from ._version import __version__
 import toml
@@ -39,6 +41,13 @@ MAIN_CONFIG = CONFIG["main"]
 WELCOME_CONFIG = CONFIG["welcome"]
 
 
+@functools.lru_cache(maxsize=1)
+def theme_css():
+    """Widget stylesheet compiled from the theme in config.toml, and its version."""
+    css = build_theme_css(THEME)
+    return css, css_version(css)
+
+
 def _to_posix(p: str) -> str:
     """Normalize filesystem-like path to Jupyter API posix (forward slashes)."""
     return str(Path(p).as_posix())
@@ -292,5 +301,6 @@ class MercuryHandler(ExtensionHandlerJinjaMixin, ExtensionHandlerMixin, JupyterH
                 base_url=self.base_url,
                 token=self.settings["token"],
                 page_config=page_config,
+                theme_css_version=theme_css()[1],
             )
         )
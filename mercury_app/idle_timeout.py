@@ -36,7 +36,7 @@ class TimeoutManager:
             delta = time.time() - self.last_activity
             logger.debug(f"[Idle Timeout] Seconds since last activity: {delta:.1f}")
             if delta > self.timeout:
-                logger.debug("[Idle Timeout] Idle timeout reached. Shutting down.")
+                logger.info(f"[Idle Timeout] No activity for {delta:.0f}s, shutting down the server.")
                 shutdown_server(self.serverapp)
                 break
             time.sleep(5)
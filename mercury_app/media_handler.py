@@ -0,0 +1,27 @@
+from jupyter_server.base.handlers import JupyterHandler
+from tornado import web
+
+# stored names are immutable (content addressed), cache them for a year
+MAX_AGE = 365 * 24 * 60 * 60
+
+
+class MediaHandler(JupyterHandler, web.StaticFileHandler):
+    """Serve files from the content-addressed media store (`<sha256><ext>`)."""
+
+    @web.authenticated
+    def head(self, path):
+        return super().head(path)
+
+    @web.authenticated
+    async def get(self, path, include_body=True):
+        return await super().get(path, include_body=include_body)
+
+    def compute_etag(self):
+        # the file name is the sha256 of its content, no need to hash again
+        return f'"{self.path.split(".", 1)[0]}"'
+
+    def get_cache_time(self, path, modified, mime_type):
+        return MAX_AGE
+
+    def set_extra_headers(self, path):
+        self.set_header("Cache-Control", f"private, max-age={MAX_AGE}, immutable")
@@ -1,6 +1,7 @@
 # mercury_hybrid_cm.py
 from __future__ import annotations
 
+import json
 import posixpath
 from datetime import datetime, timezone
 from typing import Any, Dict, List
@@ -25,6 +26,11 @@ class _MemStore:
 
     def __init__(self):
         self._files: Dict[str, Dict[str, Any]] = {}
+        # path -> serialized size, measured only when the metrics endpoint asks
+        self._sizes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._files)
 
     def exists(self, path: str) -> bool:
         return path in self._files
@@ -47,10 +53,20 @@ class _MemStore:
             "size": None,
         }
         self._files[path] = model
+        self._sizes.pop(path, None)
         return model
 
     def delete(self, path: str) -> None:
         self._files.pop(path, None)
+        self._sizes.pop(path, None)
+
+    def total_size(self) -> int:
+        """Serialized bytes of all notebooks; each saved version is measured at most once."""
+        for path, model in self._files.items():
+            if path not in self._sizes:
+                content = json.dumps(model["content"], default=str)
+                self._sizes[path] = len(content.encode("utf-8"))
+        return sum(self._sizes.values())
 
     def list_dir(self, dir_path: str) -> Dict[str, Any]:
         """Directory model for immediate children of dir_path."""
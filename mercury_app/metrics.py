@@ -0,0 +1,186 @@
+import bisect
+import threading
+
+from tornado.log import access_log
+
+# request latency buckets in seconds (Prometheus client defaults)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for k, v in labels:
+        v = str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{k}="{v}"')
+    return "{" + ",".join(parts) + "}"
+
+
+class Counter:
+    """Monotonic counter, optionally split by label values."""
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            values = dict(self._values) or ({(): 0} if not self.labelnames else {})
+        for key, value in sorted(values.items()):
+            labels = _format_labels(zip(self.labelnames, key))
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets, optionally split by label values."""
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (+Inf last), sum]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, amount: float, **labels):
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        index = bisect.bisect_left(self.buckets, amount)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += amount
+
+    def render(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            values = {k: (list(v[0]), v[1]) for k, v in self._values.items()}
+        for key, (counts, total) in sorted(values.items()):
+            base = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(base + [("le", _format_value(float(bound)))])
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(base)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+def render_gauge(name: str, documentation: str, value) -> list:
+    """Gauges are read at scrape time, so they are rendered from a plain value."""
+    return [
+        f"# HELP {name} {documentation}",
+        f"# TYPE {name} gauge",
+        f"{name} {_format_value(value)}",
+    ]
+
+
+REQUEST_LATENCY = Histogram(
+    "mercury_request_duration_seconds",
+    "Time spent serving Mercury HTTP requests.",
+    labelnames=("handler", "method", "status"),
+)
+NOTEBOOK_INDEX_CACHE = Counter(
+    "mercury_notebook_index_cache_total",
+    "Notebook metadata lookups served from the index cache (hit) or read from disk (miss).",
+    labelnames=("result",),
+)
+# only kernel culls: a server idle-timeout shutdown stops the process that
+# serves /metrics, so it could never be scraped (it is logged instead)
+IDLE_CULLS = Counter(
+    "mercury_idle_culls_total",
+    "Kernels shut down by the idle kernel culler.",
+)
+
+for _result in ("hit", "miss"):
+    NOTEBOOK_INDEX_CACHE.inc(0, result=_result)
+
+METRICS = (REQUEST_LATENCY, NOTEBOOK_INDEX_CACHE, IDLE_CULLS)
+
+
+def observe_request(handler, tracked=()):
+    """Record the request latency if `handler` is one of the `tracked` classes."""
+    if not isinstance(handler, tracked):
+        return
+    status = handler.get_status()
+    REQUEST_LATENCY.observe(
+        handler.request.request_time(),
+        handler=type(handler).__name__,
+        method=handler.request.method,
+        status=f"{status // 100}xx",
+    )
+
+
+def install_request_metrics(web_app, tracked):
+    """
+    Wrap tornado's `log_function` setting, which is called once per finished
+    request, so latency is recorded without touching the handlers themselves.
+    """
+    tracked = tuple(tracked)
+    log_function = web_app.settings.get("log_function")
+
+    def log_request(handler):
+        try:
+            observe_request(handler, tracked)
+        finally:
+            if log_function is not None:
+                log_function(handler)
+            else:
+                # tornado's default, Application.log_request would call us again
+                access_log.info(
+                    "%d %s %.2fms", handler.get_status(),
+                    handler._request_summary(), 1000.0 * handler.request.request_time(),
+                )
+
+    web_app.settings["log_function"] = log_request
+
+
+def patch_kernel_culler(kernel_manager):
+    """Count kernels shut down by the idle culler (MappingKernelManager.cull_idle_timeout)."""
+    orig = getattr(kernel_manager, "cull_kernel_if_idle", None)
+    if orig is None or getattr(orig, "_mercury_metrics", False):
+        return
+
+    async def cull_kernel_if_idle(kernel_id):
+        result = orig(kernel_id)
+        if hasattr(result, "__await__"):
+            result = await result
+        if kernel_id not in kernel_manager:
+            IDLE_CULLS.inc()
+        return result
+
+    cull_kernel_if_idle._mercury_metrics = True
+    kernel_manager.cull_kernel_if_idle = cull_kernel_if_idle
+
+
+def render(gauges=()) -> str:
+    """Prometheus text exposition (format 0.0.4) of all metrics plus `gauges`."""
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    for name, documentation, value in gauges:
+        lines.extend(render_gauge(name, documentation, value))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,32 @@
+import tornado
+from jupyter_server.base.handlers import JupyterHandler
+from jupyter_server.utils import ensure_async
+
+from .metrics import render
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsHandler(JupyterHandler):
+    """Prometheus text exposition of the server metrics; gauges are read at scrape time."""
+
+    @tornado.web.authenticated
+    async def get(self):
+        gauges = [
+            ("mercury_active_kernels", "Running kernels.",
+             len(self.kernel_manager.list_kernel_ids())),
+            ("mercury_active_sessions", "Open notebook sessions.",
+             len(await ensure_async(self.session_manager.list_sessions()))),
+        ]
+        # only present when the contents manager was wrapped by MercuryApp
+        mem = getattr(self.contents_manager, "_mem", None)
+        if mem is not None:
+            gauges.append(("mercury_shadow_store_entries",
+                           "Shadow notebooks kept in memory.", len(mem)))
+            gauges.append(("mercury_shadow_store_bytes",
+                           "Serialized size of the shadow notebooks kept in memory.",
+                           mem.total_size()))
+
+        self.set_header("Content-Type", CONTENT_TYPE)
+        self.set_header("Cache-Control", "no-store")
+        self.finish(render(gauges))
@@ -1,7 +1,10 @@
 import json
 import os
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Tuple
 
+from .metrics import NOTEBOOK_INDEX_CACHE
+
 # ipynb "mercury" metadata keys -> API field names
 MERCURY_THUMBNAIL_KEYS: Dict[str, str] = {
     "thumbnail_bg": "thumbnail_bg",
@@ -71,6 +74,35 @@ def _read_ipynb_metadata(path: str) -> Tuple[Dict[str, Any], Optional[Exception]
     return data_out, None
 
 
+# LRU of path -> ((mtime_ns, size), (data, error)); the index page and the
+# API re-read every notebook on each request otherwise
+_METADATA_CACHE: "OrderedDict[str, Tuple[Tuple[int, int], Tuple[Dict[str, Any], Optional[Exception]]]]" = OrderedDict()
+METADATA_CACHE_SIZE = 4096
+
+
+def _cached_ipynb_metadata(path: str) -> Tuple[Dict[str, Any], Optional[Exception]]:
+    """_read_ipynb_metadata, reused while the file's mtime and size are unchanged."""
+    try:
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return _read_ipynb_metadata(path)
+
+    cached = _METADATA_CACHE.get(path)
+    if cached is not None and cached[0] == stamp:
+        NOTEBOOK_INDEX_CACHE.inc(result="hit")
+        _METADATA_CACHE.move_to_end(path)
+        return cached[1]
+
+    NOTEBOOK_INDEX_CACHE.inc(result="miss")
+    result = _read_ipynb_metadata(path)
+    _METADATA_CACHE[path] = (stamp, result)
+    _METADATA_CACHE.move_to_end(path)
+    while len(_METADATA_CACHE) > METADATA_CACHE_SIZE:
+        _METADATA_CACHE.popitem(last=False)
+    return result
+
+
 def _iter_notebooks(root: str, recursive: bool = False) -> List[str]:
     if not recursive:
         return sorted(
@@ -107,7 +139,7 @@ def list_notebooks(
 
     out: List[Dict[str, Any]] = []
     for full_path in files:
-        meta, err = _read_ipynb_metadata(full_path)
+        meta, err = _cached_ipynb_metadata(full_path)
         rel_path = os.path.relpath(full_path, start=root).replace(os.sep, "/")
 
         # Merge optional extras with defaults
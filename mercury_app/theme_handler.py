@@ -1,12 +1,30 @@
 import json
 
 import tornado
-from jupyter_server.base.handlers import APIHandler
+from jupyter_server.base.handlers import APIHandler, JupyterHandler
 
-from .handlers import THEME
+from .handlers import THEME, theme_css
+
+# versioned URLs never change content, cache them for a year
+MAX_AGE = 365 * 24 * 60 * 60
 
 
 class ThemeHandler(APIHandler):
     @tornado.web.authenticated
     def get(self):
         self.finish(json.dumps(THEME))
+
+
+class ThemeCSSHandler(JupyterHandler):
+    """Serve the shared widget stylesheet; immutable when requested with ?v=<version>."""
+
+    @tornado.web.authenticated
+    def get(self):
+        css, version = theme_css()
+        self.set_header("Content-Type", "text/css; charset=utf-8")
+        if self.get_argument("v", None) == version:
+            self.set_header("Cache-Control", f"private, max-age={MAX_AGE}, immutable")
+        else:
+            # unversioned (or stale) URL: revalidate with the ETag
+            self.set_header("Cache-Control", "no-cache")
+        self.finish(css)
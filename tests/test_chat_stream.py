@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("anywidget")
+pytest.importorskip("ipywidgets")
+
+from mercury.chat.message import (  # noqa: E402
+    STREAM_MAX_CHARS,
+    _TokenBuffer,
+    _stream_async,
+    _stream_sync,
+)
+
+INTERVAL = 0.05
+# scheduling slack allowed on top of the flush interval
+SLACK = 0.1
+
+
+def _buffer(interval=INTERVAL, max_chars=STREAM_MAX_CHARS):
+    flushes = []
+    buffer = _TokenBuffer(lambda chunk: flushes.append((time.monotonic(), chunk)), interval, max_chars)
+    return buffer, flushes
+
+
+def _tokens(count, delay=0.0, stall_after=None, stall=0.0, produced=None):
+    """Stub LLM stream: `count` tokens, `delay` apart, one long stall."""
+    for i in range(count):
+        if i == stall_after:
+            time.sleep(stall)
+        elif delay:
+            time.sleep(delay)
+        if produced is not None:
+            produced.append(time.monotonic())
+        yield f"t{i} "
+
+
+async def _atokens(count, delay=0.0, stall_after=None, stall=0.0, produced=None):
+    for i in range(count):
+        if i == stall_after:
+            await asyncio.sleep(stall)
+        elif delay:
+            await asyncio.sleep(delay)
+        if produced is not None:
+            produced.append(time.monotonic())
+        yield f"t{i} "
+
+
+def _expected(count):
+    return "".join(f"t{i} " for i in range(count))
+
+
+def _check_cadence(flushes, started, finished):
+    times = [t for t, _ in flushes]
+    # all but the final flush wait for the interval to pass
+    for previous, current in zip(times, times[1:-1]):
+        assert current - previous >= INTERVAL * 0.8
+    assert 2 <= len(flushes) <= (finished - started) / INTERVAL + 2
+
+
+def test_sync_flushes_once_per_interval():
+    buffer, flushes = _buffer()
+    started = time.monotonic()
+    text = _stream_sync(_tokens(100, delay=0.005), buffer)
+    finished = time.monotonic()
+    assert text == _expected(100)
+    assert "".join(chunk for _, chunk in flushes) == text
+    _check_cadence(flushes, started, finished)
+
+
+def test_sync_final_flush_on_completion():
+    buffer, flushes = _buffer(interval=10)
+    text = _stream_sync(_tokens(5), buffer)
+    assert text == _expected(5)
+    assert [chunk for _, chunk in flushes] == [text]
+
+
+def test_sync_latency_bound_when_producer_stalls():
+    buffer, flushes = _buffer()
+    produced = []
+    text = _stream_sync(_tokens(3, stall_after=2, stall=0.5, produced=produced), buffer)
+    assert text == _expected(3)
+    # the tokens before the stall are shown long before it ends
+    flushed_at, chunk = flushes[0]
+    assert chunk == _expected(2)
+    assert flushed_at - produced[1] <= INTERVAL + SLACK
+    assert flushed_at < produced[2]
+
+
+def test_sync_stops_producer_when_caller_leaves():
+    produced = []
+    closed = threading.Event()
+
+    def endless():
+        try:
+            while True:
+                time.sleep(0.005)
+                produced.append(time.monotonic())
+                yield "x"
+        finally:
+            closed.set()
+
+    class Interrupted(Exception):
+        pass
+
+    def flush(_chunk):
+        raise Interrupted()
+
+    with pytest.raises(Interrupted):
+        _stream_sync(endless(), _TokenBuffer(flush, INTERVAL, STREAM_MAX_CHARS))
+    assert closed.wait(1)
+    count = len(produced)
+    time.sleep(0.1)
+    assert len(produced) == count
+
+
+def test_async_flushes_once_per_interval():
+    buffer, flushes = _buffer()
+    started = time.monotonic()
+    text = asyncio.run(_stream_async(_atokens(100, delay=0.005), buffer))
+    finished = time.monotonic()
+    assert text == _expected(100)
+    assert "".join(chunk for _, chunk in flushes) == text
+    _check_cadence(flushes, started, finished)
+
+
+def test_async_final_flush_on_completion():
+    buffer, flushes = _buffer(interval=10)
+    text = asyncio.run(_stream_async(_atokens(5), buffer))
+    assert text == _expected(5)
+    assert [chunk for _, chunk in flushes] == [text]
+
+
+def test_async_latency_bound_when_producer_stalls():
+    buffer, flushes = _buffer()
+    produced = []
+    text = asyncio.run(_stream_async(_atokens(3, stall_after=2, stall=0.5, produced=produced), buffer))
+    assert text == _expected(3)
+    flushed_at, chunk = flushes[0]
+    assert chunk == _expected(2)
+    assert flushed_at - produced[1] <= INTERVAL + SLACK
+    assert flushed_at < produced[2]